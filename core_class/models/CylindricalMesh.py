@@ -1,5 +1,7 @@
 import numpy as np
 import pyvista as pv
+from core_class.utils.find_element_dimension import find_element_dimension
+from core_class.utils.find_vacuum_reluctance import find_vacuum_reluctance
 
 class CylindricalMesh:
     def __init__(self, r_nodes=None, theta_nodes=None, z_nodes=None, periodic_boundary=True):
@@ -46,6 +48,10 @@ class CylindricalMesh:
         self.X = self.R * np.cos(self.Theta)
         self.Y = self.R * np.sin(self.Theta)
 
+        # 7. Tensor hình học của các ô (tính một lần khi cần, xem get_cell_tensor)
+        self._cell_tensor = None
+        self._cell_tensor_key = None
+
     def get_cell_centers(self):
         """Trả về tọa độ tâm (r, theta, z) của các phần tử."""
         r_c = (self.r_nodes[:-1] + self.r_nodes[1:]) / 2
@@ -54,6 +60,76 @@ class CylindricalMesh:
         R_c, T_c, Z_c = np.meshgrid(r_c, t_c, z_c, indexing='ij')
         return R_c, T_c, Z_c
 
+    def get_cell_coordinate(self):
+        """
+        Trả về tọa độ 2 đỉnh của mọi phần tử, shape (n_cells_r, n_cells_t, n_cells_z, 2, 3):
+        hàng 0 [r_i, t_j, z_k], hàng 1 [r_i+1, t_j+1, z_k+1].
+        """
+        shape = (self.n_cells_r, self.n_cells_t, self.n_cells_z)
+        coordinate = np.empty(shape + (2, 3), order='F')
+        coordinate[..., 0, 0] = self.r_nodes[:-1, None, None]
+        coordinate[..., 1, 0] = self.r_nodes[1:, None, None]
+        coordinate[..., 0, 1] = self.theta_nodes[None, :-1, None]
+        coordinate[..., 1, 1] = self.theta_nodes[None, 1:, None]
+        coordinate[..., 0, 2] = self.z_nodes[None, None, :-1]
+        coordinate[..., 1, 2] = self.z_nodes[None, None, 1:]
+        return coordinate
+
+    def get_cell_tensor(self):
+        """
+        Tensor hình học (nr, nt, nz, 2, 3) của mọi ô: length, section_area, vacuum_reluctance
+        và cell_size (nr, nt, nz, 3) [dr, dtheta, dz].
+
+        Chỉ phụ thuộc r_nodes, theta_nodes, z_nodes nên được tính một lần bằng broadcasting
+        trên các trục rồi dùng chung (chỉ đọc) cho ElementField; tính lại nếu mảng node thay đổi.
+        """
+        key = (self.r_nodes.tobytes(), self.theta_nodes.tobytes(), self.z_nodes.tobytes())
+        if getattr(self, '_cell_tensor', None) is None or self._cell_tensor_key != key:
+            dimension = find_element_dimension(r_nodes=self.r_nodes,
+                                               theta_nodes=self.theta_nodes,
+                                               z_nodes=self.z_nodes)
+            vacuum_reluctance = find_vacuum_reluctance(length=dimension.length,
+                                                       section_area=dimension.section_area).reluctance
+
+            shape = (self.n_cells_r, self.n_cells_t, self.n_cells_z)
+            cell_size = np.empty(shape + (3,), order='F')
+            cell_size[..., 0] = np.abs(np.diff(self.r_nodes))[:, None, None]
+            cell_size[..., 1] = np.abs(np.diff(self.theta_nodes))[None, :, None]
+            cell_size[..., 2] = np.abs(np.diff(self.z_nodes))[None, None, :]
+
+            tensor = {"length": dimension.length,
+                      "section_area": dimension.section_area,
+                      "vacuum_reluctance": np.asfortranarray(vacuum_reluctance),
+                      "cell_size": cell_size}
+            for value in tensor.values():
+                value.flags.writeable = False
+            self._cell_tensor = tensor
+            self._cell_tensor_key = key
+        return self._cell_tensor
+
+    @property
+    def length(self):
+        return self.get_cell_tensor()["length"]
+
+    @property
+    def section_area(self):
+        return self.get_cell_tensor()["section_area"]
+
+    @property
+    def vacuum_reluctance(self):
+        return self.get_cell_tensor()["vacuum_reluctance"]
+
+    @property
+    def cell_size(self):
+        return self.get_cell_tensor()["cell_size"]
+
+    def __getstate__(self):
+        # tensor hình học tính lại khi cần
+        state = self.__dict__.copy()
+        state['_cell_tensor'] = None
+        state['_cell_tensor_key'] = None
+        return state
+
     def get_cell_volumes(self):
         """Tính thể tích vi phân dV = r * dr * dtheta * dz"""
         dr = np.diff(self.r_nodes)
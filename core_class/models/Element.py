@@ -1,124 +1,131 @@
-from core_class.utils.find_vacuum_reluctance import find_vacuum_reluctance
-from core_class.utils.extract_element_info import extract_element_info
-from core_class.utils.find_element_dimension import find_element_dimension
-from core_class.utils.find_minimum_reluctance import find_minimum_reluctance
-from core_class.utils.find_magnet_source import find_magnet_source
-from core_class.utils.find_element_segment_dimension_ratio import find_element_segment_dimension_ratio
-from core_class.utils.find_winding_source import find_winding_source
-from core_class.utils.find_total_magnetic_source import find_total_magnetic_source
-from core_class.utils.find_flux_direct import find_flux_direct
+import numpy as np
+from core_class.models.ElementField import MATERIAL_NAMES
 from core_class.utils.get_neighbor_elements_position import get_neighbor_elements_position
 from core_class.utils.find_neighbor_elements import find_neighbor_elements
-from core_class.utils.find_flux_density import find_flux_density
-from core_class.utils.find_relative_permeability import find_relative_permeability
-from core_class.utils.find_reluctance_updated import find_reluctance_updated
-from core_class.utils.find_own_magnetic_potential import find_own_magnetic_potential
 from core_class.utils.find_flat_position import find_flat_position
 
+# Các đại lượng đọc trực tiếp từ ElementField tại vị trí của element
+FIELD_ATTRIBUTES = ("material_id",
+                    "segment_index",
+                    "material_fraction",
+                    "dimension",
+                    "dimension_ratio",
+                    "segment_magnet_source",
+                    "magnetization_direction",
+                    "magnet_source",
+                    "segment_winding_vector",
+                    "winding_normal",
+                    "element_winding_vector",
+                    "winding_source",
+                    "magnetic_source",
+                    "length",
+                    "section_area",
+                    "vacuum_reluctance",
+                    "minimum_reluctance",
+                    "reluctance",
+                    "flux_direct",
+                    "flux_density_direct",
+                    "flux_density_average",
+                    "relative_permeability",
+                    "own_magnetic_potential")
+
 class Element:
+      # chỉ lưu mạng và chỉ số phẳng (thứ tự Fortran); mọi đại lượng khác đọc từ mảng chung
+      __slots__ = ("reluctance_network", "index")
+
       def __init__(self,
-                 motor = None,
-                 position = None,
-                 geometry = None,
-                 mesh = None,
-                 magnetic_potential = None,
-                 winding_current = None,
-                 elements = None):
+                   reluctance_network = None,
+                   position = None):
             """
-            Đối với các mảng (2x3) chứa nhiều thông tin, vị trí tương ứng:
+            View mỏng (tương thích ngược) lên một ô của reluctance_network.element_field.
+            Không lưu dữ liệu riêng: mọi mảng (2x3) là view vào mảng chung, vị trí tương ứng:
             [     r_in    t_left     z_bot
                   r_out   t_right    z_top    ]
+            Các đại lượng dẫn xuất (length, section_area, vacuum_reluctance, vị trí lân cận...)
+            được đọc từ element_field / mesh hoặc tính khi truy cập.
             """
-
-            self.position = position
-            self.mesh = mesh
-            self.material_database = motor.material_database
-            self.magnetic_potential = magnetic_potential
-            self.winding_current = winding_current
-            self.elements = elements
-            self.flat_position = find_flat_position(element= self).flat_position
-
-            info = extract_element_info(position=position,
-                                    geometry=geometry,
-                                    mesh=mesh,
-                                    )
-            # material
-            self.material = info.material
-
-            # dimension
-            self.dimension = info.dimension
-
-            # dimension ratio
-            self.dimension_ratio = find_element_segment_dimension_ratio(element= self).dimension_ratio
-
-            # coordinate
-            self.coordinate = info.coordinate
-
-            # magnet properties
-            self.segment_magnet_source = info.magnet_source
-            self.magnetization_direction = info.magnetization_direction
-            self.magnet_source = find_magnet_source(element= self).magnet_source
-
-            # winding properties
-            self.segment_winding_vector = info.winding_vector
-            self.winding_normal = info.winding_normal
-            self.element_winding_vector = None
-            self.element_winding_vector = find_winding_source(element=self).element_winding_vector
-            self.winding_source = find_winding_source(element=self).winding_source
-            
-            # total magnetic source 
-            self.magnetic_source = find_total_magnetic_source(element=self).total_magnetic_source
-
-            # define dimension
-            dimension_calculated = find_element_dimension(coordinate=self.coordinate)
-            self.length = dimension_calculated.length
-            self.section_area = dimension_calculated.section_area
-
-            # define vacuum reluctance
-            self.vacuum_reluctance = find_vacuum_reluctance(length = self.length,
-                                                            section_area = self.section_area).reluctance
-            
-            # define minimum reluctance
-            self.minimum_reluctance = find_minimum_reluctance(element = self).reluctance
-
-            # initialization for the first time
-            self.reluctance = self.minimum_reluctance
-            self.flux_direct = None
-            self.flux_density_direct = None
-            self.flux_density_average = None
-            self.relative_permeability = None
-            self.neighbor_elements_position = get_neighbor_elements_position(element=self).neighbor_elements_position
-            self.own_magnetic_potential = None
+            object.__setattr__(self, "reluctance_network", reluctance_network)
+            nr, nt, _ = reluctance_network.element_field.shape
+            i, j, k = (int(p) for p in position)
+            object.__setattr__(self, "index", i + j * nr + k * nr * nt)
+
+      @classmethod
+      def from_index(cls, reluctance_network, index):
+            """Tạo nhanh từ chỉ số phẳng i + j*nr + k*nr*nt (dùng khi tạo hàng loạt)."""
+            element = cls.__new__(cls)
+            _set_reluctance_network(element, reluctance_network)
+            _set_index(element, index)
+            return element
+
+      def __getattr__(self, name):
+            if name in FIELD_ATTRIBUTES:
+                  value = getattr(self.reluctance_network.element_field, name)
+                  return None if value is None else value[self.position]
+            raise AttributeError(f"'Element' object has no attribute '{name}'")
+
+      def __setattr__(self, name, value):
+            if name in FIELD_ATTRIBUTES:
+                  getattr(self.reluctance_network.element_field, name)[self.position] = value
+            else:
+                  object.__setattr__(self, name, value)
+
+      @property
+      def position(self):
+            nr, nt, _ = self.reluctance_network.element_field.shape
+            k, rest = divmod(self.index, nr * nt)
+            j, i = divmod(rest, nr)
+            return (i, j, k)
+
+      @property
+      def elements(self):
+            # mảng Element dùng chung của mạng (không giữ tham chiếu riêng trong từng Element)
+            return self.reluctance_network.elements
+
+      @property
+      def material(self):
+            return MATERIAL_NAMES[int(self.material_id)]
+
+      @property
+      def material_database(self):
+            return self.reluctance_network.material_database
+
+      @property
+      def mesh(self):
+            return self.reluctance_network.mesh
+
+      @property
+      def magnetic_potential(self):
+            return self.reluctance_network.magnetic_potential
+
+      @property
+      def winding_current(self):
+            return self.reluctance_network.winding_current
+
+      @property
+      def flat_position(self):
+            return find_flat_position(element= self).flat_position
+
+      @property
+      def coordinate(self):
+            mesh = self.mesh
+            i, j, k = self.position
+            return np.array([[mesh.r_nodes[i], mesh.theta_nodes[j], mesh.z_nodes[k]],
+                             [mesh.r_nodes[i+1], mesh.theta_nodes[j+1], mesh.z_nodes[k+1]]], dtype=float)
+
+      @property
+      def neighbor_elements_position(self):
+            return get_neighbor_elements_position(element=self).neighbor_elements_position
 
       def neighbor_elements(self):
             return find_neighbor_elements(element=self).neighbor_elements
 
-      def update_element(self,
-                        magnetic_potential = None,
-                        winding_current = None):
-            
-            if winding_current is not None:
-                  self.winding_current = winding_current
-                  self.winding_source = find_winding_source(element=self).winding_source
-                  self.magnetic_source = find_total_magnetic_source(element= self).total_magnetic_source
-
-            if magnetic_potential is not None:
-                  # find flux direct
-                  self.flux_direct = find_flux_direct(element= self).flux_direct
-
-                  # find flux density
-                  flux_density = find_flux_density(element=self)
-                  self.flux_density_direct = flux_density.flux_density_direct
-                  self.flux_density_average = flux_density.flux_density_average
-                  
-                  # find mu
-                  self.relative_permeability = find_relative_permeability(element=self).relative_permeability
-                  
-                  # update reluctance
-                  self.reluctance = find_reluctance_updated(element= self).reluctance
-                  
-                  # update own magnetic potential
-                  self.own_magnetic_potential = find_own_magnetic_potential(element=self).own_magnetic_potential
-
       def set_reluctance_minimum(self):
-            self.reluctance = self.minimum_reluctance.copy()
\ No newline at end of file
+            # từ trở nửa nhánh được suy ra từ độ từ thẩm (ElementField.reluctance)
+            self.relative_permeability = self.vacuum_reluctance / self.minimum_reluctance
+
+      def __repr__(self):
+            return f"Element(position={self.position}, material='{self.material}')"
+
+
+_set_reluctance_network = Element.reluctance_network.__set__
+_set_index = Element.index.__set__
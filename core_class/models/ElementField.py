@@ -0,0 +1,119 @@
+import numpy as np
+from core_class.utils.find_reluctance_updated import find_reluctance_updated
+from core_class.utils.find_total_magnetic_source import find_total_magnetic_source
+
+# Mã vật liệu dùng chung (khớp với material_filter của lookup_BH_curve: 0 air, 1 magnet, 2 iron)
+MATERIAL_NAMES = ("air", "magnet", "iron")
+MATERIAL_ID = {name: index for index, name in enumerate(MATERIAL_NAMES)}
+# Quy tắc trộn độ từ thẩm của ô chứa nhiều vật liệu (find_mixed_permeability)
+#   dominant: chỉ dùng vật liệu chiếm ưu thế; arithmetic: sum(f * mu); harmonic: 1 / sum(f / mu)
+MIXING_RULES = ("dominant", "arithmetic", "harmonic")
+
+class ElementField:
+    def __init__(self,
+                 shape = (1, 1, 1),
+                 number_of_phase = 3,
+                 material_database = None,
+                 mixing_rule = "dominant"):
+        """
+        Kho dữ liệu dạng structure-of-arrays cho toàn bộ phần tử của mạng từ trở.
+
+        Mỗi đại lượng (2x3) của một Element được lưu thành một mảng liên tục
+        (nr, nt, nz, 2, 3) theo thứ tự Fortran, vị trí tương ứng:
+            [     r_in    t_left     z_bot
+                  r_out   t_right    z_top    ]
+
+        Vì thứ tự là Fortran, mỗi nhánh (m, n) là một khối liên tục theo chỉ số phẳng
+        i + j*nr + k*nr*nt của MagneticPotential.
+        """
+        if mixing_rule not in MIXING_RULES:
+            raise ValueError(f"mixing_rule phải là một trong {MIXING_RULES}, nhận '{mixing_rule}'")
+        nr, nt, nz = (int(n) for n in shape)
+        self.shape = (nr, nt, nz)
+        self.size = nr * nt * nz
+        self.number_of_phase = int(number_of_phase)
+        self.material_database = material_database
+        self.mixing_rule = mixing_rule
+
+        branch_shape = self.shape + (2, 3)
+
+        # material
+        self.material_id = np.zeros(self.shape, dtype=np.int8, order='F')
+        self.segment_index = np.full(self.shape, -1, dtype=np.int32, order='F')   # -1: air
+        # tỉ lệ thể tích air / magnet / iron trong ô (theo MATERIAL_ID)
+        self.material_fraction = np.zeros(self.shape + (len(MATERIAL_NAMES),), order='F')
+        self.material_fraction[..., MATERIAL_ID["air"]] = 1.0
+        # segment chứa tâm ô (-1: không có), dùng để đo lại kích thước segment khi cập nhật cục bộ
+        self.center_segment = np.full(self.shape, -1, dtype=np.int32, order='F')
+
+        # dimension: hàng 0 element, hàng 1 segment
+        self.dimension = np.zeros(branch_shape, order='F')
+        self.dimension_ratio = np.ones(self.shape + (3,), order='F')
+
+        # magnet properties
+        self.segment_magnet_source = np.zeros(self.shape, order='F')
+        self.magnetization_direction = np.zeros(self.shape + (3,), order='F')
+        self.magnetization_direction[..., 2] = 1.0
+        self.magnet_source = np.zeros(branch_shape, order='F')
+
+        # winding properties
+        self.segment_winding_vector = np.zeros(self.shape + (self.number_of_phase,), order='F')
+        self.winding_normal = np.zeros(self.shape + (3,), order='F')
+        self.winding_normal[..., 2] = 1.0
+        self.element_winding_vector = None
+        self.winding_source = np.zeros(branch_shape, order='F')
+
+        # dimension & reluctance
+        # từ trở / sức từ động của nửa nhánh không được lưu (xem reluctance, magnetic_source):
+        # giá trị tổng hợp của mỗi mặt được lưu một lần trong FaceField của mạng
+        self.length = np.zeros(branch_shape, order='F')
+        self.section_area = np.zeros(branch_shape, order='F')
+        self.vacuum_reluctance = np.zeros(branch_shape, order='F')
+        self.minimum_reluctance = np.zeros(branch_shape, order='F')
+        self.relative_permeability = np.ones(branch_shape, order='F')
+
+        # kết quả sau khi giải (None cho tới lần update đầu tiên)
+        self.flux_direct = None
+        self.flux_density_direct = None
+        self.flux_density_average = None
+        self.own_magnetic_potential = None
+
+    @property
+    def reluctance(self):
+        """
+        Từ trở của 6 nửa nhánh, vacuum_reluctance / relative_permeability (tính khi truy cập, chỉ đọc).
+        Đổi từ trở bằng cách đổi relative_permeability rồi cập nhật FaceField (update_face_field).
+        """
+        reluctance = np.asfortranarray(find_reluctance_updated(element_field=self).reluctance)
+        reluctance.flags.writeable = False
+        return reluctance
+
+    @property
+    def magnetic_source(self):
+        """Sức từ động của 6 nửa nhánh, magnet_source + winding_source (tính khi truy cập, chỉ đọc)."""
+        magnetic_source = np.asfortranarray(find_total_magnetic_source(element_field=self).total_magnetic_source)
+        magnetic_source.flags.writeable = False
+        return magnetic_source
+
+    @property
+    def material(self):
+        """Tên vật liệu của từng phần tử (mảng object), chỉ dùng để hiển thị."""
+        return np.array(MATERIAL_NAMES, dtype=object)[self.material_id]
+
+    def material_mask(self, material):
+        return self.material_id == MATERIAL_ID[material]
+
+    def flat(self, array):
+        """Trải mảng (nr, nt, nz, ...) thành (N, ...) theo thứ tự Fortran (không copy)."""
+        return np.reshape(array, (self.size,) + np.shape(array)[3:], order='F')
+
+    def nbytes(self):
+        total = 0
+        for value in vars(self).values():
+            if isinstance(value, np.ndarray):
+                total += value.nbytes
+        return total
+
+    def __repr__(self):
+        return (f"ElementField(shape={self.shape}, "
+                f"memory={self.nbytes() / 1e6:.1f} MB)")
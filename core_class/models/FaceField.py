@@ -0,0 +1,76 @@
+import numpy as np
+
+# hướng của mặt (nhánh) theo thứ tự trong ma trận liên thuộc
+FACE_DIRECTIONS = ("r", "theta", "z")
+
+class FaceField:
+    def __init__(self,
+                 shape = (1, 1, 1),
+                 periodic_boundary = True):
+        """
+        Từ trở nối tiếp và sức từ động của các nhánh, mỗi mặt chung giữa hai ô được lưu một lần
+        (thay vì hai nửa ở hai Element rồi cộng lại khi lắp ráp / tính từ thông).
+
+        Đây là nơi duy nhất lưu từ trở / sức từ động của nhánh: ElementField chỉ giữ độ từ thẩm và
+        nguồn của từng ô, các nửa nhánh (ElementField.reluctance / magnetic_source) được suy ra khi
+        cần. Mảng được ghi một lần mỗi vòng lặp bởi update_face_field.
+
+        Ba mảng mặt theo hướng r, theta, z có kích thước
+            r: (nr - 1, nt, nz)   theta: (nr, nt, nz) nếu tuần hoàn, (nr, nt - 1, nz) nếu không   z: (nr, nt, nz - 1)
+        và là các view (thứ tự Fortran, chỉ số theo ô phía dưới) lên mảng nhánh liên tục (E,)
+        theo đúng thứ tự nhánh của create_branch_incidence, nên G, J và từ thông dùng trực tiếp.
+        """
+        nr, nt, nz = (int(n) for n in shape)
+        self.shape = (nr, nt, nz)
+        self.periodic_boundary = bool(periodic_boundary)
+        self.face_shape = ((max(nr - 1, 0), nt, nz),
+                           (nr, nt if periodic_boundary else max(nt - 1, 0), nz),
+                           (nr, nt, max(nz - 1, 0)))
+        self.offset = np.concatenate(([0], np.cumsum([np.prod(s) for s in self.face_shape]))).astype(np.int64)
+
+        self.reluctance = np.zeros(self.offset[-1])
+        self.magnetic_source = np.zeros(self.offset[-1])
+        # các nhánh được ghi lại kể từ lần lắp ráp G gần nhất (None: mọi nhánh, phải lắp ráp toàn bộ)
+        self.changed_branches = None
+
+    @property
+    def size(self):
+        return int(self.offset[-1])
+
+    def face(self, array, direction):
+        """View (thứ tự Fortran) của mảng nhánh array lên các mặt theo hướng direction (0 r, 1 theta, 2 z)."""
+        return np.reshape(array[self.offset[direction]:self.offset[direction + 1]],
+                          self.face_shape[direction], order='F')
+
+    def half_branch(self, cell, half, direction):
+        """
+        Nhánh chứa nửa [half, direction] của ô cell (chỉ số phẳng): mặt của ô dưới khi half = 1,
+        của ô kề phía dưới khi half = 0. -1 với nửa nằm trên biên (không thuộc nhánh nào).
+        """
+        index = np.stack(np.unravel_index(np.asarray(cell), self.shape, order='F'))
+        branch = np.full(index.shape[1], -1, dtype=np.int64)
+        for n in range(3):
+            select = (direction == n)
+            low = index[:, select]
+            low[n] -= (half[select] == 0)
+            if n == 1 and self.periodic_boundary:
+                low[n] %= self.shape[1]
+            valid = np.all((low >= 0) & (low < np.array(self.face_shape[n])[:, None]), axis=0)
+            face = np.full(low.shape[1], -1, dtype=np.int64)
+            face[valid] = self.offset[n] + np.ravel_multi_index(tuple(low[:, valid]), self.face_shape[n], order='F')
+            branch[select] = face
+        return branch
+
+    @property
+    def reluctance_face(self):
+        # (r, theta, z)
+        return tuple(self.face(self.reluctance, n) for n in range(3))
+
+    @property
+    def magnetic_source_face(self):
+        # (r, theta, z)
+        return tuple(self.face(self.magnetic_source, n) for n in range(3))
+
+    def __repr__(self):
+        faces = ", ".join(f"{name} {shape}" for name, shape in zip(FACE_DIRECTIONS, self.face_shape))
+        return f"<FaceField {self.size} faces: {faces}>"
@@ -1,15 +1,48 @@
 import numpy as np
 import pyvista as pv
 import ctypes
+from core_class.models.SegmentIndex import SegmentIndex
 
+# ctypes.windll chỉ có trên Windows: bỏ qua ở hệ khác để module import được trên mọi nền tảng
 try:
     ctypes.windll.shcore.SetProcessDpiAwareness(1)
 except Exception:
-    ctypes.windll.user32.SetProcessDPIAware()
+    try:
+        ctypes.windll.user32.SetProcessDPIAware()
+    except Exception:
+        pass
 
 class Geometry:
-    def __init__(self, geometry=None):
+    def __init__(self, geometry=None, options=None):
         self.geometry = geometry if geometry is not None else []
+        # tham số dựng geometry (dùng làm một phần khóa cache)
+        self.options = dict(options) if options is not None else {}
+        self._spatial_index = None
+        self._spatial_index_key = None
+
+    @property
+    def spatial_index(self):
+        """
+        SegmentIndex (r, theta, z) của các segment, dựng lại khi danh sách segment hoặc mesh thay đổi.
+        """
+        key = tuple(id(seg.mesh) for seg in self.geometry)
+        if getattr(self, '_spatial_index', None) is None or self._spatial_index_key != key:
+            self._spatial_index = SegmentIndex(geometry=self)
+            self._spatial_index_key = key
+        return self._spatial_index
+
+    def replace_segment(self, index, segment):
+        """Thay segment thứ index, cập nhật SegmentIndex tại chỗ (nếu đã dựng) thay vì dựng lại."""
+        self.geometry[index] = segment
+        if getattr(self, '_spatial_index', None) is not None:
+            self._spatial_index.update_segment(index, segment)
+            self._spatial_index_key = tuple(id(seg.mesh) for seg in self.geometry)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_spatial_index'] = None
+        state['_spatial_index_key'] = None
+        return state
 
     def show(self, 
              plotter=None,             
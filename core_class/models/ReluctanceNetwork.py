@@ -1,12 +1,20 @@
-from core_class.utils.find_geometry_dimension_in_mesh import find_geometry_dimension_in_mesh
+from core_class.utils.find_voxel_cache_key import find_voxel_cache_key
+from core_class.utils.create_element_field import create_element_field
 from core_class.utils.create_elements import create_elements
+from core_class.utils.create_neighbor_table import create_neighbor_table
+from core_class.utils.create_branch_incidence import create_branch_incidence
+from core_class.models.FaceField import FaceField
+from core_class.utils.update_face_field import update_face_field
 from core_class.utils.show_reluctance_network import show_reluctance_network
 from core_class.utils.create_magnetic_potential import create_magnetic_potential
 from core_class.utils.create_winding_current import create_winding_current
 from core_class.utils.update_reluctance_network import update_reluctance_network
+from core_class.utils.update_segments import update_segments
 from core_class.utils.set_minimum_reluctance import set_minimum_reluctance
 from solver.core.create_magnetic_potential_equation import create_magnetic_potential_equation
+from solver.core.create_magnetic_potential_operator import create_magnetic_potential_operator
 from solver.core.solve_magnetic_equation import solve_magnetic_equation
+from solver.utils.create_sparsity_pattern import create_sparsity_pattern
 
 class ReluctanceNetwork:
     def __init__(self,
@@ -14,45 +22,156 @@ class ReluctanceNetwork:
                  geometry = None,
                  mesh = None,
                  magnetic_potential = None,
-                 winding_current = None,):
+                 winding_current = None,
+                 n_jobs = 1,
+                 use_cache = True,
+                 mixing_rule = "dominant"):
         
         self.material_database = motor.material_database
         self.geometry = geometry
         self.mesh = mesh
         self.magnetic_potential = magnetic_potential
         self.winding_current = winding_current
-        find_geometry_dimension_in_mesh(geometry= geometry,
-                                        mesh= mesh)
+        # khóa cache của bản đồ vật liệu (kích thước segment được tính cùng lúc khi cache miss)
+        self.cache_key = find_voxel_cache_key(motor=motor,
+                                              geometry=geometry,
+                                              mesh=mesh).key if use_cache else None
         
         self.winding_current = create_winding_current(reluctance_network=self)
         self.magnetic_potential = create_magnetic_potential(reluctance_network= self)
-        self.elements = create_elements(self)
-    
+        self.element_field = create_element_field(reluctance_network=self,
+                                                  n_jobs=n_jobs,
+                                                  cache_key=self.cache_key,
+                                                  mixing_rule=mixing_rule)
+        self._elements = None
+        self._neighbor_table = None
+        self._branch_incidence = None
+        self._sparsity_pattern = None
+        # từ trở / sức từ động của mỗi mặt chung (lưu một lần), dùng cho lắp ráp và tính từ thông
+        self.face_field = FaceField(shape=self.element_field.shape,
+                                    periodic_boundary=self.mesh.periodic_boundary)
+        self.update_face_field()
+
+    @property
+    def neighbor_table(self):
+        """
+        Bảng lân cận (6, N) int32 theo chỉ số phẳng Fortran, hàng m*3 + n, -1 nếu không có lân cận.
+        Dùng chung cho lắp ráp phương trình, tính từ thông và hậu xử lý.
+        """
+        if getattr(self, "_neighbor_table", None) is None:
+            self._neighbor_table = create_neighbor_table(shape=self.element_field.shape,
+                                                         periodic_boundary=self.mesh.periodic_boundary).neighbor_table
+        return self._neighbor_table
+
+    @property
+    def branch_incidence(self):
+        """
+        Ma trận liên thuộc ô - nhánh (mỗi mặt chung là một nhánh), dùng chung cho lắp ráp G, J,
+        toán tử không ma trận và tính từ thông.
+        """
+        if getattr(self, "_branch_incidence", None) is None:
+            self._branch_incidence = create_branch_incidence(neighbor_table=self.neighbor_table)
+        return self._branch_incidence
+
+    @property
+    def sparsity_pattern(self):
+        """
+        Cấu trúc CSR của G và bản đồ phần tử -> G.data, tạo một lần (kết nối không đổi giữa các vòng lặp).
+        """
+        if getattr(self, "_sparsity_pattern", None) is None:
+            self._sparsity_pattern = create_sparsity_pattern(branch_incidence=self.branch_incidence,
+                                                             matrix_size=self.mesh.total_cells - 1)
+        return self._sparsity_pattern
+
+    @property
+    def elements(self):
+        # view Element cho tương thích ngược, chỉ tạo khi cần
+        if self._elements is None:
+            self._elements = create_elements(reluctance_network=self)
+        return self._elements
+
+    def __getstate__(self):
+        # không lưu các view Element, bảng lân cận, ma trận liên thuộc và cấu trúc CSR (tạo lại khi cần)
+        state = self.__dict__.copy()
+        state["_elements"] = None
+        state["_neighbor_table"] = None
+        state["_branch_incidence"] = None
+        state["_sparsity_pattern"] = None
+        return state
+
     def update_reluctance_network(self,
                                   magnetic_potential = None,
-                                  winding_current = None):
+                                  winding_current = None,
+                                  face_flux = None,
+                                  tolerance = None):
         
         update_reluctance_network(reluctance_network=self,
                                   magnetic_potential = magnetic_potential,
-                                  winding_current = winding_current)
+                                  winding_current = winding_current,
+                                  face_flux = face_flux,
+                                  tolerance = tolerance)
+
+    def update_face_field(self):
+        """
+        Đồng bộ face_field với ElementField; gọi lại sau khi sửa trực tiếp reluctance / magnetic_source.
+        """
+        update_face_field(reluctance_network=self)
+
+    def update_segments(self, segments, debug=True):
+        """
+        Thay các segment {chỉ số: Segment mới} và cập nhật tại chỗ chỉ vùng ô bị ảnh hưởng.
+        """
+        return update_segments(reluctance_network=self, segments=segments, debug=debug)
 
     def set_minimum_reluctance(self):
         set_minimum_reluctance(reluctance_network=self)
 
     def create_magnetic_potential_equation(self,
-                                           use_minimum_reluctance = False):
+                                           use_minimum_reluctance = False,
+                                           incremental = False,
+                                           max_row_fraction = 0.1,
+                                           debug = True):
         return create_magnetic_potential_equation(reluctance_network= self,
-                                                  use_minimum_reluctance= use_minimum_reluctance)
+                                                  use_minimum_reluctance= use_minimum_reluctance,
+                                                  incremental= incremental,
+                                                  max_row_fraction= max_row_fraction,
+                                                  debug= debug)
+
+    def create_magnetic_potential_operator(self,
+                                           use_minimum_reluctance = False,
+                                           debug = True):
+        """
+        G dạng LinearOperator không ma trận (lưới rất lớn), dùng với bộ giải lặp.
+        """
+        return create_magnetic_potential_operator(reluctance_network= self,
+                                                  use_minimum_reluctance= use_minimum_reluctance,
+                                                  debug= debug)
 
     def solve_magnetic_equation(self,
                                 max_iteration = 3,
                                 max_relative_residual = 0.05,
                                 damping_factor = 0.013,
+                                incremental = False,
+                                incremental_tolerance = 1e-6,
+                                linear_solver = "direct",
+                                amg_rebuild_tolerance = 0.1,
+                                lu_refactor_iteration = 10,
+                                nonlinear_solver = "picard",
+                                relaxation = "constant",
+                                damping_range = (0.01, 1.0),
                                 debug = True):
         solve_magnetic_equation(reluctance_network = self,
                                 max_iteration = max_iteration,
                                 max_relative_residual = max_relative_residual,
                                 damping_factor = damping_factor,
+                                incremental = incremental,
+                                incremental_tolerance = incremental_tolerance,
+                                linear_solver = linear_solver,
+                                amg_rebuild_tolerance = amg_rebuild_tolerance,
+                                lu_refactor_iteration = lu_refactor_iteration,
+                                nonlinear_solver = nonlinear_solver,
+                                relaxation = relaxation,
+                                damping_range = damping_range,
                                 debug = debug)
 
 
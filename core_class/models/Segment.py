@@ -8,10 +8,13 @@ class Segment:
                  magnetization_direction=np.array([0., 0., 1.]),
                  winding_vector=np.array([0., 0., 0.]),
                  winding_normal=np.array([0., 0., 1.]),
-                 dimension=np.array([0., 0., 0.])): 
+                 dimension=np.array([0., 0., 0.]),
+                 component=None): 
         
         self.mesh = mesh
         self.material = material
+        # nhóm bộ phận ("rotor", "stator", ...): mỗi nhóm được phân loại vật liệu và cache riêng
+        self.component = component
         self.magnet_source = float(magnet_source)
         
         self.magnetization_direction = np.array(magnetization_direction, dtype=float)
@@ -28,6 +31,7 @@ class Segment:
 
     def __repr__(self):
         return (f"Segment(mat='{self.material}', "
+                f"component={self.component}, "
                 f"dim={self.dimension})")
 
 if __name__ == "__main__":
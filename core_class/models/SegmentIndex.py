@@ -0,0 +1,135 @@
+import numpy as np
+from core_class.utils.find_segment_cylindrical_bounds import find_segment_cylindrical_bounds
+
+try:
+    from rtree import index as rtree_index
+except ImportError:
+    rtree_index = None
+
+TWO_PI = 2 * np.pi
+
+class SegmentIndex:
+    def __init__(self, geometry=None, tolerance=1e-9):
+        """
+        Chỉ mục không gian của các segment trong hệ trụ (r, theta, z).
+
+        Mỗi segment được bao bởi một hộp [r_min, r_max] x [theta_start, theta_start + theta_span]
+        x [z_min, z_max]. Khoảng theta vắt qua 2pi được tách thành 2 hộp trong [0, 2pi],
+        nhờ vậy truy vấn "segment nào có thể chạm khối ô này" chỉ là giao hộp thông thường.
+        Dùng rtree nếu có, ngược lại so sánh trực tiếp trên mảng numpy.
+        """
+        segments = geometry.geometry if hasattr(geometry, 'geometry') else (geometry or [])
+        self.number_of_segment = len(segments)
+        self.tolerance = tolerance
+
+        # bounds: (S, 6) [r_min, r_max, theta_start, theta_span, z_min, z_max], NaN nếu không có mesh
+        self.bounds = np.full((self.number_of_segment, 6), np.nan)
+        boxes = []
+        box_segment = []
+        for index, seg in enumerate(segments):
+            segment_bounds, segment_boxes = find_segment_boxes(seg, tolerance)
+            self.bounds[index] = segment_bounds
+            boxes.extend(segment_boxes)
+            box_segment.extend([index] * len(segment_boxes))
+
+        # boxes: (B, 6) theo kiểu interleaved của rtree [min_r, min_t, min_z, max_r, max_t, max_z]
+        self.boxes = np.array(boxes, dtype=float).reshape(-1, 6)
+        self.box_segment = np.array(box_segment, dtype=np.int64)
+        self._tree = None
+
+    def update_segment(self, index, segment):
+        """Cập nhật hộp bao của một segment (đã thay mesh) mà không dựng lại toàn bộ chỉ mục."""
+        segment_bounds, segment_boxes = find_segment_boxes(segment, self.tolerance)
+        self.bounds[index] = segment_bounds
+        keep = self.box_segment != index
+        self.boxes = np.concatenate((self.boxes[keep], np.array(segment_boxes, dtype=float).reshape(-1, 6)))
+        self.box_segment = np.concatenate((self.box_segment[keep],
+                                           np.full(len(segment_boxes), index, dtype=np.int64)))
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None and rtree_index is not None and len(self.boxes) > 0:
+            properties = rtree_index.Property()
+            properties.dimension = 3
+            self._tree = rtree_index.Index(((i, tuple(box), None) for i, box in enumerate(self.boxes)),
+                                           properties=properties)
+        return self._tree
+
+    def query(self, r_range, theta_range, z_range):
+        """Chỉ số (tăng dần) các segment có hộp bao giao với khối (r, theta, z) đã cho."""
+        return self.query_blocks(np.reshape(r_range, (1, 2)),
+                                 np.reshape(theta_range, (1, 2)),
+                                 np.reshape(z_range, (1, 2)))[0]
+
+    def query_blocks(self, r_ranges, theta_ranges, z_ranges):
+        """
+        Truy vấn hàng loạt cho M khối ô, mỗi đối số có shape (M, 2) [min, max].
+        Trả về list M mảng chỉ số segment ứng viên.
+        """
+        r_ranges = np.asarray(r_ranges, dtype=float)
+        theta_ranges = np.asarray(theta_ranges, dtype=float)
+        z_ranges = np.asarray(z_ranges, dtype=float)
+        number_of_block = len(r_ranges)
+
+        # --- 1. TÁCH KHOẢNG THETA VẮT QUA 2PI ---
+        query_box = []
+        query_block = []
+        for m in range(number_of_block):
+            span = theta_ranges[m, 1] - theta_ranges[m, 0]
+            for t_lo, t_hi in split_theta_range(theta_ranges[m, 0], span):
+                query_box.append([r_ranges[m, 0], t_lo, z_ranges[m, 0],
+                                  r_ranges[m, 1], t_hi, z_ranges[m, 1]])
+                query_block.append(m)
+
+        if len(self.boxes) == 0:
+            return [np.zeros(0, dtype=np.int64) for _ in range(number_of_block)]
+
+        # --- 2. GIAO HỘP ---
+        hits = [[] for _ in range(number_of_block)]
+        tree = self.tree
+        if tree is not None:
+            for box, m in zip(query_box, query_block):
+                hits[m].extend(tree.intersection(tuple(box)))
+        else:
+            query_box = np.array(query_box)
+            overlap = np.all((self.boxes[None, :, :3] <= query_box[:, None, 3:]) &
+                             (self.boxes[None, :, 3:] >= query_box[:, None, :3]), axis=-1)
+            for q, m in enumerate(query_block):
+                hits[m].extend(np.flatnonzero(overlap[q]))
+
+        return [np.unique(self.box_segment[np.array(hit, dtype=np.int64)]) for hit in hits]
+
+    def __getstate__(self):
+        # rtree không pickle được, dựng lại khi cần
+        state = self.__dict__.copy()
+        state['_tree'] = None
+        return state
+
+
+def find_segment_boxes(seg, tolerance):
+    """Biên trụ (6,) của segment và các hộp (đã nới tolerance, tách theo 2pi) của nó."""
+    if seg.mesh is None:
+        return np.full(6, np.nan), []
+    b = find_segment_cylindrical_bounds(seg.mesh)
+    bounds = [b.r_min, b.r_max, b.theta_start, b.theta_span, b.z_min, b.z_max]
+
+    scale = max(b.r_max, b.z_max - b.z_min, 1.0)
+    pad = tolerance * scale
+    r_box = (max(0.0, b.r_min - pad), b.r_max + pad)
+    z_box = (b.z_min - pad, b.z_max + pad)
+    boxes = [[r_box[0], t_lo, z_box[0], r_box[1], t_hi, z_box[1]]
+             for t_lo, t_hi in split_theta_range(b.theta_start - tolerance,
+                                                 b.theta_span + 2 * tolerance)]
+    return bounds, boxes
+
+
+def split_theta_range(theta_start, theta_span):
+    """Đưa khoảng [theta_start, theta_start + theta_span] về [0, 2pi], tách làm 2 nếu vắt qua 2pi."""
+    if theta_span >= TWO_PI:
+        return [(0.0, TWO_PI)]
+    start = float(np.mod(theta_start, TWO_PI))
+    end = start + max(float(theta_span), 0.0)
+    if end <= TWO_PI:
+        return [(start, end)]
+    return [(start, TWO_PI), (0.0, end - TWO_PI)]
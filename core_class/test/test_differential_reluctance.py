@@ -0,0 +1,50 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from material.models.MaterialDataBase import MaterialDataBase
+    from core_class.models.ElementField import ElementField, MATERIAL_ID
+    from core_class.utils.find_relative_permeability import find_relative_permeability
+    from core_class.utils.find_differential_reluctance import find_differential_reluctance
+
+    rng = np.random.default_rng(0)
+    shape = (4, 3, 2)
+    material_database = MaterialDataBase()
+    B = rng.uniform(0.2, 1.8, shape + (2, 3)) * rng.choice([-1, 1], shape + (2, 3))
+    h = 1e-6
+
+    for mixing_rule in ["dominant", "arithmetic", "harmonic"]:
+        element_field = ElementField(shape=shape, material_database=material_database, mixing_rule=mixing_rule)
+        element_field.material_id[...] = MATERIAL_ID["iron"]
+        element_field.material_id[0] = MATERIAL_ID["magnet"]
+        element_field.material_fraction[...] = 0.0
+        element_field.material_fraction[..., MATERIAL_ID["iron"]] = rng.uniform(0.2, 1.0, shape)
+        element_field.material_fraction[..., MATERIAL_ID["air"]] = 1.0 - element_field.material_fraction[..., MATERIAL_ID["iron"]]
+        element_field.vacuum_reluctance[...] = rng.uniform(1e6, 1e7, shape + (2, 3))
+
+        def find_potential_drop(flux_density):
+            # V = R(B) * Phi với Phi = B * S (S = 1)
+            element_field.flux_density_direct = flux_density
+            mu = find_relative_permeability(element_field=element_field).relative_permeability
+            return element_field.vacuum_reluctance / mu * flux_density
+
+        element_field.flux_density_direct = B
+        permeability = find_relative_permeability(element_field=element_field, return_derivative=True)
+        element_field.relative_permeability = permeability.relative_permeability
+        differential = find_differential_reluctance(element_field=element_field,
+                                                    relative_permeability_derivative=permeability.relative_permeability_derivative).differential_reluctance
+
+        # so với sai phân trung tâm của V theo Phi
+        expected = (find_potential_drop(B + h) - find_potential_drop(B - h)) / (2 * h)
+        assert np.all(differential > 0)
+        assert np.allclose(differential, expected, rtol=2e-2)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
@@ -0,0 +1,61 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.models.SegmentIndex import SegmentIndex
+    from core_class.utils.voxelize_geometry import voxelize_geometry
+    from core_class.utils.find_dirty_region import find_dirty_region
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    def create_magnet(center_angle_rad, angle_rad=np.pi / 3):
+        return Segment(mesh=create_cylindrical_shell_segment(inner_radius=0.03, outer_radius=0.05, height=0.002,
+                                                             angle_rad=angle_rad,
+                                                             center_angle_rad=center_angle_rad,
+                                                             z_offset=0.004),
+                       material="magnet")
+
+    segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.004), material="iron")]
+    segments += [create_magnet(i * np.pi / 2) for i in range(4)]
+    geometry = Geometry(geometry=segments)
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.06, 9),
+                           theta_nodes=np.linspace(0, 2 * np.pi, 49),
+                           z_nodes=np.linspace(0, 0.008, 9))
+    voxel = voxelize_geometry(geometry=geometry, mesh=mesh, debug=False)
+
+    # thay nam châm vắt qua theta = 0 bằng nam châm rộng hơn
+    old_bounds = geometry.spatial_index.bounds[[1]].copy()
+    geometry.replace_segment(1, create_magnet(0.1, angle_rad=np.pi / 2))
+    assert np.allclose(geometry.spatial_index.bounds, SegmentIndex(geometry=geometry).bounds)
+
+    region = find_dirty_region(mesh=mesh, bounds=np.concatenate((old_bounds, geometry.spatial_index.bounds[[1]])))
+    assert len(region.boxes) == 2 and region.n_cells < np.prod(voxel.material_id.shape)
+
+    for i0, i1, j0, j1, k0, k1 in region.boxes:
+        sub_mesh = CylindricalMesh(r_nodes=mesh.r_nodes[i0:i1 + 1],
+                                   theta_nodes=mesh.theta_nodes[j0:j1 + 1],
+                                   z_nodes=mesh.z_nodes[k0:k1 + 1])
+        box = (slice(i0, i1), slice(j0, j1), slice(k0, k1))
+        sub = voxelize_geometry(geometry=geometry, mesh=sub_mesh, debug=False)
+        voxel.material_id[box] = sub.material_id
+        voxel.segment_index[box] = sub.segment_index
+        voxel.center_segment[box] = sub.center_segment
+
+    # vá cục bộ cho kết quả giống phân loại lại toàn bộ
+    full = voxelize_geometry(geometry=geometry, mesh=mesh, debug=False)
+    assert np.array_equal(full.material_id, voxel.material_id)
+    assert np.array_equal(full.segment_index, voxel.segment_index)
+    assert np.array_equal(full.center_segment, voxel.center_segment)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
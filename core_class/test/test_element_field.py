@@ -0,0 +1,59 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.ElementField import ElementField
+    from core_class.models.MagneticPotential import MagneticPotential
+    from core_class.utils.find_flux_direct import find_flux_direct, find_flux
+
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.05, 4),
+                           theta_nodes=np.linspace(0, np.pi / 3, 6),
+                           z_nodes=np.linspace(0, 0.01, 4))
+    shape = (mesh.n_cells_r, mesh.n_cells_t, mesh.n_cells_z)
+
+    rng = np.random.default_rng(0)
+    element_field = ElementField(shape=shape)
+    element_field.vacuum_reluctance[...] = rng.uniform(1e5, 1e6, shape + (2, 3))
+    element_field.magnet_source[...] = rng.uniform(-10, 10, shape + (2, 3))
+    magnetic_potential = MagneticPotential(data=np.asfortranarray(rng.uniform(-50, 50, shape)),
+                                           periodic_boundary=True)
+
+    flux_direct = find_flux_direct(element_field=element_field,
+                                   magnetic_potential=magnetic_potential).flux_direct
+
+    # so sánh với cách tính từng element
+    R, F, U = element_field.reluctance, element_field.magnetic_source, magnetic_potential.data
+    for position in np.ndindex(shape):
+        for m in [0, 1]:
+            for n in [0, 1, 2]:
+                step = [0, 0, 0]
+                step[n] = -1 if m == 0 else 1
+                neighbor = magnetic_potential.retrieve(position=tuple(np.add(position, step)))
+                expected = 0.0
+                if neighbor.valid:
+                    nei = magnetic_potential.get_3D_index(neighbor.index).three_dimension_index
+                    begin, end = (nei, position) if m == 0 else (position, nei)
+                    expected = find_flux(begin_potential=U[begin], end_potential=U[end],
+                                         r1=R[nei][1 - m, n], r2=R[position][m, n],
+                                         f1=F[nei][1 - m, n], f2=F[position][m, n])
+                assert np.isclose(flux_direct[position][m, n], expected)
+
+    # tensor hình học của lưới (broadcasting theo trục) khớp với công thức theo từng phần tử
+    from core_class.utils.find_element_dimension import find_element_dimension
+    dimension = find_element_dimension(coordinate=mesh.get_cell_coordinate())
+    assert np.array_equal(mesh.length, dimension.length)
+    assert np.array_equal(mesh.section_area, dimension.section_area)
+    assert mesh.vacuum_reluctance.shape == shape + (2, 3) and not mesh.vacuum_reluctance.flags.writeable
+
+    print(element_field)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
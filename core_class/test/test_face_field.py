@@ -0,0 +1,60 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.ElementField import ElementField
+    from core_class.models.FaceField import FaceField
+    from core_class.utils.create_neighbor_table import create_neighbor_table
+    from core_class.utils.create_branch_incidence import create_branch_incidence
+    from core_class.utils.find_branch_reluctance import find_branch_reluctance
+
+    rng = np.random.default_rng(0)
+    shape = (3, 4, 5)
+    for periodic_boundary in [True, False]:
+        element_field = ElementField(shape=shape)
+        element_field.vacuum_reluctance[...] = rng.uniform(1e5, 1e6, shape + (2, 3))
+        element_field.magnet_source[...] = rng.uniform(-10, 10, shape + (2, 3))
+        neighbor_table = create_neighbor_table(shape=shape, periodic_boundary=periodic_boundary).neighbor_table
+        branch_incidence = create_branch_incidence(neighbor_table=neighbor_table)
+
+        face_field = FaceField(shape=shape, periodic_boundary=periodic_boundary)
+        assert np.array_equal(face_field.offset, branch_incidence.offset)
+        branch = find_branch_reluctance(element_field=element_field, branch_incidence=branch_incidence)
+        face_field.reluctance[:] = branch.reluctance
+        face_field.magnetic_source[:] = branch.magnetic_source
+
+        # mỗi mặt = nửa trên của ô dưới + nửa dưới của ô trên
+        R = element_field.reluctance
+        r_face, theta_face, z_face = face_field.reluctance_face
+        assert np.array_equal(r_face, R[:-1, :, :, 1, 0] + R[1:, :, :, 0, 0])
+        assert np.array_equal(z_face, R[:, :, :-1, 1, 2] + R[:, :, 1:, 0, 2])
+        if periodic_boundary:
+            assert np.array_equal(theta_face, R[:, :, :, 1, 1] + np.roll(R[:, :, :, 0, 1], -1, axis=1))
+        else:
+            assert np.array_equal(theta_face, R[:, :-1, :, 1, 1] + R[:, 1:, :, 0, 1])
+
+        # nhánh của từng nửa: nửa trên là ô dưới của nhánh, nửa dưới là ô trên; -1 trên biên
+        cell, half, direction = (a.ravel() for a in np.meshgrid(np.arange(np.prod(shape)), [0, 1], [0, 1, 2],
+                                                                 indexing='ij'))
+        branch = face_field.half_branch(cell=cell, half=half, direction=direction)
+        assert np.array_equal(branch < 0, neighbor_table[half * 3 + direction, cell] < 0)
+        inside = branch >= 0
+        end = np.where(half == 1, branch_incidence.low[branch], branch_incidence.high[branch])
+        assert np.array_equal(end[inside], cell[inside])
+        assert np.array_equal(branch_incidence.direction[branch[inside]], direction[inside])
+
+        # view lên mảng nhánh: ghi vào mảng mặt thay đổi mảng nhánh
+        z_face[0, 0, 0] = -1.0
+        assert face_field.reluctance[face_field.offset[2]] == -1.0
+
+    print(face_field)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
@@ -0,0 +1,38 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.ElementField import MATERIAL_ID
+    from core_class.utils.find_mixed_permeability import find_mixed_permeability
+
+    rng = np.random.default_rng(0)
+    shape = (3, 4, 2)
+    permeability = [1.0, 1.05, rng.uniform(100, 5000, shape + (2, 3))]
+
+    # ô một vật liệu: cả hai quy tắc cho đúng độ từ thẩm của vật liệu đó
+    material_id = rng.integers(0, 3, shape)
+    one_hot = np.eye(3)[material_id]
+    expected = np.where(material_id[..., None, None] == MATERIAL_ID["iron"], permeability[2],
+                        np.where(material_id[..., None, None] == MATERIAL_ID["magnet"], 1.05, 1.0))
+    for mixing_rule in ["arithmetic", "harmonic"]:
+        mixed = find_mixed_permeability(one_hot, permeability, mixing_rule).relative_permeability
+        assert np.allclose(mixed, expected)
+
+    # ô nhiều vật liệu: harmonic <= arithmetic, cả hai nằm giữa min và max
+    fraction = rng.dirichlet(np.ones(3), shape)
+    arithmetic = find_mixed_permeability(fraction, permeability, "arithmetic").relative_permeability
+    harmonic = find_mixed_permeability(fraction, permeability, "harmonic").relative_permeability
+    assert np.all(harmonic <= arithmetic + 1e-12)
+    assert np.all(harmonic >= 1.0 - 1e-12) and np.all(arithmetic <= permeability[2] + 1e-9)
+    assert np.allclose(arithmetic, fraction[..., 0, None, None] + 1.05 * fraction[..., 1, None, None]
+                       + fraction[..., 2, None, None] * permeability[2])
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
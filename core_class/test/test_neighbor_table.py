@@ -0,0 +1,33 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.MagneticPotential import MagneticPotential
+    from core_class.utils.create_neighbor_table import create_neighbor_table
+
+    shape = (3, 4, 2)
+    for periodic_boundary in [True, False]:
+        neighbor_table = create_neighbor_table(shape=shape,
+                                               periodic_boundary=periodic_boundary).neighbor_table
+        magnetic_potential = MagneticPotential(data=np.zeros(shape, order='F'),
+                                               periodic_boundary=periodic_boundary)
+
+        # so sánh với MagneticPotential.retrieve cho từng ô
+        for position in np.ndindex(shape):
+            index = magnetic_potential.retrieve(position=position).index
+            for m in [0, 1]:
+                for n in [0, 1, 2]:
+                    step = [0, 0, 0]
+                    step[n] = -1 if m == 0 else 1
+                    neighbor = magnetic_potential.retrieve(position=tuple(np.add(position, step)))
+                    assert neighbor_table[m * 3 + n, index] == neighbor.index
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
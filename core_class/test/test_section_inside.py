@@ -0,0 +1,42 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    import shapely
+    from core_class.utils.voxelize_geometry import find_cell_sample
+    from core_class.utils.find_section_inside import find_section_inside
+
+    # tiết diện có lỗ, cạnh cong và cạnh thẳng, cắt qua nhiều ô
+    section = shapely.Point(0.0, 0.0).buffer(0.8).difference(shapely.box(-0.1, -0.9, 0.3, 0.2))
+    section = section.union(shapely.box(0.6, 0.6, 1.2, 0.9))
+
+    r_nodes = np.linspace(0.05, 1.1, 41)
+    n_sr, n_st = 3, 3
+    for theta_nodes in [np.linspace(0.0, 2 * np.pi, 61),
+                        np.concatenate((np.linspace(5.5, 2 * np.pi, 12), np.linspace(0.0, 1.0, 20)))]:
+        # ô theta có thể không liên tục (vắt qua 2pi)
+        t_edge = np.column_stack((theta_nodes[:-1], theta_nodes[1:]))
+        t_edge = t_edge[t_edge[:, 1] > t_edge[:, 0]]
+        r_edge = np.column_stack((r_nodes[:-1], r_nodes[1:]))
+
+        r_sample = find_cell_sample(r_nodes, n_sr)
+        t_sample = t_edge[:, :1] + (t_edge[:, 1:] - t_edge[:, :1]) * (np.arange(n_st) + 0.5) / n_st
+        R = np.repeat(r_sample.reshape(-1, 1), t_sample.size, axis=1)
+        T = np.repeat(t_sample.reshape(1, -1), r_sample.size, axis=0)
+        X, Y = R * np.cos(T), R * np.sin(T)
+
+        result = find_section_inside(section, r_edge, t_edge, X, Y, n_sr, n_st)
+        expected = shapely.contains_xy(section, X, Y).reshape(result.inside.shape)
+        assert np.array_equal(result.inside, expected)
+        # chỉ các ô cắt biên được kiểm tra từng điểm
+        assert result.n_leaf < len(r_edge) * len(t_edge) / 2
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
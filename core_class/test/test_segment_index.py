@@ -0,0 +1,43 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    tube = create_tube(inner_radius=0.01, outer_radius=0.02, height=0.005)
+    # segment vắt qua theta = 0 (2pi)
+    magnet = create_cylindrical_shell_segment(inner_radius=0.03,
+                                              outer_radius=0.05,
+                                              height=0.004,
+                                              angle_rad=np.pi / 4,
+                                              center_angle_rad=0.0,
+                                              z_offset=0.005)
+    geometry = Geometry(geometry=[Segment(mesh=tube, material="iron"),
+                                  Segment(mesh=magnet, material="magnet")])
+    spatial_index = geometry.spatial_index
+
+    r_min, r_max, theta_start, theta_span, z_min, z_max = spatial_index.bounds[0]
+    assert np.isclose(r_min, 0.01, rtol=1e-2) and np.isclose(r_max, 0.02)
+    assert np.isclose(theta_span, 2 * np.pi)
+
+    r_min, r_max, theta_start, theta_span, z_min, z_max = spatial_index.bounds[1]
+    assert np.isclose(theta_start, 2 * np.pi - np.pi / 8) and np.isclose(theta_span, np.pi / 4)
+    assert np.isclose(z_min, 0.005) and np.isclose(z_max, 0.009)
+
+    assert list(spatial_index.query((0.0, 0.1), (0.0, 0.1), (0.0, 0.01))) == [0, 1]
+    assert list(spatial_index.query((0.0, 0.1), (np.pi / 2, np.pi), (0.0, 0.01))) == [0]
+    assert list(spatial_index.query((0.03, 0.04), (-0.1, 0.1), (0.006, 0.007))) == [1]
+    assert list(spatial_index.query((0.03, 0.04), (0.0, 0.1), (0.02, 0.03))) == []
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
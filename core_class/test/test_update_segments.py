@@ -0,0 +1,63 @@
+import sys
+import os
+
+def test():
+    import copy
+    import types
+    import numpy as np
+    from material.models.MaterialDataBase import MaterialDataBase
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.models.ReluctanceNetwork import ReluctanceNetwork
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    def create_magnet(center_angle_rad, angle_rad=np.pi / 3, sign=1.0):
+        return Segment(mesh=create_cylindrical_shell_segment(inner_radius=0.03, outer_radius=0.05, height=0.002,
+                                                             angle_rad=angle_rad,
+                                                             center_angle_rad=center_angle_rad,
+                                                             z_offset=0.004),
+                       material="magnet", magnet_source=852000.0 * 0.002,
+                       magnetization_direction=np.array([0.0, 0.0, sign]))
+
+    def create_network(geometry):
+        mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.06, 9),
+                               theta_nodes=np.linspace(0, 2 * np.pi, 49),
+                               z_nodes=np.linspace(0, 0.008, 9))
+        return ReluctanceNetwork(motor=types.SimpleNamespace(material_database=MaterialDataBase()),
+                                 geometry=geometry, mesh=mesh, use_cache=False)
+
+    segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.004), material="iron")]
+    segments += [create_magnet(i * np.pi / 2, sign=(-1.0) ** i) for i in range(4)]
+    reluctance_network = create_network(Geometry(geometry=segments))
+
+    material_fraction = reluctance_network.element_field.material_fraction.copy()
+
+    # thay nam châm vắt qua theta = 0 bằng nam châm rộng hơn, cập nhật tại chỗ
+    update = reluctance_network.update_segments({1: create_magnet(0.1, angle_rad=np.pi / 2)}, debug=False)
+    assert 0 < update.n_voxelized < np.prod(reluctance_network.element_field.shape)
+    assert not np.array_equal(reluctance_network.element_field.material_fraction, material_fraction)
+
+    # so sánh với mạng dựng mới từ geometry đã sửa
+    fresh = create_network(Geometry(geometry=copy.deepcopy(reluctance_network.geometry.geometry)))
+    updated_field, fresh_field = reluctance_network.element_field, fresh.element_field
+    for name in ("material_id", "segment_index", "material_fraction", "dimension",
+                 "magnetic_source", "minimum_reluctance", "reluctance"):
+        assert np.array_equal(getattr(updated_field, name), getattr(fresh_field, name)), name
+    assert np.array_equal([seg.dimension for seg in reluctance_network.geometry.geometry],
+                          [seg.dimension for seg in fresh.geometry.geometry])
+
+    updated = reluctance_network.create_magnetic_potential_equation(debug=False)
+    assembled = fresh.create_magnetic_potential_equation(debug=False)
+    assert np.array_equal(updated.G.toarray(), assembled.G.toarray())
+    assert np.array_equal(updated.J, assembled.J)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
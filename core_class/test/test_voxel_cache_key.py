@@ -0,0 +1,45 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    import trimesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.utils.find_voxel_cache_key import find_voxel_cache_key
+
+    class Motor:
+        def __init__(self):
+            self.pole_pair = 4
+            self.magnet_length = 0.005
+
+    def create_geometry(scale):
+        box = trimesh.creation.box(extents=[0.01, 0.01, 0.01])
+        box.apply_translation([0.05, 0.0, 0.0])
+        box.apply_scale(scale)
+        return Geometry(geometry=[Segment(mesh=box, material="iron")])
+
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.08, 5),
+                           theta_nodes=np.linspace(0.0, 2 * np.pi, 9),
+                           z_nodes=np.linspace(-0.01, 0.01, 3),
+                           periodic_boundary=True)
+    motor = Motor()
+
+    key = find_voxel_cache_key(motor=motor, geometry=create_geometry(1.0), mesh=mesh).key
+    assert find_voxel_cache_key(motor=motor, geometry=create_geometry(1.0), mesh=mesh).key == key
+
+    # cùng tham số động cơ nhưng segment bị thay đổi: khóa phải đổi
+    geometry = create_geometry(1.0)
+    scaled = create_geometry(1.1).geometry[0]
+    geometry.replace_segment(0, scaled)
+    assert find_voxel_cache_key(motor=motor, geometry=geometry, mesh=mesh).key != key
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
@@ -0,0 +1,52 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.ElementField import MATERIAL_ID
+    from core_class.utils.voxelize_geometry import voxelize_geometry
+    from core_class.utils.voxelize_geometry_parallel import voxelize_geometry_parallel
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    magnet_mesh = create_cylindrical_shell_segment(inner_radius=0.03,
+                                                   outer_radius=0.05,
+                                                   height=0.004,
+                                                   angle_rad=np.pi / 4,
+                                                   center_angle_rad=np.pi / 4,
+                                                   z_offset=0.002,
+                                                   sections=60)
+    geometry = [Segment(mesh=magnet_mesh, material="magnet", magnet_source=100.0)]
+
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.06, 9),
+                           theta_nodes=np.linspace(0, np.pi / 2, 13),
+                           z_nodes=np.linspace(0, 0.008, 9))
+
+    voxel = voxelize_geometry(geometry=geometry, mesh=mesh, debug=False)
+
+    fraction = voxel.material_fraction[..., MATERIAL_ID["magnet"]]
+    volume = np.sum(fraction * mesh.get_cell_volumes())
+    print(f"Voxel volume: {volume:.6e}, mesh volume: {magnet_mesh.volume:.6e}")
+    assert abs(volume / magnet_mesh.volume - 1) < 0.02
+
+    # ô nằm hẳn bên trong nam châm: r 0.035, theta pi/4, z 0.004
+    assert voxel.material_id[3, 6, 4] == MATERIAL_ID["magnet"]
+    assert voxel.segment_index[3, 6, 4] == 0
+    assert np.isclose(np.sum(voxel.material_fraction[3, 6, 4]), 1.0)
+    assert voxel.material_id[0, 0, 0] == MATERIAL_ID["air"]
+    assert voxel.segment_index[0, 0, 0] == -1
+
+    # song song theo z-slab phải cho kết quả giống hệt
+    voxel_parallel = voxelize_geometry_parallel(geometry=geometry, mesh=mesh, n_jobs=2, debug=False)
+    assert np.array_equal(voxel.material_fraction, voxel_parallel.material_fraction)
+    assert np.array_equal(voxel.segment_index, voxel_parallel.segment_index)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
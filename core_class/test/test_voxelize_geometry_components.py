@@ -0,0 +1,63 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.utils.voxelize_geometry import voxelize_geometry
+    from core_class.utils.voxelize_geometry_components import voxelize_geometry_components
+    from core_class.utils.find_component_cache_key import find_component_cache_key
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    def create_stator(z_offset):
+        return [Segment(mesh=create_tube(inner_radius=0.025, outer_radius=0.055, height=0.003, z_offset=z_offset),
+                        material="iron", component="stator")]
+
+    # rotor: ống sắt + 4 nam châm, stator: ống sắt phía trên khe hở
+    segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.004),
+                        material="iron", component="rotor")]
+    for i in range(4):
+        magnet_mesh = create_cylindrical_shell_segment(inner_radius=0.03,
+                                                       outer_radius=0.05,
+                                                       height=0.002,
+                                                       angle_rad=np.pi / 3,
+                                                       center_angle_rad=i * np.pi / 2,
+                                                       z_offset=0.004)
+        segments.append(Segment(mesh=magnet_mesh, material="magnet", component="rotor"))
+    segments += create_stator(z_offset=0.0065)
+    geometry = Geometry(geometry=segments)
+
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.06, 5),
+                           theta_nodes=np.linspace(0, 2 * np.pi, 25),
+                           z_nodes=np.linspace(0, 0.01, 11))
+
+    full = voxelize_geometry(geometry=geometry, mesh=mesh, debug=False)
+    components = voxelize_geometry_components(geometry=geometry, mesh=mesh, use_cache=False, debug=False)
+    assert components.n_component == 2
+    voxel = components.voxel
+    assert np.array_equal(full.material_id, voxel.material_id)
+    assert np.array_equal(full.segment_index, voxel.segment_index)
+    assert np.array_equal(full.material_segment, voxel.material_segment)
+    assert np.array_equal(full.center_segment, voxel.center_segment)
+    assert np.allclose(full.material_fraction, voxel.material_fraction, rtol=0, atol=1e-12)
+
+    # khóa cache của bộ phận không đổi khi cả bộ phận và lưới của nó cùng tịnh tiến theo z
+    def sub_mesh(z_nodes):
+        return CylindricalMesh(r_nodes=mesh.r_nodes, theta_nodes=mesh.theta_nodes, z_nodes=z_nodes)
+    z_nodes = np.array([0.006, 0.007, 0.008, 0.009, 0.010])
+    key = find_component_cache_key(create_stator(0.0065), sub_mesh(z_nodes), z_origin=z_nodes[0]).key
+    moved = find_component_cache_key(create_stator(0.0075), sub_mesh(z_nodes + 0.001), z_origin=z_nodes[0] + 0.001).key
+    changed = find_component_cache_key(create_stator(0.0070), sub_mesh(z_nodes), z_origin=z_nodes[0]).key
+    assert key == moved and key != changed
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
@@ -0,0 +1,49 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.utils.voxelize_geometry import voxelize_geometry
+    from core_class.utils.voxelize_geometry_periodic import voxelize_geometry_periodic
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    # 4 cực nam châm đổi dấu trên một ống sắt
+    segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.004), material="iron")]
+    for i in range(4):
+        magnet_mesh = create_cylindrical_shell_segment(inner_radius=0.03,
+                                                       outer_radius=0.05,
+                                                       height=0.002,
+                                                       angle_rad=np.pi / 3,
+                                                       center_angle_rad=i * np.pi / 2,
+                                                       z_offset=0.004)
+        segments.append(Segment(mesh=magnet_mesh,
+                                material="magnet",
+                                magnet_source=100.0,
+                                magnetization_direction=np.array([0, 0, (-1)**i])))
+    geometry = Geometry(geometry=segments)
+
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.06, 5),
+                           theta_nodes=np.linspace(0, 2 * np.pi, 25),
+                           z_nodes=np.linspace(0, 0.008, 9))
+
+    full = voxelize_geometry(geometry=geometry, mesh=mesh, debug=False)
+    periodic = voxelize_geometry_periodic(geometry=geometry, mesh=mesh, debug=False)
+
+    assert np.array_equal(full.material_id, periodic.material_id)
+    assert np.array_equal(full.segment_index, periodic.segment_index)
+    assert np.array_equal(full.material_segment, periodic.material_segment)
+    assert np.array_equal(full.center_segment, periodic.center_segment)
+    assert np.allclose(full.material_fraction, periodic.material_fraction, rtol=0, atol=1e-12)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
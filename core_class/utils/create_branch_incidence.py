@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+import scipy.sparse as sp
+
+@dataclass
+class Output:
+    incidence: Any          # csr (N, E): +1 tại ô dưới, -1 tại ô trên của mỗi nhánh
+    low: np.ndarray         # (E,) ô phía dưới (r_in / t_left / z_bot) của nhánh
+    high: np.ndarray        # (E,) ô phía trên (r_out / t_right / z_top)
+    direction: np.ndarray   # (E,) hướng n của nhánh: 0 (r), 1 (theta), 2 (z)
+    offset: np.ndarray      # (4,) nhánh hướng n nằm trong [offset[n], offset[n + 1])
+    reduced: Any = None     # A bỏ hàng nút tham chiếu (CSR) cho toán tử không ma trận (find_reduced_incidence)
+
+def create_branch_incidence(neighbor_table):
+    """
+    Ma trận liên thuộc ô - nhánh A của mạng từ trở: mỗi mặt chung giữa hai ô là một nhánh duy nhất
+    nối nửa [1, n] của ô dưới với nửa [0, n] của ô trên (theo neighbor_table, đã gồm theta tuần hoàn).
+
+    Các nhánh được xếp theo hướng (r, theta, z), trong mỗi hướng theo chỉ số phẳng của ô dưới.
+    Với từ trở R và nguồn F của nhánh (find_branch_reluctance):
+        từ thông nhánh   Phi = (A^T U + F) / R   (chiều dương: từ ô dưới sang ô trên)
+        định luật Kirchhoff A Phi = 0  ->  -A diag(1/R) A^T U = A diag(1/R) F
+    """
+    number_of_cell = neighbor_table.shape[1]
+    low, high, direction = [], [], []
+    for n in range(3):
+        cells = np.flatnonzero(neighbor_table[3 + n] >= 0)
+        low.append(cells)
+        high.append(neighbor_table[3 + n, cells].astype(np.int64))
+        direction.append(np.full(len(cells), n, dtype=np.int8))
+    low, high, direction = (np.concatenate(a) for a in (low, high, direction))
+    offset = np.concatenate(([0], np.cumsum(np.bincount(direction, minlength=3))))
+
+    number_of_branch = len(low)
+    branch = np.arange(number_of_branch)
+    # nhánh tự nối (một ô theo theta tuần hoàn) có cột bằng 0 sau khi cộng dồn
+    incidence = sp.csr_matrix((np.concatenate((np.ones(number_of_branch), -np.ones(number_of_branch))),
+                               (np.concatenate((low, high)), np.concatenate((branch, branch)))),
+                              shape=(number_of_cell, number_of_branch))
+
+    return Output(incidence=incidence, low=low, high=high, direction=direction, offset=offset)
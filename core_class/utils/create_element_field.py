@@ -0,0 +1,60 @@
+from core_class.models.ElementField import ElementField
+from core_class.utils.voxelize_geometry_cached import voxelize_geometry_cached
+from core_class.utils.find_segment_attribute import find_segment_attribute
+from core_class.utils.fill_element_field import fill_element_field
+import numpy as np 
+
+def create_element_field(reluctance_network, n_sample=(3, 3, 3), n_jobs=1, cache_key=None,
+                         use_periodicity=True, mixing_rule="dominant", debug=True):
+    """
+    Tạo ElementField (structure-of-arrays) cho toàn bộ lưới.
+    Vật liệu được phân loại bằng voxelize_geometry, các đại lượng dẫn xuất được tính trên cả mảng.
+    n_jobs > 1 (hoặc None/-1: toàn bộ CPU) phân loại song song theo các lớp z.
+    cache_key: khóa voxel_cache của bản đồ vật liệu (None: luôn tính lại).
+    use_periodicity: tận dụng tính tuần hoàn theta của geometry khi phân loại vật liệu.
+    mixing_rule: "dominant" (mỗi ô một vật liệu) hoặc "arithmetic" / "harmonic" - trộn độ từ thẩm
+    theo tỉ lệ thể tích material_fraction cho các ô chứa nhiều vật liệu (xem find_mixed_permeability).
+    """
+    mesh = reluctance_network.mesh
+    nr = int(mesh.n_cells_r)
+    nt = int(mesh.n_cells_t)
+    nz = int(mesh.n_cells_z)
+    
+    total_elements = nr * nt * nz
+    winding_current = reluctance_network.winding_current
+
+    element_field = ElementField(shape=(nr, nt, nz),
+                                 number_of_phase=np.size(winding_current),
+                                 material_database=reluctance_network.material_database,
+                                 mixing_rule=mixing_rule)
+    
+    if debug:
+        print(f"[INFO] Initializing {total_elements} elements...")
+
+    # --- 1. PHÂN LOẠI VẬT LIỆU (TOÀN BỘ LƯỚI) ---
+    voxel = voxelize_geometry_cached(geometry=reluctance_network.geometry,
+                                     mesh=mesh,
+                                     cache_key=cache_key,
+                                     n_sample=n_sample,
+                                     n_jobs=n_jobs,
+                                     use_periodicity=use_periodicity,
+                                     debug=debug).voxel
+    element_field.material_id = voxel.material_id
+    element_field.segment_index = voxel.segment_index
+    element_field.material_fraction = voxel.material_fraction
+    element_field.center_segment = voxel.center_segment
+
+    # tensor hình học dùng chung của lưới (chỉ đọc, không copy)
+    element_field.dimension[..., 0, :] = mesh.cell_size
+    element_field.length = mesh.length
+    element_field.section_area = mesh.section_area
+    element_field.vacuum_reluctance = mesh.vacuum_reluctance
+
+    # --- 2. THUỘC TÍNH SEGMENT VÀ CÁC ĐẠI LƯỢNG DẪN XUẤT (VECTOR HÓA) ---
+    segment_attribute = find_segment_attribute(geometry=reluctance_network.geometry,
+                                               number_of_phase=element_field.number_of_phase)
+    fill_element_field(element_field=element_field,
+                       segment_attribute=segment_attribute,
+                       winding_current=winding_current)
+
+    return element_field
@@ -1,34 +1,16 @@
 from core_class.models.Element import Element
 import numpy as np 
-from tqdm import tqdm
 
-def create_elements(motor, debug=True):
-    nr = int(motor.mesh.n_cells_r)
-    nt = int(motor.mesh.n_cells_t)
-    nz = int(motor.mesh.n_cells_z)
+def create_elements(reluctance_network):
+    """
+    Mảng object các Element (view mỏng lên element_field), chỉ dùng cho tương thích ngược.
+    Element chỉ giữ chỉ số phẳng nên được tạo theo thứ tự Fortran rồi reshape.
+    """
+    nr, nt, nz = reluctance_network.element_field.shape
     
-    total_elements = nr * nt * nz
-    
-    elements = np.empty((nr, nt, nz), dtype=object, order='F')
-    
-    if debug:
-        print(f"[INFO] Initializing {total_elements} elements...")
-
-    with tqdm(total=total_elements, desc="Creating Objects", disable=not debug) as pbar:
-        for i_z in range(nz):
-            for i_t in range(nt):
-                for i_r in range(nr):
-                    position = (i_r, i_t, i_z)
-                    
-                    elements[i_r, i_t, i_z] = Element(
-                        position=position,
-                        motor=motor,
-                        geometry=motor.geometry,
-                        mesh=motor.mesh,
-                        magnetic_potential=motor.magnetic_potential,
-                        winding_current=motor.winding_current,
-                        elements=elements
-                    )
-                    pbar.update(1)
+    elements = np.empty(nr * nt * nz, dtype=object)
+    # gán từng phần tử (gán cả list sẽ khiến numpy dò __array__ trên từng Element)
+    for index in range(nr * nt * nz):
+        elements[index] = Element.from_index(reluctance_network, index)
 
-    return elements
\ No newline at end of file
+    return np.reshape(elements, (nr, nt, nz), order='F')
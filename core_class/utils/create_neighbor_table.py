@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    neighbor_table: np.ndarray      # (6, N) int32
+
+def create_neighbor_table(shape, periodic_boundary=True):
+    """
+    Bảng chỉ số phẳng (thứ tự Fortran, i + j*nr + k*nr*nt) của 6 lân cận của mọi ô.
+    Hàng m*3 + n ứng với nhánh (m, n) của element:
+        m = 0: lân cận phía dưới (r_in, t_left, z_bot), m = 1: phía trên (r_out, t_right, z_top)
+    -1 nếu không có lân cận (biên r, z, hoặc biên theta khi không tuần hoàn).
+    """
+    nr, nt, nz = (int(n) for n in shape)
+    size = (nr, nt, nz)
+    number_of_cell = nr * nt * nz
+
+    index = np.unravel_index(np.arange(number_of_cell), size, order='F')
+    neighbor_table = np.full((6, number_of_cell), -1, dtype=np.int32)
+
+    for m, step in ((0, -1), (1, 1)):
+        for n in range(3):
+            neighbor = [index[0], index[1], index[2]]
+            neighbor[n] = index[n] + step
+            if n == 1 and periodic_boundary:
+                neighbor[n] = neighbor[n] % nt
+                valid = np.ones(number_of_cell, dtype=bool)
+            else:
+                valid = (neighbor[n] >= 0) & (neighbor[n] < size[n])
+            flat = neighbor[0] + neighbor[1] * nr + neighbor[2] * nr * nt
+            neighbor_table[m * 3 + n, valid] = flat[valid]
+
+    return Output(neighbor_table=neighbor_table)
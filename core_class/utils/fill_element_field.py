@@ -0,0 +1,44 @@
+from core_class.utils.find_element_segment_dimension_ratio import find_element_segment_dimension_ratio
+from core_class.utils.find_magnet_source import find_magnet_source
+from core_class.utils.find_winding_source import find_winding_source
+from core_class.utils.find_minimum_reluctance import find_minimum_reluctance
+from core_class.utils.set_minimum_reluctance import find_maximum_permeability
+
+def fill_element_field(element_field, segment_attribute, winding_current):
+    """
+    Gán thuộc tính segment cho các ô và tính các nguồn từ + từ trở nhỏ nhất (vector hóa).
+
+    Cần có sẵn: material_id, segment_index, material_fraction, kích thước element
+    (dimension[..., 0, :]) và vacuum_reluctance. Mọi phép tính đều độc lập theo từng ô
+    nên hàm dùng được cho cả lưới lẫn một tập ô bất kỳ (update_segments).
+    """
+    # thuộc tính của segment chiếm ưu thế (air giữ giá trị mặc định)
+    solid = element_field.segment_index >= 0
+    segment_index = element_field.segment_index[solid]
+
+    element_field.dimension[..., 1, :] = element_field.dimension[..., 0, :]
+    element_field.dimension[solid, 1, :] = segment_attribute.dimension[segment_index]
+
+    element_field.segment_magnet_source[solid] = segment_attribute.magnet_source[segment_index]
+    element_field.magnetization_direction[solid] = segment_attribute.magnetization_direction[segment_index]
+    element_field.segment_winding_vector[solid] = segment_attribute.winding_vector[segment_index]
+    element_field.winding_normal[solid] = segment_attribute.winding_normal[segment_index]
+
+    # dimension ratio
+    element_field.dimension_ratio = find_element_segment_dimension_ratio(element_field=element_field).dimension_ratio
+
+    # magnet properties
+    element_field.magnet_source = find_magnet_source(element_field=element_field).magnet_source
+
+    # winding properties
+    element_field.element_winding_vector = None
+    winding = find_winding_source(element_field=element_field,
+                                  winding_current=winding_current)
+    element_field.element_winding_vector = winding.element_winding_vector
+    element_field.winding_source = winding.winding_source
+
+    # define minimum reluctance
+    element_field.minimum_reluctance = find_minimum_reluctance(element_field = element_field).reluctance
+
+    # initialization for the first time (từ trở nhỏ nhất; nguồn tổng và từ trở nhánh nằm trong FaceField)
+    element_field.relative_permeability = find_maximum_permeability(element_field=element_field)
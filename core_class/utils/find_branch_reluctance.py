@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    reluctance: np.ndarray          # (E,) từ trở nối tiếp của nhánh
+    magnetic_source: np.ndarray     # (E,) sức từ động của nhánh
+
+def find_branch_reluctance(element_field, branch_incidence, branches=None):
+    """
+    Từ trở và sức từ động của các nhánh (create_branch_incidence): tổng nửa [1, n] của ô dưới
+    và nửa [0, n] của ô trên. branches: chỉ tính cho các nhánh này (mặc định: mọi nhánh).
+
+    Nửa nhánh không được lưu trong ElementField: từ trở vacuum_reluctance / relative_permeability và
+    sức từ động magnet_source + winding_source được lấy trực tiếp tại hai đầu của mỗi nhánh.
+    """
+    low, high, direction = branch_incidence.low, branch_incidence.high, branch_incidence.direction
+    if branches is not None:
+        low, high, direction = low[branches], high[branches], direction[branches]
+
+    vacuum_reluctance = element_field.flat(element_field.vacuum_reluctance)
+    permeability = element_field.flat(element_field.relative_permeability)
+    magnet_source = element_field.flat(element_field.magnet_source)
+    winding_source = element_field.flat(element_field.winding_source)
+
+    reluctance = vacuum_reluctance[low, 1, direction] / permeability[low, 1, direction] + \
+                 vacuum_reluctance[high, 0, direction] / permeability[high, 0, direction]
+    magnetic_source = magnet_source[low, 1, direction] + winding_source[low, 1, direction] + \
+                      (magnet_source[high, 0, direction] + winding_source[high, 0, direction])
+    return Output(reluctance=reluctance, magnetic_source=magnetic_source)
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.models.ElementField import MATERIAL_ID
+
+@dataclass
+class Output:
+    cell: np.ndarray        # ô, nửa, hướng của các nửa nhánh có mu thay đổi quá tolerance
+    half: np.ndarray
+    direction: np.ndarray
+    branches: np.ndarray    # các mặt (FaceField) chứa các nửa nhánh đó
+
+def find_changed_branches(element_field, face_field, relative_permeability, tolerance=1e-6):
+    """
+    Các nửa nhánh có mu_r mới (relative_permeability) khác giá trị đang lưu trong ElementField quá
+    sai số tương đối tolerance, và các mặt chứa chúng.
+
+    Chỉ so sánh các ô có sắt: mu_r của không khí và nam châm không phụ thuộc B, nên không cần
+    so sánh toàn bộ mảng nửa nhánh.
+    """
+    iron = np.flatnonzero(element_field.flat(element_field.material_fraction)[:, MATERIAL_ID["iron"]] > 0)
+    current = element_field.flat(element_field.relative_permeability)[iron]
+    updated = element_field.flat(relative_permeability)[iron]
+
+    changed = np.abs(updated - current) > tolerance * np.abs(current)
+    index, half, direction = np.nonzero(changed)
+    cell = iron[index]
+
+    branches = face_field.half_branch(cell=cell, half=half, direction=direction)
+    branches = np.unique(branches[branches >= 0])
+    return Output(cell=cell, half=half, direction=direction, branches=branches)
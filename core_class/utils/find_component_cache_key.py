@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+import numpy as np
+from storage.core import voxel_cache
+
+# bước lượng tử hóa tọa độ (m) khi băm: dịch chuyển theo z sinh sai số làm tròn nhỏ hơn nhiều
+QUANTUM = 1e-9
+
+@dataclass
+class Output:
+    key: str
+
+def find_component_cache_key(segments, mesh, z_origin, n_sample=(3, 3, 3)):
+    """
+    Khóa cache của bản đồ vật liệu một bộ phận (rotor, stator...): hash nội dung các segment
+    (vật liệu, đỉnh, mặt) và các node lưới mà bộ phận chiếm (mesh là lưới con theo z).
+
+    Tọa độ z được lấy tương đối so với z_origin (node z đầu tiên của lưới con) nên bộ phận chỉ
+    bị tịnh tiến theo z (ví dụ stator khi đổi magnet_length / airgap) vẫn dùng lại được cache.
+    Khóa chỉ phụ thuộc hình học thực tế, không phụ thuộc tên tham số động cơ.
+    """
+    shift = np.array([0.0, 0.0, float(z_origin)])
+    content = []
+    for seg in segments:
+        vertices = np.asarray(seg.mesh.vertices, dtype=float) - shift
+        content.append([str(seg.material),
+                        np.round(vertices / QUANTUM),
+                        np.asarray(seg.mesh.faces)])
+
+    key = voxel_cache.make_key(kind="component",
+                               segments=content,
+                               r_nodes=np.round(np.asarray(mesh.r_nodes, dtype=float) / QUANTUM),
+                               theta_nodes=np.asarray(mesh.theta_nodes, dtype=float),
+                               z_nodes=np.round((np.asarray(mesh.z_nodes, dtype=float) - z_origin) / QUANTUM),
+                               periodic_boundary=bool(mesh.periodic_boundary),
+                               n_sample=tuple(int(n) for n in n_sample))
+    return Output(key=key)
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    differential_reluctance: np.ndarray
+
+def find_differential_reluctance(element_field, relative_permeability_derivative):
+    """
+    Từ trở vi phân dV/dPhi của mọi nửa nhánh, với V = R(B) Phi và B = Phi / S:
+        R_d = R (1 - |B| mu_r' / mu_r)
+    (> 0 vì H = B / (mu0 mu_r) tăng theo B; bằng R với không khí / nam châm).
+    Dùng reluctance, relative_permeability và flux_density_direct hiện tại của element_field.
+    """
+    B = np.abs(element_field.flux_density_direct)
+    ratio = B * relative_permeability_derivative / element_field.relative_permeability
+    return Output(differential_reluctance=np.asfortranarray(element_field.reluctance * (1.0 - ratio)))
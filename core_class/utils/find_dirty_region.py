@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.models.SegmentIndex import split_theta_range, TWO_PI
+
+@dataclass
+class Output:
+    boxes: list     # [(i0, i1, j0, j1, k0, k1)] các khối ô liên tục (chỉ số nửa mở)
+    n_cells: int
+
+def find_dirty_region(mesh, bounds, tolerance=1e-9):
+    """
+    Các khối ô (r, theta, z) chạm vào hộp bao trụ của các segment đã thay đổi.
+
+    bounds: (M, 6) [r_min, r_max, theta_start, theta_span, z_min, z_max] (biên cũ và mới,
+    hàng NaN bị bỏ qua). Vùng bẩn là tích của hợp các khoảng theo từng trục; theo theta,
+    các ô được tách thành các đoạn liên tục (khoảng vắt qua 2pi cho hai đoạn).
+    """
+    bounds = np.asarray(bounds, dtype=float).reshape(-1, 6)
+    bounds = bounds[~np.any(np.isnan(bounds), axis=1)]
+    r_nodes = np.asarray(mesh.r_nodes, dtype=float)
+    t_nodes = np.asarray(mesh.theta_nodes, dtype=float)
+    z_nodes = np.asarray(mesh.z_nodes, dtype=float)
+    if len(bounds) == 0:
+        return Output(boxes=[], n_cells=0)
+
+    r_mask = np.zeros(len(r_nodes) - 1, dtype=bool)
+    t_mask = np.zeros(len(t_nodes) - 1, dtype=bool)
+    z_mask = np.zeros(len(z_nodes) - 1, dtype=bool)
+
+    # ô theta đưa về [0, 2pi), so với cả bản dịch -2pi để bắt các ô vắt qua 2pi
+    t_lo = np.mod(t_nodes[:-1], TWO_PI)
+    t_hi = t_lo + np.diff(t_nodes)
+    for r_min, r_max, theta_start, theta_span, z_min, z_max in bounds:
+        pad = tolerance * max(r_max, z_max - z_min, 1.0)
+        r_mask |= (r_nodes[1:] >= r_min - pad) & (r_nodes[:-1] <= r_max + pad)
+        z_mask |= (z_nodes[1:] >= z_min - pad) & (z_nodes[:-1] <= z_max + pad)
+        for p_lo, p_hi in split_theta_range(theta_start - tolerance, theta_span + 2 * tolerance):
+            for shift in (0.0, TWO_PI):
+                t_mask |= (t_hi - shift >= p_lo) & (t_lo - shift <= p_hi)
+
+    if not (np.any(r_mask) and np.any(t_mask) and np.any(z_mask)):
+        return Output(boxes=[], n_cells=0)
+
+    # r, z: bao liên tục; theta: các đoạn liên tục
+    i0, i1 = np.flatnonzero(r_mask)[[0, -1]] + [0, 1]
+    k0, k1 = np.flatnonzero(z_mask)[[0, -1]] + [0, 1]
+    edge = np.diff(np.concatenate(([0], t_mask.astype(np.int8), [0])))
+    runs = zip(np.flatnonzero(edge == 1), np.flatnonzero(edge == -1))
+
+    boxes = [(int(i0), int(i1), int(j0), int(j1), int(k0), int(k1)) for j0, j1 in runs]
+    n_cells = sum((b[1] - b[0]) * (b[3] - b[2]) * (b[5] - b[4]) for b in boxes)
+    return Output(boxes=boxes, n_cells=n_cells)
@@ -7,39 +7,57 @@ class Output:
     length :Any
     section_area : Any 
 
-def find_element_dimension(coordinate):
-    # extract dimension: 
-    r_in = coordinate[0,0]
-    r_out = coordinate[1,0]
-    theta_right = coordinate[0,1]
-    theta_left  = coordinate[1,1]
-    z_bottom = coordinate[0,2]
-    z_top = coordinate[1,2]
+def find_element_dimension(coordinate=None, r_nodes=None, theta_nodes=None, z_nodes=None):
+    """
+    coordinate: (2,3) của một phần tử hoặc (..., 2, 3) cho toàn bộ lưới.
+    Hoặc r_nodes, theta_nodes, z_nodes: tính cho cả lưới (nr, nt, nz, 2, 3) bằng broadcasting
+    trên các trục (cùng công thức, không cần mảng tọa độ từng phần tử).
+    """
+    if coordinate is not None:
+        # extract dimension: 
+        r_in = coordinate[..., 0, 0]
+        r_out = coordinate[..., 1, 0]
+        theta_right = coordinate[..., 0, 1]
+        theta_left  = coordinate[..., 1, 1]
+        z_bottom = coordinate[..., 0, 2]
+        z_top = coordinate[..., 1, 2]
+        shape = np.shape(coordinate)
+    else:
+        r_nodes = np.asarray(r_nodes, dtype=float)
+        theta_nodes = np.asarray(theta_nodes, dtype=float)
+        z_nodes = np.asarray(z_nodes, dtype=float)
+        r_in = r_nodes[:-1, None, None]
+        r_out = r_nodes[1:, None, None]
+        theta_right = theta_nodes[None, :-1, None]
+        theta_left = theta_nodes[None, 1:, None]
+        z_bottom = z_nodes[None, None, :-1]
+        z_top = z_nodes[None, None, 1:]
+        shape = (len(r_nodes) - 1, len(theta_nodes) - 1, len(z_nodes) - 1, 2, 3)
 
     # create empty array 
-    length = np.zeros((2,3)) # [lrin,ltleft,lzbot;lrout,ltright,lztop]
-    section_area = np.zeros((2,3)) # [Srin,Stleft,Szbot;Srout,Stright,Sztop]
+    length = np.zeros(shape, order='F') # [lrin,ltleft,lzbot;lrout,ltright,lztop]
+    section_area = np.zeros(shape, order='F') # [Srin,Stleft,Szbot;Srout,Stright,Sztop]
 
     # find dimension
     open_angle = np.abs((theta_right - theta_left))
     half_open = open_angle / 2
-    length[0,0] = (1/2) * ( 1+ np.cos(half_open) ) * np.abs((r_in - (1/2 * (r_out + r_in))))
-    length[1,0] = (1/2) * ( 1+ np.cos(half_open) ) * np.abs((r_out - (1/2 * (r_out + r_in))))
+    length[..., 0, 0] = (1/2) * ( 1+ np.cos(half_open) ) * np.abs((r_in - (1/2 * (r_out + r_in))))
+    length[..., 1, 0] = (1/2) * ( 1+ np.cos(half_open) ) * np.abs((r_out - (1/2 * (r_out + r_in))))
 
-    length[0,1] = (1/2) * (np.sin(half_open)) * (r_in + r_out)
-    length[1,1] = length[0,1]
+    length[..., 0, 1] = (1/2) * (np.sin(half_open)) * (r_in + r_out)
+    length[..., 1, 1] = length[..., 0, 1]
 
-    length[0,2] = np.abs((z_bottom - z_top)/2)
-    length[1,2] = length[0,2]
+    length[..., 0, 2] = np.abs((z_bottom - z_top)/2)
+    length[..., 1, 2] = length[..., 0, 2]
 
-    section_area[0,0] = (length[0,2] + length[1,2]) * np.sin(half_open) * (3/2 * r_in + 1/2 * r_out)
-    section_area[1,0] = (length[0,2] + length[1,2]) * np.sin(half_open) * (1/2 * r_in + 3/2 * r_out)
+    section_area[..., 0, 0] = (length[..., 0, 2] + length[..., 1, 2]) * np.sin(half_open) * (3/2 * r_in + 1/2 * r_out)
+    section_area[..., 1, 0] = (length[..., 0, 2] + length[..., 1, 2]) * np.sin(half_open) * (1/2 * r_in + 3/2 * r_out)
 
-    section_area[0,1] = (length[0,2] + length[1,2]) * (1/2) * (r_out + r_in) * (1 + np.cos(half_open))
-    section_area[1,1] = section_area[0,1] 
+    section_area[..., 0, 1] = (length[..., 0, 2] + length[..., 1, 2]) * (1/2) * (r_out + r_in) * (1 + np.cos(half_open))
+    section_area[..., 1, 1] = section_area[..., 0, 1] 
 
-    section_area[0,2] = (r_out * np.cos(half_open) * r_out * np.sin(half_open)) - (r_in * np.cos(half_open) * r_in * np.sin(half_open)) 
-    section_area[1,2] = section_area[0,2]
+    section_area[..., 0, 2] = (r_out * np.cos(half_open) * r_out * np.sin(half_open)) - (r_in * np.cos(half_open) * r_in * np.sin(half_open)) 
+    section_area[..., 1, 2] = section_area[..., 0, 2]
 
     return Output(length= length,
-                  section_area= section_area)
\ No newline at end of file
+                  section_area= section_area)
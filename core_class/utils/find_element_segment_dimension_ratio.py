@@ -5,13 +5,18 @@ import numpy as np
 class Output:
     dimension_ratio : np.ndarray
 
-def find_element_segment_dimension_ratio(element):
-    dimension_ratio = np.zeros(3)
-    dimension = element.dimension
-    for i in range(3):
-        if dimension[1,i] == 0:
-            dimension_ratio[i] = 1
-        else:
-            dimension_ratio[i] = dimension[0,i] / dimension[1,i]
+def find_element_segment_dimension_ratio(element_field):
+    """
+    Tỉ lệ kích thước element (hàng 0) / segment (hàng 1) theo [r, theta, z].
+    Segment có kích thước 0 -> tỉ lệ 1.
+    """
+    dimension = element_field.dimension
+    element_dimension = dimension[..., 0, :]
+    segment_dimension = dimension[..., 1, :]
+
+    dimension_ratio = np.ones(np.shape(element_dimension), order='F')
+    np.divide(element_dimension, segment_dimension,
+              out=dimension_ratio,
+              where=segment_dimension != 0)
     
-    return Output(dimension_ratio= dimension_ratio)
\ No newline at end of file
+    return Output(dimension_ratio= dimension_ratio)
@@ -7,19 +7,19 @@ class Output:
     flux_density_direct: np.ndarray
     flux_density_average: np.ndarray
 
-def find_flux_density(element):
-    flux_direct = element.flux_direct
-    section_area = element.section_area
+def find_flux_density(element_field):
+    flux_direct = element_field.flux_direct
+    section_area = element_field.section_area
 
     flux_density_direct = flux_direct / section_area
 
-    flux_sum = np.sum(flux_direct, axis=0)
-    area_sum = np.sum(section_area, axis=0)
+    flux_sum = np.sum(flux_direct, axis=-2)
+    area_sum = np.sum(section_area, axis=-2)
     
     b_components = flux_sum / area_sum
-    b_mag = np.sqrt(np.sum(b_components**2))
+    b_mag = np.sqrt(np.sum(b_components**2, axis=-1))
 
-    flux_density_average = np.append(b_components, b_mag)
+    flux_density_average = np.concatenate((b_components, b_mag[..., None]), axis=-1)
 
     return Output(flux_density_direct=flux_density_direct,
-                  flux_density_average=flux_density_average)
\ No newline at end of file
+                  flux_density_average=flux_density_average)
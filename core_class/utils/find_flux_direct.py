@@ -1,39 +1,52 @@
 from dataclasses import dataclass
 from typing import Any
 import numpy as np
+from core_class.utils.create_neighbor_table import create_neighbor_table
+from core_class.utils.create_branch_incidence import create_branch_incidence
+from core_class.utils.find_branch_reluctance import find_branch_reluctance
 
 @dataclass
 class Output:
     flux_direct : Any
 
-def find_flux_direct(element):
+def find_flux_direct(element_field,
+                     magnetic_potential,
+                     periodic_boundary = True,
+                     neighbor_table = None,
+                     branch_incidence = None,
+                     face_field = None,
+                     face_flux = None):
     """
+    Từ thông qua 6 nhánh của mọi phần tử:
     [     r_in    t_left     z_bot
           r_out   t_right    z_top    ]
+    Nhánh không có phần tử lân cận (biên r, z hoặc theta không tuần hoàn) có từ thông 0.
+
+    Từ thông mỗi mặt chung được tính một lần từ ma trận liên thuộc, Phi = (A^T U + F) / R,
+    rồi gán cho cả hai ô (nửa [1, n] của ô dưới và nửa [0, n] của ô trên).
+    branch_incidence: ma trận liên thuộc của mạng, tạo từ neighbor_table nếu không truyền vào.
+    face_field: từ trở / sức từ động của các mặt (FaceField), tính từ element_field nếu không truyền vào.
+    face_flux: từ thông (E,) của các nhánh đã biết (bộ giải Newton), chỉ gán cho hai nửa nhánh.
     """
-    magnetic_potential = element.magnetic_potential
-    flux_direct = np.zeros((2,3))
-    neighbor_elements = element.neighbor_elements()
-    neighbor_elements_position = element.neighbor_elements_position
-    
+    if branch_incidence is None:
+        if neighbor_table is None:
+            neighbor_table = create_neighbor_table(shape=element_field.shape,
+                                                   periodic_boundary=periodic_boundary).neighbor_table
+        branch_incidence = create_branch_incidence(neighbor_table=neighbor_table)
 
-    for i in [0,1,2]:
-        if neighbor_elements[0,i] is not None:
-            flux_direct[0,i] = find_flux(begin_potential=magnetic_potential.retrieve(position = neighbor_elements_position[0,i]).value,
-                                        end_potential= magnetic_potential.retrieve(position = element.position ).value,
-                                        r1 = neighbor_elements[0,i].reluctance[1,i],
-                                        r2 = element.reluctance[0,i],
-                                        f1 = neighbor_elements[0,i].magnetic_source[1,i],
-                                        f2 = element.magnetic_source[0,i])
-    
-    for i in [0,1,2]:
-        if neighbor_elements[1,i] is not None:
-            flux_direct[1,i] = find_flux(end_potential=magnetic_potential.retrieve(position = neighbor_elements_position[1,i]).value,
-                                        begin_potential= magnetic_potential.retrieve(position = element.position ).value,
-                                        r1 = neighbor_elements[1,i].reluctance[0,i],
-                                        r2 = element.reluctance[1,i],
-                                        f1 = neighbor_elements[1,i].magnetic_source[0,i],
-                                        f2 = element.magnetic_source[1,i])
+    if face_flux is not None:
+        flux = face_flux
+    else:
+        potential = np.ravel(magnetic_potential.data, order='F')
+        if face_field is None:
+            face_field = find_branch_reluctance(element_field=element_field, branch_incidence=branch_incidence)
+        flux = (branch_incidence.incidence.T @ potential + face_field.magnetic_source) / face_field.reluctance
+
+    flux_direct = np.zeros(np.shape(element_field.vacuum_reluctance), order='F')
+    flux_flat = element_field.flat(flux_direct)         # view (N, 2, 3) lên flux_direct
+    direction = branch_incidence.direction
+    flux_flat[branch_incidence.low, 1, direction] = flux
+    flux_flat[branch_incidence.high, 0, direction] = flux
 
     return Output(flux_direct= flux_direct)
 
@@ -47,4 +60,4 @@ def find_flux(begin_potential,
     flux = 0.0
     flux = ((begin_potential - end_potential ) + (f1 + f2)) / (r1+r2)
     
-    return flux
\ No newline at end of file
+    return flux
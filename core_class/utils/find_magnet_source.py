@@ -7,7 +7,7 @@ class Output:
     magnet_source : Any
 
 
-def find_magnet_source(element):
+def find_magnet_source(element_field):
     """
         Đối với các mảng (2x3) chứa nhiều thông tin, vị trí tương ứng:
         [     r_in    t_left     z_bot
@@ -15,27 +15,25 @@ def find_magnet_source(element):
     """
     
     # Độ lớn vector từ hóa của segment:
-    absFseg = element.segment_magnet_source
+    absFseg = element_field.segment_magnet_source
 
     # Vector chỉ phương (độ lớn vector chỉ phương := 1)
-    u = element.magnetization_direction
+    u = element_field.magnetization_direction
 
     # Vector từ hóa của segment (xử lý trong hệ tọa độ trụ):
-    Fseg = np.zeros(3)
-    Fseg[2] = absFseg * u[2]
-    Fseg[1] = absFseg * u[0] * np.sin(u[1])
-    Fseg[0] = absFseg * u[0] * np.cos(u[1])
-
-    
+    Fseg = np.zeros(np.shape(u), order='F')
+    Fseg[..., 2] = absFseg * u[..., 2]
+    Fseg[..., 1] = absFseg * u[..., 0] * np.sin(u[..., 1])
+    Fseg[..., 0] = absFseg * u[..., 0] * np.cos(u[..., 1])
 
     # Tỉ lệ kích thước của element (con) và segment (mẹ)
-    dimension_ratio = element.dimension_ratio
+    dimension_ratio = element_field.dimension_ratio
 
     # Vector từ hóa Element:
     Fele = Fseg * dimension_ratio
 
     # Vector từ hóa của từng nhánh
     F_direc = Fele/2
-    F_direct = np.vstack((F_direc,F_direc))
+    F_direct = np.asfortranarray(np.stack((F_direc, F_direc), axis=-2))
 
-    return Output(magnet_source = F_direct)
\ No newline at end of file
+    return Output(magnet_source = F_direct)
@@ -1,22 +1,39 @@
 from dataclasses import dataclass
 from typing import Any
-from material.utils.find_maximum_permeance import find_maximum_permeance
+import numpy as np
+from core_class.models.ElementField import MATERIAL_ID
+from core_class.utils.find_mixed_permeability import find_mixed_permeability
 
 @dataclass
 class Output:
     reluctance: Any
 
-def find_minimum_reluctance(element):
-    reluctance = element.vacuum_reluctance
+def find_minimum_reluctance(element_field):
+    reluctance = np.array(element_field.vacuum_reluctance, order='F')
+    # hằng số vật liệu dùng chung (tính một lần cho mỗi mác vật liệu)
+    derived_property = element_field.material_database.derived_property
+
+    # ô nhiều vật liệu: trộn độ từ thẩm lớn nhất của từng vật liệu theo tỉ lệ thể tích
+    if element_field.mixing_rule != "dominant":
+        permeability = [None] * 3
+        permeability[MATERIAL_ID["air"]] = derived_property.air_relative_permeance
+        permeability[MATERIAL_ID["magnet"]] = derived_property.magnet_relative_permeance
+        permeability[MATERIAL_ID["iron"]] = derived_property.mu_r_max
+        mixed = find_mixed_permeability(material_fraction=element_field.material_fraction,
+                                        permeability=permeability,
+                                        mixing_rule=element_field.mixing_rule).relative_permeability
+        return Output(reluctance=np.asfortranarray(reluctance / mixed))
+
+    material_id = element_field.material_id[..., None, None]
     
-    if element.material == "magnet":
-        material_database = element.material_database
-        maximum_permeance = material_database.magnet.relative_permeance
-        reluctance = reluctance * 1/maximum_permeance
+    magnet = np.broadcast_to(material_id == MATERIAL_ID["magnet"], reluctance.shape)
+    if np.any(magnet):
+        maximum_permeance = derived_property.magnet_relative_permeance
+        reluctance[magnet] = reluctance[magnet] * 1/maximum_permeance
 
-    elif element.material == "iron":
-        material_database = element.material_database
-        maximum_permeance = find_maximum_permeance(material_database=material_database).mu_r_max
-        reluctance = reluctance * 1/maximum_permeance
+    iron = np.broadcast_to(material_id == MATERIAL_ID["iron"], reluctance.shape)
+    if np.any(iron):
+        maximum_permeance = derived_property.mu_r_max
+        reluctance[iron] = reluctance[iron] * 1/maximum_permeance
 
     return Output(reluctance= reluctance)
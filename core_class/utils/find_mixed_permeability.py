@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    relative_permeability: np.ndarray
+
+def find_mixed_permeability(material_fraction, permeability, mixing_rule="arithmetic"):
+    """
+    Độ từ thẩm tương đương của ô chứa nhiều vật liệu.
+
+    material_fraction: (nr, nt, nz, 3) tỉ lệ thể tích theo MATERIAL_ID (được chuẩn hóa tổng = 1).
+    permeability: 3 giá trị (hoặc mảng broadcast được tới (nr, nt, nz, 2, 3)) theo MATERIAL_ID.
+    mixing_rule:
+        arithmetic: mu = sum(f * mu_m)      (các vật liệu song song với từ thông, cận trên)
+        harmonic:   mu = 1 / sum(f / mu_m)  (các vật liệu nối tiếp với từ thông, cận dưới)
+    Ô chỉ có một vật liệu cho đúng độ từ thẩm của vật liệu đó với cả hai quy tắc.
+    """
+    fraction = np.asarray(material_fraction, dtype=float)
+    total = np.sum(fraction, axis=-1, keepdims=True)
+    fraction = fraction / np.where(total > 0, total, 1.0)
+    fraction = fraction[..., None, None, :]          # (nr, nt, nz, 1, 1, 3)
+
+    shape = fraction.shape[:3] + (2, 3)
+    mixed = np.zeros(shape, order='F')
+    for m, mu in enumerate(permeability):
+        f = fraction[..., m]
+        if mixing_rule == "arithmetic":
+            mixed += f * mu
+        elif mixing_rule == "harmonic":
+            mixed += f / mu
+        else:
+            raise ValueError(f"mixing_rule không hợp lệ: '{mixing_rule}'")
+
+    if mixing_rule == "harmonic":
+        mixed = 1.0 / mixed
+
+    return Output(relative_permeability=np.asfortranarray(mixed))
@@ -1,12 +1,11 @@
 from dataclasses import dataclass
-from turtle import position
 import numpy as np
 
 
 @dataclass
 class Output:
-    own_magnetic_potential: float
+    own_magnetic_potential: np.ndarray
 
-def find_own_magnetic_potential(element):
-    own_magnetic_potential = element.magnetic_potential.retrieve(position = element.position).value
+def find_own_magnetic_potential(magnetic_potential):
+    own_magnetic_potential = np.array(magnetic_potential.data, dtype=float, order='F')
     return Output(own_magnetic_potential= own_magnetic_potential)
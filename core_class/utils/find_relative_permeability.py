@@ -3,23 +3,70 @@ from typing import Any
 import numpy as np
 
 from material.core.lookup_BH_curve import lookup_BH_curve
+from core_class.models.ElementField import MATERIAL_ID
+from core_class.utils.find_mixed_permeability import find_mixed_permeability
+
 @dataclass
 class Output:
     relative_permeability : np.ndarray
+    relative_permeability_derivative : Any = None     # d mu_r / d|B| (khi return_derivative)
+
+def find_relative_permeability(element_field, return_derivative=False):
+    """
+    mu_r của mọi nửa nhánh theo B của nửa nhánh (flux_density_direct).
+    return_derivative: trả thêm d mu_r / d|B| (dmu_r_dB của lookup_BH_curve cho phần sắt,
+    0 cho không khí / nam châm, theo quy tắc trộn với ô nhiều vật liệu), dùng cho bộ giải Newton.
+    """
+    flux_density_direct = element_field.flux_density_direct
+    relative_permeability = np.ones(np.shape(flux_density_direct), order='F')
+    derivative = np.zeros(np.shape(flux_density_direct), order='F') if return_derivative else None
+    material_database = element_field.material_database
+
+    # ô nhiều vật liệu: phần sắt tra đường cong B-H theo B của ô, sau đó trộn theo tỉ lệ thể tích
+    if element_field.mixing_rule != "dominant":
+        iron_fraction = element_field.material_fraction[..., MATERIAL_ID["iron"]][..., None, None]
+        iron = np.broadcast_to(iron_fraction > 0, relative_permeability.shape)
+        if np.any(iron):
+            lookup = lookup_BH_curve(B_input= flux_density_direct[iron],
+                                     material_database= material_database,
+                                     return_du_dB= return_derivative)
+            relative_permeability[iron] = lookup.mu_r
+            if return_derivative:
+                derivative[iron] = lookup.dmu_r_dB
+
+        permeability = [None] * 3
+        permeability[MATERIAL_ID["air"]] = material_database.air.relative_permeance
+        permeability[MATERIAL_ID["magnet"]] = material_database.magnet.relative_permeance
+        permeability[MATERIAL_ID["iron"]] = relative_permeability
+        mixed = find_mixed_permeability(material_fraction=element_field.material_fraction,
+                                        permeability=permeability,
+                                        mixing_rule=element_field.mixing_rule).relative_permeability
+        if return_derivative:
+            # đạo hàm theo mu của phần sắt: arithmetic f, harmonic f * (mu / mu_sắt)^2
+            fraction = element_field.material_fraction
+            total = np.sum(fraction, axis=-1)
+            iron_fraction = (fraction[..., MATERIAL_ID["iron"]] / np.where(total > 0, total, 1.0))[..., None, None]
+            if element_field.mixing_rule == "arithmetic":
+                derivative = iron_fraction * derivative
+            else:
+                derivative = iron_fraction * (mixed / relative_permeability) ** 2 * derivative
+            derivative = np.asfortranarray(derivative)
+        return Output(relative_permeability=mixed,
+                      relative_permeability_derivative=derivative)
+
+    material_id = element_field.material_id[..., None, None]
+
+    iron = np.broadcast_to(material_id == MATERIAL_ID["iron"], relative_permeability.shape)
+    if np.any(iron):
+        lookup = lookup_BH_curve(B_input= flux_density_direct[iron],
+                                 material_database= material_database,
+                                 return_du_dB= return_derivative)
+        relative_permeability[iron] = lookup.mu_r
+        if return_derivative:
+            derivative[iron] = lookup.dmu_r_dB
+
+    magnet = np.broadcast_to(material_id == MATERIAL_ID["magnet"], relative_permeability.shape)
+    relative_permeability[magnet] = material_database.magnet.relative_permeance
 
-def find_relative_permeability(element):
-    relative_permeability = np.ones((2,3))
-    material_database = element.material_database
-
-    if element.material == "iron":
-        for i in range(2):
-            for j in range(3):
-                relative_permeability[i,j] = lookup_BH_curve(B_input= element.flux_density_direct[i,j],
-                                                        material_database= material_database).mu_r
-                
-    else:
-        if element.material == "magnet":
-           relative_permeability = np.full((2, 3), material_database.magnet.relative_permeance)
-        elif element.material == "air":
-            relative_permeability = np.full((2, 3), 1)
-    return Output(relative_permeability=relative_permeability)
\ No newline at end of file
+    return Output(relative_permeability=relative_permeability,
+                  relative_permeability_derivative=derivative)
@@ -6,7 +6,7 @@ import numpy as np
 class Output:
     reluctance : np.ndarray
 
-def find_reluctance_updated(element):
-    reluctance = element.vacuum_reluctance / element.relative_permeability
+def find_reluctance_updated(element_field):
+    reluctance = element_field.vacuum_reluctance / element_field.relative_permeability
 
-    return Output(reluctance= reluctance)
\ No newline at end of file
+    return Output(reluctance= reluctance)
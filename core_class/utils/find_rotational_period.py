@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+import math
+import numpy as np
+from scipy.spatial import cKDTree
+
+@dataclass
+class Output:
+    pitch_cells: int            # số ô theta của một chu kỳ (0: không tìm được chu kỳ)
+    permutation: np.ndarray     # (S,) segment s -> segment trùng với s sau khi xoay +pitch
+
+def find_rotational_period(geometry, segment_candidate, theta_step, n_cells_t, tolerance=1e-6):
+    """
+    Tìm chu kỳ góc nhỏ nhất của nhóm segment segment_candidate (ví dụ các segment của một lớp z)
+    sao cho chu kỳ là bội nguyên của bước lưới theta_step.
+
+    - Segment tròn xoay (ống, trụ) bất biến với mọi phép xoay.
+    - Các segment còn lại phải khớp nhau qua phép xoay: mỗi segment sau khi xoay +pitch
+      trùng (theo đỉnh) với một segment cùng vật liệu trong nhóm.
+    Ứng viên chu kỳ là 2pi/d với d là ước của ƯCLN số segment mỗi vật liệu (răng: slot pitch,
+    nam châm: pole pitch - đổi dấu từ hóa được xử lý qua chỉ số segment).
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    spatial_index = geometry.spatial_index
+    permutation = np.arange(len(segments))
+    candidate = [int(index) for index in segment_candidate if segments[index].mesh is not None]
+
+    # --- 1. TÁCH SEGMENT TRÒN XOAY ---
+    rotating = [index for index in candidate
+                if not is_axisymmetric(segments[index].mesh, spatial_index.bounds[index])]
+    if len(rotating) == 0:
+        return Output(pitch_cells=1, permutation=permutation)
+
+    # --- 2. ỨNG VIÊN CHU KỲ ---
+    count = {}
+    for index in rotating:
+        count[segments[index].material] = count.get(segments[index].material, 0) + 1
+    n_copy = 0
+    for value in count.values():
+        n_copy = math.gcd(n_copy, value)
+
+    for d in sorted((d for d in range(1, n_copy + 1) if n_copy % d == 0), reverse=True):
+        pitch = 2 * np.pi / d
+        pitch_cells = pitch / theta_step
+        if abs(pitch_cells - round(pitch_cells)) > tolerance * max(1.0, pitch_cells):
+            continue
+        pitch_cells = int(round(pitch_cells))
+        if pitch_cells < 1 or pitch_cells >= n_cells_t:
+            continue
+
+        # --- 3. KIỂM TRA KHỚP ĐỈNH SAU KHI XOAY ---
+        mapped = find_rotation_permutation(segments, rotating, pitch, tolerance)
+        if mapped is not None:
+            for source, target in mapped.items():
+                permutation[source] = target
+            return Output(pitch_cells=pitch_cells, permutation=permutation)
+
+    return Output(pitch_cells=0, permutation=permutation)
+
+
+def is_axisymmetric(mesh, bounds, tolerance=1e-2):
+    """Segment phủ cả vòng và thể tích khớp với vành khuyên [r_min, r_max] x [z_min, z_max]."""
+    r_min, r_max, theta_start, theta_span, z_min, z_max = bounds
+    if theta_span < 2 * np.pi:
+        return False
+    annulus = np.pi * (r_max**2 - r_min**2) * (z_max - z_min)
+    volume = abs(float(mesh.volume))
+    return volume > 0 and abs(annulus - volume) <= tolerance * volume
+
+
+def find_rotation_permutation(segments, rotating, pitch, tolerance):
+    """{s: s'} với s' trùng s xoay +pitch, None nếu có segment không tìm được cặp."""
+    c, s = np.cos(pitch), np.sin(pitch)
+    rotation = np.array([[c, -s, 0.], [s, c, 0.], [0., 0., 1.]])
+
+    # lọc nhanh bằng trọng tâm các đỉnh (trọng tâm của s xoay = trọng tâm của s'), sau đó so từng đỉnh
+    centroid = np.array([np.mean(segments[index].mesh.vertices, axis=0) for index in rotating])
+    scale = max(float(np.max(np.abs(centroid))), 1e-12)
+    mapped = {}
+    for i, source in enumerate(rotating):
+        mesh = segments[source].mesh
+        distance = np.linalg.norm(centroid - rotation @ centroid[i], axis=1)
+        found = None
+        for j in np.flatnonzero(distance <= tolerance * scale):
+            target = rotating[j]
+            if (segments[target].material != segments[source].material or
+                    len(segments[target].mesh.vertices) != len(mesh.vertices)):
+                continue
+            rotated = np.asarray(mesh.vertices) @ rotation.T
+            vertex_distance, _ = cKDTree(np.asarray(segments[target].mesh.vertices)).query(rotated)
+            if np.max(vertex_distance) <= tolerance * scale:
+                found = target
+                break
+        if found is None:
+            return None
+        mapped[source] = found
+    return mapped
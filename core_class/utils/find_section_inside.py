@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+import numpy as np
+import shapely
+
+# bước góc lớn nhất khi xấp xỉ cung tròn của một khối ô bằng đa giác
+MAX_ARC_STEP = np.pi / 36
+# khối chưa xác định có không quá LEAF_CELLS ô thì kiểm tra thẳng từng điểm mẫu (rẻ hơn chia tiếp)
+LEAF_CELLS = 4
+# vùng ít ô hơn ngưỡng này thì lấy mẫu phẳng luôn (chi phí dựng đa giác không bù được)
+MIN_HIERARCHY_CELLS = 1024
+
+@dataclass
+class Output:
+    inside: np.ndarray      # (n_r, n_sr, n_t, n_st) bool, điểm mẫu nằm trong tiết diện
+    n_block: int            # số khối được kiểm tra bằng đa giác
+    n_leaf: int             # số ô phải kiểm tra từng điểm mẫu
+
+def find_section_inside(section, r_edge, t_edge, X, Y, n_sr, n_st):
+    """
+    Điểm mẫu nào nằm trong tiết diện 2D, phân loại từ thô tới mịn (quadtree trên chỉ số ô r, theta).
+
+    Mỗi khối ô được bao bởi một đa giác P chứa trọn hình quạt của khối (cung trong xấp xỉ
+    bằng dây cung, cung ngoài bằng đường gấp khúc ngoại tiếp). Nếu tiết diện chứa P thì mọi
+    điểm mẫu của khối nằm trong, nếu P rời tiết diện thì mọi điểm nằm ngoài; ngược lại khối
+    được chia đôi. Chỉ các khối nhỏ (<= LEAF_CELLS ô) còn lại mới kiểm tra từng điểm bằng shapely.contains_xy,
+    nên kết quả giống hệt lấy mẫu phẳng và chi phí tỉ lệ với chiều dài biên thay vì diện tích.
+
+    r_edge: (n_r, 2) [r_in, r_out] của từng ô; t_edge: (n_t, 2) [t_left, t_right] của từng ô
+    (các ô theta có thể không liên tục, ví dụ khi vắt qua 2pi).
+    X, Y: (n_r*n_sr, n_t*n_st) tọa độ điểm mẫu.
+    """
+    n_r, n_t = len(r_edge), len(t_edge)
+    inside = np.zeros((n_r, n_sr, n_t, n_st), dtype=bool)
+    if n_r == 0 or n_t == 0:
+        return Output(inside=inside, n_block=0, n_leaf=0)
+    if n_r * n_t < MIN_HIERARCHY_CELLS:
+        inside[:] = shapely.contains_xy(section, X, Y).reshape(n_r, n_sr, n_t, n_st)
+        return Output(inside=inside, n_block=0, n_leaf=n_r * n_t)
+
+    # --- 1. KHỐI GỐC: MỖI ĐOẠN THETA LIÊN TỤC ---
+    t_break = np.flatnonzero(~np.isclose(t_edge[1:, 0], t_edge[:-1, 1])) + 1
+    t_start = np.concatenate(([0], t_break))
+    t_stop = np.concatenate((t_break, [n_t]))
+    block = np.column_stack((np.zeros_like(t_start), np.full_like(t_start, n_r), t_start, t_stop))
+
+    shapely.prepare(section)
+    n_block = 0
+    leaf = []
+    while len(block) > 0:
+        n_block += len(block)
+        # --- 2. ĐA GIÁC BAO CỦA CÁC KHỐI ---
+        polygon = find_sector_polygon(r_in=r_edge[block[:, 0], 0],
+                                      r_out=r_edge[block[:, 1] - 1, 1],
+                                      t_left=t_edge[block[:, 2], 0],
+                                      t_right=t_edge[block[:, 3] - 1, 1])
+        within = shapely.contains(section, polygon)
+        for a0, a1, b0, b1 in block[within]:
+            inside[a0:a1, :, b0:b1, :] = True
+
+        # --- 3. CHIA ĐÔI KHỐI CHƯA XÁC ĐỊNH ---
+        block = block[~within]
+        block = block[shapely.intersects(section, polygon[~within])]
+        small = (block[:, 1] - block[:, 0]) * (block[:, 3] - block[:, 2]) <= LEAF_CELLS
+        leaf.append(find_block_cells(block[small]))
+        block = split_block(block[~small])
+
+    # --- 4. Ô LÁ: KIỂM TRA TỪNG ĐIỂM MẪU ---
+    a, b = np.concatenate(leaf, axis=1) if leaf else np.zeros((2, 0), dtype=int)
+    if len(a) > 0:
+        X4 = np.reshape(X, (n_r, n_sr, n_t, n_st))
+        Y4 = np.reshape(Y, (n_r, n_sr, n_t, n_st))
+        inside[a, :, b, :] = shapely.contains_xy(section, X4[a, :, b, :], Y4[a, :, b, :])
+
+    return Output(inside=inside, n_block=n_block, n_leaf=len(a))
+
+
+def split_block(block):
+    """Chia đôi mỗi khối [a0, a1, b0, b1) theo các chiều có nhiều hơn một ô."""
+    a0, a1, b0, b1 = block.T
+    a_mid = np.where(a1 - a0 > 1, (a0 + a1) // 2, a1)
+    b_mid = np.where(b1 - b0 > 1, (b0 + b1) // 2, b1)
+    children = np.concatenate((np.column_stack((a0, a_mid, b0, b_mid)),
+                               np.column_stack((a_mid, a1, b0, b_mid)),
+                               np.column_stack((a0, a_mid, b_mid, b1)),
+                               np.column_stack((a_mid, a1, b_mid, b1))))
+    return children[(children[:, 0] < children[:, 1]) & (children[:, 2] < children[:, 3])]
+
+
+def find_block_cells(block):
+    """Chỉ số (a, b) của mọi ô trong các khối nhỏ (<= LEAF_CELLS ô mỗi chiều), shape (2, n)."""
+    offset = np.arange(LEAF_CELLS)
+    a = block[:, 0, None, None] + offset[None, :, None] + 0 * offset[None, None, :]
+    b = block[:, 2, None, None] + 0 * offset[None, :, None] + offset[None, None, :]
+    valid = (a < block[:, 1, None, None]) & (b < block[:, 3, None, None])
+    return np.stack((a[valid], b[valid]))
+
+
+def find_sector_polygon(r_in, r_out, t_left, t_right):
+    """
+    Đa giác chứa trọn hình quạt [r_in, r_out] x [t_left, t_right] (vector hóa cho M khối).
+    Cung trong: dây cung (nằm phía trong cung). Cung ngoài: đường gấp khúc tiếp xúc
+    cung tại bán kính r_out / cos(step / 2).
+    """
+    span = t_right - t_left
+    n_arc = int(max(1, np.ceil(np.max(span) / MAX_ARC_STEP)))
+    ratio = np.linspace(0.0, 1.0, n_arc + 1)
+    angle = t_left[:, None] + span[:, None] * ratio[None, :]          # (M, n_arc+1)
+
+    step = span / n_arc
+    r_outer = r_out / np.cos(step / 2)
+
+    outer = np.stack((r_outer[:, None] * np.cos(angle), r_outer[:, None] * np.sin(angle)), axis=-1)
+    inner = np.stack((r_in[:, None] * np.cos(angle), r_in[:, None] * np.sin(angle)), axis=-1)[:, ::-1]
+    ring = np.concatenate((outer, inner, outer[:, :1]), axis=1)
+    return shapely.polygons(ring)
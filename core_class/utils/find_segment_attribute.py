@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    magnet_source: np.ndarray            # (S,)
+    magnetization_direction: np.ndarray  # (S, 3)
+    winding_vector: np.ndarray           # (S, number_of_phase)
+    winding_normal: np.ndarray           # (S, 3)
+    dimension: np.ndarray                # (S, 3) [r, theta, z]
+
+def find_segment_attribute(geometry, number_of_phase):
+    """
+    Gom thuộc tính của các segment thành mảng (S, ...) để gán cho các ô bằng chỉ số segment.
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    number_of_segment = len(segments)
+
+    magnet_source = np.zeros(number_of_segment)
+    magnetization_direction = np.tile([0., 0., 1.], (number_of_segment, 1))
+    winding_vector = np.zeros((number_of_segment, int(number_of_phase)))
+    winding_normal = np.tile([0., 0., 1.], (number_of_segment, 1))
+    dimension = np.zeros((number_of_segment, 3))
+
+    for index, seg in enumerate(segments):
+        if getattr(seg, "magnet_source", None) is not None:
+            magnet_source[index] = float(seg.magnet_source)
+        if getattr(seg, "magnetization_direction", None) is not None:
+            magnetization_direction[index] = seg.magnetization_direction
+        if getattr(seg, "winding_vector", None) is not None:
+            winding_vector[index] = seg.winding_vector
+        if getattr(seg, "winding_normal", None) is not None:
+            winding_normal[index] = seg.winding_normal
+        if getattr(seg, "dimension", None) is not None:
+            dimension[index] = seg.dimension
+
+    return Output(magnet_source=magnet_source,
+                  magnetization_direction=magnetization_direction,
+                  winding_vector=winding_vector,
+                  winding_normal=winding_normal,
+                  dimension=dimension)
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    r_min: float
+    r_max: float
+    theta_start: float    # trong [0, 2pi)
+    theta_span: float     # độ mở góc, 2pi nếu segment bao quanh trục
+    z_min: float
+    z_max: float
+
+def find_segment_cylindrical_bounds(mesh):
+    """
+    Tìm hộp bao (r, theta, z) của một mesh trong hệ trụ.
+
+    r_max: bán kính lớn nhất của các đỉnh (chính xác với khối đa diện).
+    r_min: 0 nếu trục z đi qua hình chiếu x-y của mesh, ngược lại là khoảng cách nhỏ nhất
+           từ gốc tới các cạnh chiếu.
+    theta: phần bù của khe góc lớn nhất giữa các đỉnh; nếu có cạnh nào vắt qua khe đó
+           (ví dụ ống, hình trụ) thì segment phủ cả vòng tròn.
+    """
+    vertices = np.asarray(mesh.vertices, dtype=float)
+    xy = vertices[:, :2]
+    z_min, z_max = float(np.min(vertices[:, 2])), float(np.max(vertices[:, 2]))
+    r_max = float(np.max(np.hypot(xy[:, 0], xy[:, 1])))
+
+    # --- 1. TRỤC Z CÓ ĐI QUA HÌNH CHIẾU KHÔNG ---
+    triangles = xy[np.asarray(mesh.faces)]
+    if np.any(contains_origin(triangles)):
+        return Output(r_min=0.0, r_max=r_max,
+                      theta_start=0.0, theta_span=2 * np.pi,
+                      z_min=z_min, z_max=z_max)
+
+    # --- 2. R_MIN: KHOẢNG CÁCH TỪ GỐC TỚI CÁC CẠNH CHIẾU ---
+    edges = xy[np.asarray(mesh.edges_unique)]
+    p, q = edges[:, 0], edges[:, 1]
+    d = q - p
+    length2 = np.sum(d * d, axis=1)
+    s = np.clip(-np.sum(p * d, axis=1) / np.where(length2 > 0, length2, 1.0), 0.0, 1.0)
+    closest = p + s[:, None] * d
+    r_min = float(np.min(np.hypot(closest[:, 0], closest[:, 1])))
+
+    # --- 3. THETA: PHẦN BÙ CỦA KHE GÓC LỚN NHẤT ---
+    angle = np.sort(np.mod(np.arctan2(xy[:, 1], xy[:, 0]), 2 * np.pi))
+    gap = np.diff(np.append(angle, angle[0] + 2 * np.pi))
+    i_gap = int(np.argmax(gap))
+    gap_middle = angle[i_gap] + gap[i_gap] / 2
+
+    # khe không chứa đỉnh nào, nên cạnh nào chạm khe thì cắt tia đi qua giữa khe
+    u = np.array([np.cos(gap_middle), np.sin(gap_middle)])
+    cross_p = u[0] * p[:, 1] - u[1] * p[:, 0]
+    cross_q = u[0] * q[:, 1] - u[1] * q[:, 0]
+    straddle = cross_p * cross_q <= 0
+    denominator = np.where(cross_p != cross_q, cross_p - cross_q, 1.0)
+    hit = p + (cross_p / denominator)[:, None] * d
+    if np.any(straddle & (hit @ u > 0)):
+        return Output(r_min=r_min, r_max=r_max,
+                      theta_start=0.0, theta_span=2 * np.pi,
+                      z_min=z_min, z_max=z_max)
+
+    theta_start = float(np.mod(angle[i_gap] + gap[i_gap], 2 * np.pi))
+    theta_span = float(2 * np.pi - gap[i_gap])
+
+    return Output(r_min=r_min, r_max=r_max,
+                  theta_start=theta_start, theta_span=theta_span,
+                  z_min=z_min, z_max=z_max)
+
+
+def contains_origin(triangles):
+    """Gốc tọa độ có nằm trong (hoặc trên biên) từng tam giác 2D (F, 3, 2) không."""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    d1 = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    d2 = b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0]
+    d3 = c[:, 0] * a[:, 1] - c[:, 1] * a[:, 0]
+    has_negative = (d1 < 0) | (d2 < 0) | (d3 < 0)
+    has_positive = (d1 > 0) | (d2 > 0) | (d3 > 0)
+    degenerate = (d1 == 0) & (d2 == 0) & (d3 == 0)
+    return ~(has_negative & has_positive) & ~degenerate
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+import numpy as np
+import trimesh
+
+@dataclass
+class Output:
+    dimension: np.ndarray       # (S, 3) [r, theta, z] của từng segment
+    n_fallback: int             # số segment quá mỏng (không chứa tâm ô nào), dùng hộp bao
+    n_out_of_bounds: int        # số segment nằm ngoài lưới
+
+def find_segment_dimension(geometry, mesh, center_segment):
+    """
+    Đo kích thước [r, theta, z] của các segment trong không gian lưới từ bản đồ
+    center_segment (segment chứa tâm ô) của voxelize_geometry, bằng phép min/max vector hóa:
+    kích thước theo mỗi trục là khoảng node bao các ô có tâm thuộc segment.
+
+    Segment không chứa tâm ô nào dùng hộp bao Descartes (theta: một bước lưới),
+    segment nằm ngoài lưới có kích thước 0 - giống find_geometry_dimension_in_mesh trước đây.
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    number_of_segment = len(segments)
+    r_nodes = np.asarray(mesh.r_nodes, dtype=float)
+    t_nodes = np.asarray(mesh.theta_nodes, dtype=float)
+    z_nodes = np.asarray(mesh.z_nodes, dtype=float)
+
+    # --- 1. MIN/MAX CHỈ SỐ Ô THEO SEGMENT ---
+    occupied = np.flatnonzero(np.ravel(center_segment, order='F') >= 0)
+    owner = np.ravel(center_segment, order='F')[occupied]
+    i_r, i_t, i_z = np.unravel_index(occupied, np.shape(center_segment), order='F')
+
+    index_min = np.full((number_of_segment, 3), np.iinfo(np.int64).max, dtype=np.int64)
+    index_max = np.full((number_of_segment, 3), -1, dtype=np.int64)
+    for axis, index in enumerate((i_r, i_t, i_z)):
+        np.minimum.at(index_min[:, axis], owner, index)
+        np.maximum.at(index_max[:, axis], owner, index)
+
+    found = index_max[:, 0] >= 0
+    dimension = np.zeros((number_of_segment, 3))
+    for axis, nodes in enumerate((r_nodes, t_nodes, z_nodes)):
+        dimension[found, axis] = nodes[index_max[found, axis] + 1] - nodes[index_min[found, axis]]
+
+    # --- 2. FALLBACK: SEGMENT QUÁ MỎNG HOẶC NGOÀI LƯỚI ---
+    n_fallback = 0
+    n_out_of_bounds = 0
+    for index, seg in enumerate(segments):
+        if found[index] or seg.mesh is None:
+            continue
+
+        bbox_min, bbox_max = seg.mesh.bounds
+        z_seg_min, z_seg_max = bbox_min[2], bbox_max[2]
+        corners = trimesh.bounds.corners(seg.mesh.bounds)
+        r_corners = np.hypot(corners[:, 0], corners[:, 1])
+        r_seg_min, r_seg_max = np.min(r_corners), np.max(r_corners)
+
+        if (r_seg_max < r_nodes[0] or r_seg_min > r_nodes[-1] or
+            z_seg_max < z_nodes[0] or z_seg_min > z_nodes[-1]):
+            n_out_of_bounds += 1
+            continue
+
+        n_fallback += 1
+        r_val = float(r_seg_max - r_seg_min)
+        theta_val = float(t_nodes[1] - t_nodes[0]) if len(t_nodes) > 1 else 0.0
+        z_val = float(z_seg_max - z_seg_min)
+        # hộp bao suy biến (điểm, đường thẳng): dùng kích thước ô lưới tại vị trí segment
+        if r_val < 1e-9 and len(r_nodes) > 1: r_val = float(local_cell_size(r_nodes, r_seg_min))
+        if z_val < 1e-9 and len(z_nodes) > 1: z_val = float(local_cell_size(z_nodes, z_seg_min))
+        dimension[index] = [r_val, theta_val, z_val]
+
+    return Output(dimension=dimension,
+                  n_fallback=n_fallback,
+                  n_out_of_bounds=n_out_of_bounds)
+
+
+def local_cell_size(nodes, value):
+    i = int(np.clip(np.searchsorted(nodes, value) - 1, 0, len(nodes) - 2))
+    return nodes[i + 1] - nodes[i]
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Any, List
+import numpy as np
+import shapely
+import trimesh
+
+@dataclass
+class Output:
+    heights: np.ndarray
+    sections: List[Any]
+
+def find_segment_section(mesh, heights):
+    """
+    Cắt mesh (kín nước) bằng các mặt phẳng z = heights.
+    Trả về tiết diện 2D (shapely Polygon/MultiPolygon trong hệ x-y) tại mỗi độ cao,
+    None nếu mặt phẳng không cắt qua mesh.
+
+    Các khối của create_geometry (đùn, loft, ống) có thành phẳng nên tiết diện là chính xác,
+    không phụ thuộc vào việc xấp xỉ voxel bằng hình hộp.
+    """
+    heights = np.atleast_1d(np.asarray(heights, dtype=float))
+    sections = [None] * len(heights)
+    if len(heights) == 0:
+        return Output(heights=heights, sections=sections)
+
+    # Làm tròn đầu mút để các đoạn cắt từ 2 mặt kề nhau trùng nhau tuyệt đối
+    grid_size = float(np.max(np.ptp(mesh.bounds, axis=0))) * 1e-9
+
+    lines, to_3D, _ = trimesh.intersections.mesh_multiplane(mesh,
+                                                            plane_origin=[0, 0, 0],
+                                                            plane_normal=[0, 0, 1],
+                                                            heights=heights)
+    for index, (line, transform) in enumerate(zip(lines, to_3D)):
+        if len(line) < 3:
+            continue
+        # về hệ x-y (to_3D chỉ là phép tịnh tiến theo z với pháp tuyến [0, 0, 1])
+        xy = line @ transform[:2, :2].T + transform[:2, 3]
+        linework = shapely.set_precision(shapely.multilinestrings(xy), grid_size)
+        area = shapely.build_area(shapely.line_merge(linework))
+        if area is None or area.is_empty:
+            continue
+        shapely.prepare(area)
+        sections[index] = area
+
+    return Output(heights=heights, sections=sections)
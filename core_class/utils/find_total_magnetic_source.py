@@ -6,7 +6,7 @@ from typing import Any
 class Output:
     total_magnetic_source : Any
 
-def find_total_magnetic_source(element):
-    total_magnetic_source = element.magnet_source + element.winding_source
+def find_total_magnetic_source(element_field):
+    total_magnetic_source = element_field.magnet_source + element_field.winding_source
 
-    return Output(total_magnetic_source= total_magnetic_source)
\ No newline at end of file
+    return Output(total_magnetic_source= total_magnetic_source)
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+import numpy as np
+from storage.core import voxel_cache
+
+# kiểu dữ liệu của tham số động cơ được đưa vào khóa (bỏ qua geometry, mesh, material_database...)
+PARAMETER_TYPES = (bool, int, float, str, np.integer, np.floating, np.ndarray, type(None))
+
+@dataclass
+class Output:
+    key: str
+
+def find_voxel_cache_key(motor, geometry, mesh, n_sample=(3, 3, 3)):
+    """
+    Khóa cache của bản đồ vật liệu: hash chuẩn hóa của tham số động cơ,
+    tham số dựng geometry (geometry.options), nội dung các segment (vật liệu, đỉnh, mặt)
+    và các mảng node của lưới. Segment bị sửa trực tiếp (Geometry.replace_segment, update_segments)
+    làm khóa đổi dù tham số động cơ không đổi.
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+
+    motor_parameter = {name: value for name, value in vars(motor).items()
+                       if isinstance(value, PARAMETER_TYPES)}
+
+    key = voxel_cache.make_key(motor_type=type(motor).__name__,
+                               motor=motor_parameter,
+                               geometry_options=getattr(geometry, 'options', {}),
+                               segments=[[str(seg.material)] if seg.mesh is None else
+                                         [str(seg.material),
+                                          np.asarray(seg.mesh.vertices, dtype=float),
+                                          np.asarray(seg.mesh.faces)] for seg in segments],
+                               r_nodes=np.asarray(mesh.r_nodes),
+                               theta_nodes=np.asarray(mesh.theta_nodes),
+                               z_nodes=np.asarray(mesh.z_nodes),
+                               periodic_boundary=bool(mesh.periodic_boundary),
+                               n_sample=tuple(int(n) for n in n_sample))
+    return Output(key=key)
@@ -7,29 +7,15 @@ class Output:
     neighbor_elements_position: np.ndarray
 
 def get_neighbor_elements_position(element):
-    nr, nt, nz = element.magnetic_potential.data.shape
-    i, j, k = element.position
-    periodic_boundary = getattr(element.mesh, 'periodic_boundary', False)
+    """Vị trí (i, j, k) của 6 lân cận, đọc từ neighbor_table của mạng (None nếu không có)."""
+    nr, nt, nz = element.reluctance_network.element_field.shape
+    neighbor = element.reluctance_network.neighbor_table[:, element.index]
 
     neighbor_positions = np.full((2, 3), None, dtype=object)
+    for m in range(2):
+        for n in range(3):
+            index = int(neighbor[m * 3 + n])
+            if index >= 0:
+                neighbor_positions[m, n] = (index % nr, (index // nr) % nt, index // (nr * nt))
 
-    if 0 <= i - 1 < nr:
-        neighbor_positions[0, 0] = (i - 1, j, k)
-    if 0 <= i + 1 < nr:
-        neighbor_positions[1, 0] = (i + 1, j, k)
-
-    if periodic_boundary:
-        neighbor_positions[0, 1] = (i, (j - 1) % nt, k)
-        neighbor_positions[1, 1] = (i, (j + 1) % nt, k)
-    else:
-        if 0 <= j - 1 < nt:
-            neighbor_positions[0, 1] = (i, j - 1, k)
-        if 0 <= j + 1 < nt:
-            neighbor_positions[1, 1] = (i, j + 1, k)
-
-    if 0 <= k - 1 < nz:
-        neighbor_positions[0, 2] = (i, j, k - 1)
-    if 0 <= k + 1 < nz:
-        neighbor_positions[1, 2] = (i, j, k + 1)
-
-    return Output(neighbor_elements_position=neighbor_positions)
\ No newline at end of file
+    return Output(neighbor_elements_position=neighbor_positions)
@@ -1,4 +1,12 @@
+import numpy as np
+from core_class.utils.update_face_field import update_face_field
+
 def set_minimum_reluctance(reluctance_network):
-    elements = reluctance_network.elements
-    for element in elements.flat:
-        element.set_reluctance_minimum()
\ No newline at end of file
+    # từ trở nhỏ nhất <=> độ từ thẩm lớn nhất của mỗi nửa nhánh
+    element_field = reluctance_network.element_field
+    element_field.relative_permeability = find_maximum_permeability(element_field=element_field)
+    update_face_field(reluctance_network=reluctance_network)
+
+
+def find_maximum_permeability(element_field):
+    return np.asfortranarray(element_field.vacuum_reluctance / element_field.minimum_reluctance)
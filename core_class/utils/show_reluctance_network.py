@@ -4,6 +4,7 @@ from pyvistaqt import BackgroundPlotter
 from PyQt5.QtWidgets import QDockWidget, QTextEdit, QVBoxLayout, QWidget
 from PyQt5.QtCore import Qt
 import ctypes
+from core_class.models.ElementField import MATERIAL_ID
 
 try:
     ctypes.windll.shcore.SetProcessDpiAwareness(1)
@@ -15,48 +16,26 @@ except Exception:
 
 def show_reluctance_network(reluctance_network):
     mesh_obj = reluctance_network.mesh
-    elements_matrix = reluctance_network.elements
+    element_field = reluctance_network.element_field
     
-    nr, nt, nz = elements_matrix.shape
+    nr, nt, nz = element_field.shape
     
     grid_pv = mesh_obj.to_pyvista_grid()
     
-    flat_elements = elements_matrix.flatten(order='F')
-    
     grid_pv.cell_data["OrigID"] = np.arange(grid_pv.n_cells)
     
-    mat_ids = np.zeros(len(flat_elements), dtype=int)
-    b_values = np.zeros(len(flat_elements), dtype=float)
-
-    for idx, el in enumerate(flat_elements):
-        if el is None: 
-            continue
-        
-        mat_name = str(el.material).lower()
-        if "iron" in mat_name or "steel" in mat_name:
-            mat_ids[idx] = 1
-        elif "magnet" in mat_name:
-            vec = getattr(el, 'magnetization_direction', None)
-            z_val = vec[-1] if (vec is not None and len(vec) > 0) else 0
-            if z_val > 0:
-                mat_ids[idx] = 2 
-            elif z_val < 0:
-                mat_ids[idx] = 4 
-            else:
-                mat_ids[idx] = 2
-        elif "coil" in mat_name or "winding" in mat_name:
-            mat_ids[idx] = 3
-        else:
-            mat_ids[idx] = 0
-
-        try:
-            flux_avg = getattr(el, 'flux_density_average', None)
-            if flux_avg is not None and len(flux_avg) > 0:
-                b_values[idx] = flux_avg[-1]
-            else:
-                b_values[idx] = 0.0
-        except Exception:
-            b_values[idx] = 0.0
+    material_id = element_field.flat(element_field.material_id)
+    magnetization_z = element_field.flat(element_field.magnetization_direction)[:, -1]
+
+    mat_ids = np.zeros(element_field.size, dtype=int)
+    mat_ids[material_id == MATERIAL_ID["iron"]] = 1
+    magnet = material_id == MATERIAL_ID["magnet"]
+    mat_ids[magnet] = 2
+    mat_ids[magnet & (magnetization_z < 0)] = 4
+
+    b_values = np.zeros(element_field.size, dtype=float)
+    if element_field.flux_density_average is not None:
+        b_values = element_field.flat(element_field.flux_density_average)[:, -1].copy()
             
     grid_pv.cell_data["MatID"] = mat_ids
     grid_pv.cell_data["FluxB"] = b_values
@@ -179,8 +158,6 @@ def show_reluctance_network(reluctance_network):
                                                    line_width=5, render=False, name="highlight", lighting=False)
             except: pass
 
-            element_obj = elements_matrix[ir, it, iz]
-            
             info_str = f"=== SELECTED ELEMENT ===\n"
             info_str += f"Index (3D): [{ir}, {it}, {iz}]\n"
             info_str += f"Flat ID   : {flat_id}\n"
@@ -190,25 +167,21 @@ def show_reluctance_network(reluctance_network):
             info_str += f"Flux B    : {b_val:.4f} T\n"
             info_str += "="*30 + "\n"
             
-            if element_obj is None:
-                info_str += "Status: Empty / None"
-            else:
-                attrs = vars(element_obj)
-                for key, val in attrs.items():
-                    if key.startswith("__"): continue
-                    
-                    info_str += f"\n[ {key} ]\n"
-                    
-                    if isinstance(val, np.ndarray):
-                        with np.printoptions(formatter={'float': '{: 0.6f}'.format}, threshold=1000, linewidth=40):
-                            arr_str = np.array2string(val, separator=', ')
-                            info_str += f"{arr_str}\n"
-                    elif isinstance(val, float):
-                        info_str += f"{val:.9f}\n"
-                    elif key in ['mesh', 'motor', 'geometry']:
-                        info_str += f"<Reference to {type(val).__name__}>\n"
-                    else:
-                        info_str += f"{val}\n"
+            for key, val in vars(element_field).items():
+                if not isinstance(val, np.ndarray) or val.shape[:3] != (nr, nt, nz):
+                    continue
+                val = val[ir, it, iz]
+
+                info_str += f"\n[ {key} ]\n"
+                
+                if val.ndim > 0:
+                    with np.printoptions(formatter={'float': '{: 0.6f}'.format}, threshold=1000, linewidth=40):
+                        arr_str = np.array2string(val, separator=', ')
+                        info_str += f"{arr_str}\n"
+                elif isinstance(val.item(), float):
+                    info_str += f"{val.item():.9f}\n"
+                else:
+                    info_str += f"{val.item()}\n"
 
             text_info.setText(info_str)
 
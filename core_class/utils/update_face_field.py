@@ -0,0 +1,26 @@
+import numpy as np
+from core_class.utils.find_branch_reluctance import find_branch_reluctance
+
+def update_face_field(reluctance_network, branches=None):
+    """
+    Tính lại từ trở và sức từ động của mọi mặt từ relative_permeability và nguồn của ElementField
+    (một lần sau mỗi lần độ từ thẩm hoặc nguồn thay đổi), ghi tại chỗ vào reluctance_network.face_field.
+    FaceField là nơi duy nhất lưu từ trở / sức từ động của nhánh.
+
+    branches: chỉ tính lại các mặt này; chúng được ghi nhận vào face_field.changed_branches để
+    create_magnetic_potential_equation(incremental=True) chỉ lắp ráp lại các hàng tương ứng.
+    """
+    face_field = reluctance_network.face_field
+    branch = find_branch_reluctance(element_field=reluctance_network.element_field,
+                                    branch_incidence=reluctance_network.branch_incidence,
+                                    branches=branches)
+    if branches is None:
+        face_field.reluctance[:] = branch.reluctance
+        face_field.magnetic_source[:] = branch.magnetic_source
+        face_field.changed_branches = None
+        return
+
+    face_field.reluctance[branches] = branch.reluctance
+    face_field.magnetic_source[branches] = branch.magnetic_source
+    if face_field.changed_branches is not None:
+        face_field.changed_branches = np.concatenate((face_field.changed_branches, branches))
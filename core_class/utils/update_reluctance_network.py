@@ -1,19 +1,64 @@
-from tqdm import tqdm
+from core_class.utils.find_winding_source import find_winding_source
+from core_class.utils.find_flux_direct import find_flux_direct
+from core_class.utils.find_flux_density import find_flux_density
+from core_class.utils.find_relative_permeability import find_relative_permeability
+from core_class.utils.find_changed_branches import find_changed_branches
+from core_class.utils.find_own_magnetic_potential import find_own_magnetic_potential
+from core_class.utils.update_face_field import update_face_field
 
 def update_reluctance_network(reluctance_network, 
                               magnetic_potential=None,
                               winding_current=None,
+                              face_flux=None,
+                              tolerance=None,
                               debug=True):
-    
-    reluctance_network.magnetic_potential = magnetic_potential
-    reluctance_network.winding_current = winding_current
-
-    iterator = tqdm(reluctance_network.elements.flat, 
-                    total=reluctance_network.elements.size, 
-                    desc="Updating Network", 
-                    disable=not debug)
-
-    for element in iterator:
-        if element is not None:
-            element.update_element(magnetic_potential=magnetic_potential,
-                                   winding_current=winding_current)
\ No newline at end of file
+    """
+    Cập nhật toàn bộ ElementField bằng phép toán trên mảng (không lặp từng element).
+    face_flux: từ thông nhánh (E,) đã biết (bộ giải Newton) thay cho từ thông tính từ thế từ.
+    tolerance: chỉ ghi mu_r của các nửa nhánh thay đổi quá sai số tương đối này và chỉ tính lại
+    các mặt của chúng (find_changed_branches), để lần lắp ráp sau chỉ làm lại các hàng đó.
+    None: ghi lại toàn bộ.
+    """
+    element_field = reluctance_network.element_field
+
+    if winding_current is not None:
+        reluctance_network.winding_current = winding_current
+        element_field.winding_source = find_winding_source(element_field=element_field,
+                                                           winding_current=winding_current).winding_source
+        update_face_field(reluctance_network=reluctance_network)
+
+    if magnetic_potential is not None:
+        reluctance_network.magnetic_potential = magnetic_potential
+
+        # find flux direct
+        element_field.flux_direct = find_flux_direct(element_field=element_field,
+                                                     magnetic_potential=magnetic_potential,
+                                                     periodic_boundary=magnetic_potential.periodic_boundary,
+                                                     branch_incidence=reluctance_network.branch_incidence,
+                                                     face_field=reluctance_network.face_field,
+                                                     face_flux=face_flux).flux_direct
+
+        # find flux density
+        flux_density = find_flux_density(element_field=element_field)
+        element_field.flux_density_direct = flux_density.flux_density_direct
+        element_field.flux_density_average = flux_density.flux_density_average
+
+        # find mu
+        relative_permeability = find_relative_permeability(element_field=element_field).relative_permeability
+
+        # update reluctance (một lần cho mỗi mặt, FaceField)
+        if tolerance is None:
+            element_field.relative_permeability = relative_permeability
+            update_face_field(reluctance_network=reluctance_network)
+        else:
+            changed = find_changed_branches(element_field=element_field,
+                                            face_field=reluctance_network.face_field,
+                                            relative_permeability=relative_permeability,
+                                            tolerance=tolerance)
+            index = (changed.cell, changed.half, changed.direction)
+            element_field.flat(element_field.relative_permeability)[index] = \
+                element_field.flat(relative_permeability)[index]
+            update_face_field(reluctance_network=reluctance_network, branches=changed.branches)
+
+        # update own magnetic potential
+        element_field.own_magnetic_potential = find_own_magnetic_potential(magnetic_potential=magnetic_potential).own_magnetic_potential
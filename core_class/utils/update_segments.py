@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.models.ElementField import ElementField
+from core_class.models.CylindricalMesh import CylindricalMesh
+from core_class.utils.voxelize_geometry import voxelize_geometry
+from core_class.utils.find_dirty_region import find_dirty_region
+from core_class.utils.find_segment_dimension import find_segment_dimension
+from core_class.utils.find_segment_attribute import find_segment_attribute
+from core_class.utils.fill_element_field import fill_element_field
+from core_class.utils.update_face_field import update_face_field
+
+# các mảng được tính lại (theo từng ô) sau khi phân loại lại vật liệu
+REFRESHED_ATTRIBUTES = ("dimension",
+                        "dimension_ratio",
+                        "segment_magnet_source",
+                        "magnetization_direction",
+                        "magnet_source",
+                        "segment_winding_vector",
+                        "winding_normal",
+                        "element_winding_vector",
+                        "winding_source",
+                        "minimum_reluctance",
+                        "relative_permeability")
+
+@dataclass
+class Output:
+    n_voxelized: int        # số ô được phân loại lại
+    n_refreshed: int        # số ô được tính lại nguồn / từ trở nhỏ nhất
+
+def update_segments(reluctance_network, segments, n_sample=(3, 3, 3), debug=True):
+    """
+    Thay một vài segment của geometry và cập nhật reluctance_network tại chỗ, không dựng lại toàn bộ.
+
+    segments: {chỉ số segment: Segment mới}.
+    1. Vùng bẩn = các ô chạm hộp bao trụ cũ hoặc mới của các segment thay đổi (find_dirty_region).
+    2. Chỉ các ô trong vùng bẩn được phân loại lại (voxelize_geometry trên lưới con).
+    3. Kích thước segment được đo lại từ center_segment của toàn lưới (giống khi dựng mới).
+    4. Thuộc tính segment, nguồn từ và từ trở nhỏ nhất được tính lại cho các ô trong vùng bẩn
+       và các ô của segment có kích thước thay đổi; độ từ thẩm của các ô này trở về giá trị lớn nhất
+       (từ trở nhỏ nhất), rồi FaceField được tính lại.
+    Khóa cache của mạng bị bỏ (geometry không còn khớp với tham số động cơ).
+    """
+    geometry = reluctance_network.geometry
+    mesh = reluctance_network.mesh
+    element_field = reluctance_network.element_field
+    changed = sorted(int(index) for index in segments)
+
+    # --- 1. THAY SEGMENT, BIÊN CŨ + MỚI ---
+    old_bounds = geometry.spatial_index.bounds[changed].copy()
+    for index in changed:
+        geometry.replace_segment(index, segments[index])
+    new_bounds = geometry.spatial_index.bounds[changed]
+    region = find_dirty_region(mesh=mesh, bounds=np.concatenate((old_bounds, new_bounds)))
+
+    # --- 2. PHÂN LOẠI LẠI VÙNG BẨN ---
+    r_nodes = np.asarray(mesh.r_nodes)
+    t_nodes = np.asarray(mesh.theta_nodes)
+    z_nodes = np.asarray(mesh.z_nodes)
+    dirty = np.zeros(element_field.shape, dtype=bool, order='F')
+    for i0, i1, j0, j1, k0, k1 in region.boxes:
+        sub_mesh = CylindricalMesh(r_nodes=r_nodes[i0:i1 + 1],
+                                   theta_nodes=t_nodes[j0:j1 + 1],
+                                   z_nodes=z_nodes[k0:k1 + 1],
+                                   periodic_boundary=False)
+        voxel = voxelize_geometry(geometry=geometry, mesh=sub_mesh, n_sample=n_sample, debug=False)
+        box = (slice(i0, i1), slice(j0, j1), slice(k0, k1))
+        element_field.material_id[box] = voxel.material_id
+        element_field.segment_index[box] = voxel.segment_index
+        element_field.material_fraction[box] = voxel.material_fraction
+        element_field.center_segment[box] = voxel.center_segment
+        dirty[box] = True
+
+    # --- 3. KÍCH THƯỚC SEGMENT ---
+    segment_list = geometry.geometry
+    old_dimension = np.array([seg.dimension for seg in segment_list], dtype=float).reshape(-1, 3)
+    measured = find_segment_dimension(geometry=geometry, mesh=mesh,
+                                      center_segment=element_field.center_segment).dimension
+    for seg, dimension in zip(segment_list, measured):
+        if seg.mesh is not None:
+            seg.dimension = np.array(dimension, dtype=float)
+    new_dimension = np.array([seg.dimension for seg in segment_list], dtype=float).reshape(-1, 3)
+    resized = np.flatnonzero(np.any(new_dimension != old_dimension, axis=1))
+    dirty |= np.isin(element_field.segment_index, resized)
+
+    # --- 4. TÍNH LẠI CÁC Ô BỊ ẢNH HƯỞNG (gom thành trường con (n, 1, 1)) ---
+    cells = np.flatnonzero(np.ravel(dirty, order='F'))
+    position = np.unravel_index(cells, element_field.shape, order='F')
+    if len(cells) > 0:
+        sub_field = ElementField(shape=(len(cells), 1, 1),
+                                 number_of_phase=element_field.number_of_phase,
+                                 material_database=element_field.material_database,
+                                 mixing_rule=element_field.mixing_rule)
+        for name in ("material_id", "segment_index", "material_fraction", "dimension", "vacuum_reluctance"):
+            gathered = getattr(element_field, name)[position]
+            setattr(sub_field, name, np.asfortranarray(gathered.reshape((len(cells), 1, 1) + gathered.shape[1:])))
+
+        segment_attribute = find_segment_attribute(geometry=geometry,
+                                                   number_of_phase=element_field.number_of_phase)
+        fill_element_field(element_field=sub_field,
+                           segment_attribute=segment_attribute,
+                           winding_current=reluctance_network.winding_current)
+
+        for name in REFRESHED_ATTRIBUTES:
+            getattr(element_field, name)[position] = sub_field.flat(getattr(sub_field, name))
+
+    update_face_field(reluctance_network=reluctance_network)
+    reluctance_network.cache_key = None
+
+    if debug:
+        print(f"[INFO] Updated segments {changed}: {region.n_cells} cells re-voxelized, "
+              f"{len(cells)} cells refreshed.")
+
+    return Output(n_voxelized=region.n_cells, n_refreshed=len(cells))
@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+import numpy as np
+import shapely
+from tqdm import tqdm
+from core_class.models.ElementField import MATERIAL_ID
+from core_class.utils.find_segment_section import find_segment_section
+from core_class.utils.find_section_inside import find_section_inside
+from core_class.models.SegmentIndex import SegmentIndex
+
+# Thứ tự ưu tiên khi tỉ lệ thể tích bằng nhau: vật liệu đặc trước, air sau cùng
+DOMINANT_ORDER = (MATERIAL_ID["magnet"], MATERIAL_ID["iron"], MATERIAL_ID["air"])
+
+@dataclass
+class Output:
+    material_id: np.ndarray         # (nr, nt, nz) int8, vật liệu chiếm ưu thế
+    segment_index: np.ndarray       # (nr, nt, nz) int32, segment chiếm ưu thế (-1: air)
+    material_fraction: np.ndarray   # (nr, nt, nz, 3) tỉ lệ thể tích air / magnet / iron
+    material_segment: np.ndarray    # (nr, nt, nz, 3) int32, segment lớn nhất của từng vật liệu
+    segment_fraction: np.ndarray    # (nr, nt, nz, 3) tỉ lệ thể tích của material_segment trong ô
+    center_segment: np.ndarray      # (nr, nt, nz) int32, segment chứa tâm ô (-1: không có)
+
+def voxelize_geometry(geometry, mesh, n_sample=(3, 3, 3), block_size=(4, 4, 4), debug=True):
+    """
+    Phân loại vật liệu cho toàn bộ ô lưới trụ (r, theta, z) cùng lúc.
+
+    Mỗi ô là một hình quạt thật (không xấp xỉ bằng hình hộp) được lấy mẫu bằng
+    n_sample = (n_r, n_t, n_z) điểm cầu phương; trọng số mỗi điểm tỉ lệ với r (dV = r dr dtheta dz).
+    Lưới được chia thành các khối block_size ô; SegmentIndex của geometry cho biết segment nào
+    có thể chạm từng khối, nên mỗi segment chỉ được kiểm tra trên các khối ứng viên.
+    Với mỗi segment, tiết diện z = const được cắt một lần cho mỗi mức z mẫu và điểm mẫu được
+    phân loại từ thô tới mịn (find_section_inside): khối ô nằm trọn trong / ngoài tiết diện được
+    nhận nguyên khối, chỉ các ô cắt biên mới kiểm tra từng điểm bằng shapely.contains_xy.
+
+    center_segment (segment chứa tâm ô) được lấy luôn từ điểm mẫu giữa khi n_sample lẻ,
+    dùng để đo kích thước segment (find_segment_dimension) mà không phải kiểm tra lại.
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    spatial_index = geometry.spatial_index if hasattr(geometry, 'spatial_index') else SegmentIndex(geometry=segments)
+
+    nr, nt, nz = int(mesh.n_cells_r), int(mesh.n_cells_t), int(mesh.n_cells_z)
+    n_sr, n_st, n_sz = (int(n) for n in n_sample)
+
+    # --- 1. ĐIỂM MẪU TRONG MỖI Ô ---
+    r_sample = find_cell_sample(mesh.r_nodes, n_sr)          # (nr, n_sr)
+    t_sample = find_cell_sample(mesh.theta_nodes, n_st)      # (nt, n_st)
+    z_sample = find_cell_sample(mesh.z_nodes, n_sz)          # (nz, n_sz)
+
+    r_edge = np.column_stack((mesh.r_nodes[:-1], mesh.r_nodes[1:])).astype(float)
+    t_edge = np.column_stack((mesh.theta_nodes[:-1], mesh.theta_nodes[1:])).astype(float)
+
+    # trọng số theo r trong từng ô, chuẩn hóa để tổng trọng số của một ô bằng 1
+    weight = r_sample / np.sum(r_sample, axis=1, keepdims=True) / (n_st * n_sz)
+
+    material_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    material_segment = np.full((nr, nt, nz, 3), -1, dtype=np.int32, order='F')
+    segment_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    center_segment = np.full((nr, nt, nz), -1, dtype=np.int32, order='F')
+
+    # --- 2. SEGMENT ỨNG VIÊN CỦA TỪNG KHỐI Ô ---
+    segment_cells = find_segment_candidate_cells(spatial_index, mesh, block_size)
+
+    # --- 3. TỈ LỆ THỂ TÍCH CỦA TỪNG SEGMENT ---
+    for index, seg in enumerate(tqdm(segments, desc="Voxelizing Segments", disable=not debug)):
+        if seg.mesh is None:
+            continue
+        if seg.material not in MATERIAL_ID:
+            raise ValueError(f"Material '{seg.material}' không có trong MATERIAL_ID")
+        material = MATERIAL_ID[seg.material]
+
+        if index not in segment_cells:
+            continue
+        i_r, i_t, i_z = segment_cells[index]
+
+        R = np.repeat(r_sample[i_r].reshape(-1, 1), len(i_t) * n_st, axis=1)
+        T = np.repeat(t_sample[i_t].reshape(1, -1), len(i_r) * n_sr, axis=0)
+
+        fraction, center = find_segment_fraction(seg.mesh,
+                                                 R * np.cos(T), R * np.sin(T),
+                                                 z_sample[i_z],
+                                                 weight[i_r],
+                                                 n_st,
+                                                 r_edge=r_edge[i_r],
+                                                 t_edge=t_edge[i_t])
+
+        # --- 4. CỘNG DỒN THEO VẬT LIỆU ---
+        block = np.ix_(i_r, i_t, i_z, [material])
+        fraction = fraction[..., None]
+        material_fraction[block] += fraction
+        best = segment_fraction[block]
+        better = fraction > best
+        segment_fraction[block] = np.where(better, fraction, best)
+        material_segment[block] = np.where(better, index, material_segment[block])
+        cells = np.ix_(i_r, i_t, i_z)
+        center_segment[cells] = np.where(center, index, center_segment[cells])
+
+    # --- 5. VẬT LIỆU CHIẾM ƯU THẾ ---
+    dominant = find_dominant_material(material_fraction, material_segment)
+
+    return Output(material_id=dominant.material_id,
+                  segment_index=dominant.segment_index,
+                  material_fraction=material_fraction,
+                  material_segment=material_segment,
+                  segment_fraction=segment_fraction,
+                  center_segment=center_segment)
+
+
+@dataclass
+class DominantOutput:
+    material_id: np.ndarray
+    segment_index: np.ndarray
+
+def find_dominant_material(material_fraction, material_segment):
+    """
+    Điền tỉ lệ air = 1 - tổng tỉ lệ vật liệu đặc (sửa tại chỗ material_fraction), sau đó chọn
+    vật liệu chiếm ưu thế của từng ô (hòa thì theo DOMINANT_ORDER) và segment tương ứng (-1: air).
+    """
+    occupied = np.sum(material_fraction[..., [MATERIAL_ID["magnet"], MATERIAL_ID["iron"]]], axis=-1)
+    material_fraction[..., MATERIAL_ID["air"]] = np.maximum(0.0, 1.0 - occupied)
+
+    order = np.array(DOMINANT_ORDER)
+    material_id = order[np.argmax(material_fraction[..., order], axis=-1)].astype(np.int8)
+    segment_index = np.take_along_axis(material_segment, material_id[..., None].astype(np.intp), axis=-1)[..., 0]
+    segment_index[material_id == MATERIAL_ID["air"]] = -1
+
+    return DominantOutput(material_id=np.asfortranarray(material_id),
+                          segment_index=np.asfortranarray(segment_index))
+
+
+def find_cell_sample(nodes, n_sample):
+    """Điểm giữa của n_sample ô con đều nhau trong mỗi ô lưới, shape (n_cells, n_sample)."""
+    nodes = np.asarray(nodes, dtype=float)
+    ratio = (np.arange(n_sample) + 0.5) / n_sample
+    return nodes[:-1, None] + np.diff(nodes)[:, None] * ratio[None, :]
+
+
+def find_segment_candidate_cells(spatial_index, mesh, block_size):
+    """
+    Chia lưới thành các khối block_size ô, truy vấn hàng loạt SegmentIndex cho mọi khối
+    và đảo lại thành {segment: (i_r, i_t, i_z)} - chỉ số các ô ứng viên theo từng trục.
+
+    Hộp bao của segment trong hệ trụ là tích các khoảng, nên tập khối chạm nó cũng là
+    tích các tập khối theo từng trục: lấy hợp theo từng trục là chính xác.
+    """
+    nodes = (np.asarray(mesh.r_nodes, dtype=float),
+             np.asarray(mesh.theta_nodes, dtype=float),
+             np.asarray(mesh.z_nodes, dtype=float))
+
+    # biên [min, max] và các ô của từng khối theo mỗi trục
+    axis_ranges = []
+    axis_cells = []
+    for axis_nodes, size in zip(nodes, block_size):
+        n_cells = len(axis_nodes) - 1
+        start = np.arange(0, n_cells, max(1, int(size)))
+        stop = np.minimum(start + max(1, int(size)), n_cells)
+        axis_ranges.append(np.column_stack((axis_nodes[start], axis_nodes[stop])))
+        axis_cells.append([np.arange(a, b) for a, b in zip(start, stop)])
+
+    n_br, n_bt, n_bz = (len(cells) for cells in axis_cells)
+    b_r, b_t, b_z = np.meshgrid(np.arange(n_br), np.arange(n_bt), np.arange(n_bz), indexing='ij')
+    b_r, b_t, b_z = b_r.ravel(), b_t.ravel(), b_z.ravel()
+
+    candidates = spatial_index.query_blocks(r_ranges=axis_ranges[0][b_r],
+                                            theta_ranges=axis_ranges[1][b_t],
+                                            z_ranges=axis_ranges[2][b_z])
+
+    segment_block = {}
+    for block, segment in enumerate(candidates):
+        for index in segment:
+            segment_block.setdefault(int(index), []).append(block)
+
+    segment_cells = {}
+    for index, block in segment_block.items():
+        segment_cells[index] = tuple(np.concatenate([cells[b] for b in np.unique(axis_block[block])])
+                                     for cells, axis_block in zip(axis_cells, (b_r, b_t, b_z)))
+    return segment_cells
+
+
+def find_segment_fraction(segment_mesh, X, Y, z_sample, weight, n_st, r_edge=None, t_edge=None):
+    """
+    Tỉ lệ thể tích của một segment trong khối ô (n_r, nt, n_z) và mặt nạ tâm ô nằm trong segment.
+    X, Y: lưới điểm mẫu (n_r*n_sr, nt*n_st); z_sample: (n_z, n_sz); weight: (n_r, n_sr).
+    r_edge, t_edge: biên [trong, ngoài] của các ô (n_r, 2), (nt, 2); khi có thì phân loại
+    từ thô tới mịn bằng find_section_inside, không thì kiểm tra mọi điểm mẫu.
+    Các mức z có tiết diện giống hệt nhau (segment đùn thẳng) chỉ được phân loại một lần.
+    Tâm ô trùng điểm mẫu giữa khi số điểm mẫu lẻ; với số chẵn dùng tiêu chí tỉ lệ >= 0.5.
+    """
+    n_r, n_sr = weight.shape
+    n_z, n_sz = z_sample.shape
+    n_t = X.shape[1] // n_st
+
+    sections = find_segment_section(segment_mesh, z_sample.ravel()).sections
+
+    odd = n_sr % 2 == 1 and n_st % 2 == 1 and n_sz % 2 == 1
+
+    fraction = np.zeros((n_r, n_t, n_z))
+    center = np.zeros((n_r, n_t, n_z), dtype=bool)
+    known = {}
+    for k in range(n_z):
+        for s in range(n_sz):
+            section = sections[k * n_sz + s]
+            if section is None:
+                continue
+            key = shapely.to_wkb(section)
+            if key not in known:
+                if r_edge is None or t_edge is None:
+                    inside = shapely.contains_xy(section, X, Y).reshape(n_r, n_sr, n_t, n_st)
+                else:
+                    inside = find_section_inside(section, r_edge, t_edge, X, Y, n_sr, n_st).inside
+                known[key] = (np.einsum('iajb,ia->ij', inside, weight), inside[:, n_sr // 2, :, n_st // 2])
+            layer_fraction, layer_center = known[key]
+            fraction[:, :, k] += layer_fraction
+            if odd and s == n_sz // 2:
+                center[:, :, k] = layer_center
+
+    if not odd:
+        center = fraction >= 0.5
+
+    return fraction, center
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+import numpy as np
+from storage.core import voxel_cache
+from core_class.utils.voxelize_geometry import voxelize_geometry, Output as VoxelOutput
+from core_class.utils.voxelize_geometry_parallel import voxelize_geometry_parallel
+from core_class.utils.voxelize_geometry_periodic import voxelize_geometry_periodic
+from core_class.utils.voxelize_geometry_components import voxelize_geometry_components
+from core_class.utils.find_segment_dimension import find_segment_dimension
+
+@dataclass
+class Output:
+    voxel: VoxelOutput
+    cache_hit: bool
+
+def voxelize_geometry_cached(geometry, mesh, cache_key=None, n_sample=(3, 3, 3), n_jobs=1,
+                             use_periodicity=True, debug=True):
+    """
+    Bản đồ vật liệu + kích thước segment, đọc từ voxel_cache nếu có khóa trùng.
+
+    Kích thước segment được đo từ bản đồ center_segment của chính lần phân loại này
+    (find_segment_dimension), không kiểm tra điểm-trong-mesh lần thứ hai.
+    Cache hit: bỏ qua hoàn toàn phân loại và đo kích thước, seg.dimension được gán lại từ cache.
+    Cache miss: tính như bình thường rồi ghi vào cache (cache_key=None: không dùng cache).
+    use_periodicity: chỉ phân loại một chu kỳ theta (răng / cực) rồi nhân bản, xem voxelize_geometry_periodic.
+    Nếu các segment được gán component (rotor, stator...), mỗi bộ phận được phân loại và cache riêng
+    (voxelize_geometry_components): đổi tham số rotor chỉ phân loại lại vùng z của rotor.
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    shape = (int(mesh.n_cells_r), int(mesh.n_cells_t), int(mesh.n_cells_z))
+
+    # --- 1. ĐỌC CACHE ---
+    entry = voxel_cache.load(cache_key)
+    if entry is not None and is_valid_entry(entry, shape, len(segments)):
+        for seg, dimension in zip(segments, entry["segment_dimension"]):
+            seg.dimension = np.array(dimension, dtype=float)
+        voxel = VoxelOutput(material_id=np.asfortranarray(entry["material_id"]),
+                            segment_index=np.asfortranarray(entry["segment_index"]),
+                            material_fraction=np.asfortranarray(entry["material_fraction"]),
+                            material_segment=np.asfortranarray(entry["material_segment"]),
+                            segment_fraction=np.asfortranarray(entry["segment_fraction"]),
+                            center_segment=np.asfortranarray(entry["center_segment"]))
+        if debug:
+            print(f"[INFO] Voxel cache hit ({cache_key[:12]}).")
+        return Output(voxel=voxel, cache_hit=True)
+
+    # --- 2. TÍNH MỚI ---
+    if hasattr(geometry, 'spatial_index') and any(getattr(seg, 'component', None) is not None for seg in segments):
+        components = voxelize_geometry_components(geometry=geometry, mesh=mesh, n_sample=n_sample,
+                                                  n_jobs=n_jobs, use_periodicity=use_periodicity,
+                                                  use_cache=cache_key is not None, debug=debug)
+        voxel = components.voxel
+        if debug:
+            print(f"[INFO] Components: {components.n_cache_hit} / {components.n_component} from cache.")
+    elif use_periodicity and hasattr(geometry, 'spatial_index'):
+        voxel = voxelize_geometry_periodic(geometry=geometry, mesh=mesh, n_sample=n_sample,
+                                           n_jobs=n_jobs, debug=debug)
+    elif n_jobs == 1:
+        voxel = voxelize_geometry(geometry=geometry, mesh=mesh, n_sample=n_sample, debug=debug)
+    else:
+        voxel = voxelize_geometry_parallel(geometry=geometry, mesh=mesh, n_sample=n_sample,
+                                           n_jobs=n_jobs, debug=debug)
+
+    # --- 3. KÍCH THƯỚC SEGMENT TỪ BẢN ĐỒ CHIẾM CHỖ ---
+    measured = find_segment_dimension(geometry=geometry, mesh=mesh, center_segment=voxel.center_segment)
+    for seg, dimension in zip(segments, measured.dimension):
+        if seg.mesh is not None:
+            seg.dimension = np.array(dimension, dtype=float)
+    if debug and measured.n_fallback > 0:
+        print(f"[WARNING] Used fallback dimension for {measured.n_fallback} segments (Mesh too coarse).")
+
+    # --- 4. GHI CACHE ---
+    if cache_key is not None:
+        segment_dimension = np.array([seg.dimension for seg in segments], dtype=float).reshape(-1, 3)
+        voxel_cache.save(cache_key,
+                         material_id=voxel.material_id,
+                         segment_index=voxel.segment_index,
+                         material_fraction=voxel.material_fraction,
+                         material_segment=voxel.material_segment,
+                         segment_fraction=voxel.segment_fraction,
+                         center_segment=voxel.center_segment,
+                         segment_dimension=segment_dimension)
+
+    return Output(voxel=voxel, cache_hit=False)
+
+
+def is_valid_entry(entry, shape, number_of_segment):
+    names = ("material_id", "segment_index", "material_fraction", "material_segment",
+             "segment_fraction", "center_segment", "segment_dimension")
+    if any(name not in entry for name in names):
+        return False
+    return (entry["material_id"].shape == shape and
+            entry["material_fraction"].shape == shape + (3,) and
+            entry["segment_dimension"].shape == (number_of_segment, 3))
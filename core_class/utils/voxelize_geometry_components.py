@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+import numpy as np
+from storage.core import voxel_cache
+from core_class.models.Geometry import Geometry
+from core_class.models.CylindricalMesh import CylindricalMesh
+from core_class.models.ElementField import MATERIAL_ID
+from core_class.utils.voxelize_geometry import voxelize_geometry, find_dominant_material, Output as VoxelOutput
+from core_class.utils.voxelize_geometry_parallel import voxelize_geometry_parallel
+from core_class.utils.voxelize_geometry_periodic import voxelize_geometry_periodic
+from core_class.utils.find_component_cache_key import find_component_cache_key
+
+# các mảng lưu cho mỗi bộ phận (chỉ số segment là chỉ số cục bộ trong bộ phận)
+COMPONENT_ARRAYS = ("material_fraction", "material_segment", "segment_fraction", "center_segment")
+
+@dataclass
+class Output:
+    voxel: VoxelOutput
+    n_component: int        # số bộ phận
+    n_cache_hit: int        # số bộ phận đọc từ cache
+
+def voxelize_geometry_components(geometry, mesh, n_sample=(3, 3, 3), n_jobs=1,
+                                 use_periodicity=True, use_cache=True, debug=True):
+    """
+    Phân loại vật liệu theo từng bộ phận (seg.component: rotor, stator...), mỗi bộ phận
+    chỉ trên các lớp z mà nó chiếm và được cache riêng (find_component_cache_key).
+
+    Khi chỉ đổi tham số rotor, hình học stator không đổi (hoặc chỉ tịnh tiến theo z) nên stator
+    được đọc lại từ cache, chỉ vùng z của rotor được phân loại lại.
+    Kết quả các bộ phận được ghép bằng cách cộng tỉ lệ vật liệu và chọn segment có tỉ lệ lớn nhất;
+    với các ô chỉ thuộc một bộ phận kết quả giống hệt phân loại toàn bộ geometry.
+    Segment không có component được gom vào một bộ phận chung.
+    """
+    segments = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    nr, nt, nz = int(mesh.n_cells_r), int(mesh.n_cells_t), int(mesh.n_cells_z)
+    z_nodes = np.asarray(mesh.z_nodes, dtype=float)
+
+    material_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    material_segment = np.full((nr, nt, nz, 3), -1, dtype=np.int32, order='F')
+    segment_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    center_segment = np.full((nr, nt, nz), -1, dtype=np.int32, order='F')
+
+    # --- 1. NHÓM SEGMENT THEO BỘ PHẬN (theo thứ tự xuất hiện) ---
+    components = {}
+    for index, seg in enumerate(segments):
+        if seg.mesh is not None:
+            components.setdefault(seg.component, []).append(index)
+
+    n_cache_hit = 0
+    for name, indices in components.items():
+        indices = np.array(indices)
+
+        # --- 2. CÁC LỚP Z MÀ BỘ PHẬN CHIẾM ---
+        bounds = geometry.spatial_index.bounds[indices]
+        z_min, z_max = np.min(bounds[:, 4]), np.max(bounds[:, 5])
+        rows = np.flatnonzero((z_nodes[1:] >= z_min) & (z_nodes[:-1] <= z_max))
+        if len(rows) == 0:
+            continue
+        k0, k1 = int(rows[0]), int(rows[-1]) + 1
+        sub_mesh = CylindricalMesh(r_nodes=mesh.r_nodes,
+                                   theta_nodes=mesh.theta_nodes,
+                                   z_nodes=z_nodes[k0:k1 + 1],
+                                   periodic_boundary=mesh.periodic_boundary)
+        sub_geometry = Geometry(geometry=[segments[index] for index in indices])
+
+        # --- 3. ĐỌC CACHE HOẶC PHÂN LOẠI ---
+        key = None
+        entry = None
+        if use_cache:
+            key = find_component_cache_key(segments=sub_geometry.geometry, mesh=sub_mesh,
+                                           z_origin=z_nodes[k0], n_sample=n_sample).key
+            entry = voxel_cache.load(key)
+            if entry is not None and not is_valid_component_entry(entry, (nr, nt, k1 - k0)):
+                entry = None
+
+        if entry is not None:
+            n_cache_hit += 1
+            part = {name_: np.asfortranarray(entry[name_]) for name_ in COMPONENT_ARRAYS}
+        else:
+            voxel = voxelize_component(sub_geometry, sub_mesh, n_sample, n_jobs, use_periodicity)
+            part = {name_: getattr(voxel, name_) for name_ in COMPONENT_ARRAYS}
+            if key is not None:
+                voxel_cache.save(key, **part)
+
+        if debug:
+            state = "cache hit" if entry is not None else "voxelized"
+            print(f"[INFO] Component '{name}': {len(indices)} segments, z-rows {k0}:{k1} ({state}).")
+
+        # --- 4. GHÉP VÀO LƯỚI ĐẦY ĐỦ (chỉ số cục bộ -> toàn cục) ---
+        to_global = np.append(indices, -1).astype(np.int32)
+        solid = [MATERIAL_ID["magnet"], MATERIAL_ID["iron"]]
+        material_fraction[:, :, k0:k1, solid] += part["material_fraction"][..., solid]
+
+        best = segment_fraction[:, :, k0:k1]
+        better = part["segment_fraction"] > best
+        segment_fraction[:, :, k0:k1] = np.where(better, part["segment_fraction"], best)
+        material_segment[:, :, k0:k1] = np.where(better, to_global[part["material_segment"]],
+                                                 material_segment[:, :, k0:k1])
+        # cùng quy ước với voxelize_geometry: segment có chỉ số lớn hơn được ghi sau
+        center_segment[:, :, k0:k1] = np.maximum(center_segment[:, :, k0:k1],
+                                                 to_global[part["center_segment"]])
+
+    # --- 5. VẬT LIỆU CHIẾM ƯU THẾ ---
+    dominant = find_dominant_material(material_fraction, material_segment)
+    voxel = VoxelOutput(material_id=dominant.material_id,
+                        segment_index=dominant.segment_index,
+                        material_fraction=material_fraction,
+                        material_segment=material_segment,
+                        segment_fraction=segment_fraction,
+                        center_segment=center_segment)
+
+    return Output(voxel=voxel, n_component=len(components), n_cache_hit=n_cache_hit)
+
+
+def voxelize_component(geometry, mesh, n_sample, n_jobs, use_periodicity):
+    if use_periodicity:
+        return voxelize_geometry_periodic(geometry=geometry, mesh=mesh, n_sample=n_sample,
+                                          n_jobs=n_jobs, debug=False)
+    if n_jobs == 1:
+        return voxelize_geometry(geometry=geometry, mesh=mesh, n_sample=n_sample, debug=False)
+    return voxelize_geometry_parallel(geometry=geometry, mesh=mesh, n_sample=n_sample,
+                                      n_jobs=n_jobs, debug=False)
+
+
+def is_valid_component_entry(entry, shape):
+    if any(name not in entry for name in COMPONENT_ARRAYS):
+        return False
+    return (entry["center_segment"].shape == shape and
+            all(entry[name].shape == shape + (3,) for name in COMPONENT_ARRAYS[:3]))
@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from tqdm import tqdm
+from core_class.models.CylindricalMesh import CylindricalMesh
+from core_class.utils.voxelize_geometry import voxelize_geometry, Output
+
+# geometry của mỗi worker, gửi một lần qua initializer thay vì theo từng slab
+_worker_geometry = None
+
+def voxelize_geometry_parallel(geometry, mesh, n_sample=(3, 3, 3), block_size=(4, 4, 4),
+                               n_jobs=None, n_slab=None, debug=True):
+    """
+    voxelize_geometry chia theo các lớp z (z-slab) và chạy trên ProcessPoolExecutor.
+
+    Mỗi ô chỉ thuộc một slab và kết quả của một ô không phụ thuộc ô khác,
+    nên ghép các slab lại cho kết quả giống hệt bản tuần tự.
+    n_jobs: số process (None hoặc -1: toàn bộ CPU); n_slab: số slab (mặc định 4 * n_jobs để cân tải).
+
+    Lưu ý: trên Windows (spawn), script gọi hàm này phải đặt trong `if __name__ == "__main__":`.
+    """
+    n_jobs = find_number_of_job(n_jobs)
+    nr, nt, nz = int(mesh.n_cells_r), int(mesh.n_cells_t), int(mesh.n_cells_z)
+    if n_slab is None:
+        n_slab = 4 * n_jobs
+    n_slab = int(np.clip(n_slab, 1, nz))
+
+    if n_jobs == 1 or n_slab == 1:
+        return voxelize_geometry(geometry=geometry, mesh=mesh, n_sample=n_sample,
+                                 block_size=block_size, debug=debug)
+
+    # --- 1. CHIA LƯỚI THEO Z ---
+    z_nodes = np.asarray(mesh.z_nodes)
+    slabs = [(int(cells[0]), int(cells[-1]) + 1) for cells in np.array_split(np.arange(nz), n_slab)]
+
+    material_id = np.zeros((nr, nt, nz), dtype=np.int8, order='F')
+    segment_index = np.full((nr, nt, nz), -1, dtype=np.int32, order='F')
+    material_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    material_segment = np.full((nr, nt, nz, 3), -1, dtype=np.int32, order='F')
+    segment_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    center_segment = np.full((nr, nt, nz), -1, dtype=np.int32, order='F')
+
+    # --- 2. PHÂN LOẠI SONG SONG ---
+    with ProcessPoolExecutor(max_workers=n_jobs,
+                             initializer=init_worker,
+                             initargs=(geometry,)) as executor:
+        futures = {executor.submit(voxelize_slab,
+                                   mesh.r_nodes, mesh.theta_nodes, z_nodes[k0:k1 + 1],
+                                   mesh.periodic_boundary, n_sample, block_size): (k0, k1)
+                   for k0, k1 in slabs}
+
+        iterator = as_completed(futures)
+        if debug:
+            iterator = tqdm(iterator, total=len(futures), desc=f"Voxelizing Slabs ({n_jobs} jobs)")
+
+        # --- 3. GHÉP KẾT QUẢ ---
+        for future in iterator:
+            k0, k1 = futures[future]
+            slab = future.result()
+            material_id[:, :, k0:k1] = slab.material_id
+            segment_index[:, :, k0:k1] = slab.segment_index
+            material_fraction[:, :, k0:k1] = slab.material_fraction
+            material_segment[:, :, k0:k1] = slab.material_segment
+            segment_fraction[:, :, k0:k1] = slab.segment_fraction
+            center_segment[:, :, k0:k1] = slab.center_segment
+
+    return Output(material_id=material_id,
+                  segment_index=segment_index,
+                  material_fraction=material_fraction,
+                  material_segment=material_segment,
+                  segment_fraction=segment_fraction,
+                  center_segment=center_segment)
+
+
+def find_number_of_job(n_jobs):
+    if n_jobs is None or int(n_jobs) < 1:
+        return max(1, os.cpu_count() or 1)
+    return int(n_jobs)
+
+
+def init_worker(geometry):
+    global _worker_geometry
+    _worker_geometry = geometry
+
+
+def voxelize_slab(r_nodes, theta_nodes, z_nodes, periodic_boundary, n_sample, block_size):
+    slab_mesh = CylindricalMesh(r_nodes=r_nodes,
+                                theta_nodes=theta_nodes,
+                                z_nodes=z_nodes,
+                                periodic_boundary=periodic_boundary)
+    return voxelize_geometry(geometry=_worker_geometry, mesh=slab_mesh,
+                             n_sample=n_sample, block_size=block_size, debug=False)
@@ -0,0 +1,99 @@
+import numpy as np
+from core_class.models.CylindricalMesh import CylindricalMesh
+from core_class.utils.voxelize_geometry import Output
+from core_class.utils.voxelize_geometry_parallel import voxelize_geometry_parallel
+from core_class.utils.find_rotational_period import find_rotational_period
+
+def voxelize_geometry_periodic(geometry, mesh, n_sample=(3, 3, 3), block_size=(4, 4, 4),
+                               n_jobs=1, debug=True, tolerance=1e-6):
+    """
+    voxelize_geometry tận dụng tính tuần hoàn theo theta (bước răng / bước cực).
+
+    Các lớp z được gom thành slab theo tập segment chạm vào chúng. Với mỗi slab, nếu các segment
+    lặp lại theo một chu kỳ góc là bội nguyên của bước lưới (lưới theta đều) thì chỉ phân loại
+    chu kỳ đầu tiên, phần còn lại được sinh bằng cách dịch chỉ số theta; chỉ số segment được
+    ánh xạ qua hoán vị của phép xoay nên từ hóa đổi dấu theo cực được giữ đúng.
+    Slab không tuần hoàn (hoặc lưới theta không đều) được phân loại đầy đủ.
+    """
+    if not hasattr(geometry, 'spatial_index'):
+        raise TypeError("voxelize_geometry_periodic cần Geometry (có spatial_index)")
+
+    nr, nt, nz = int(mesh.n_cells_r), int(mesh.n_cells_t), int(mesh.n_cells_z)
+    r_nodes = np.asarray(mesh.r_nodes, dtype=float)
+    theta_nodes = np.asarray(mesh.theta_nodes, dtype=float)
+    z_nodes = np.asarray(mesh.z_nodes, dtype=float)
+
+    def voxelize(theta_cells, k0, k1):
+        sub_mesh = CylindricalMesh(r_nodes=r_nodes,
+                                   theta_nodes=theta_nodes[:theta_cells + 1],
+                                   z_nodes=z_nodes[k0:k1 + 1],
+                                   periodic_boundary=mesh.periodic_boundary)
+        return voxelize_geometry_parallel(geometry=geometry, mesh=sub_mesh, n_sample=n_sample,
+                                          block_size=block_size, n_jobs=n_jobs, debug=False)
+
+    # --- 1. LƯỚI THETA PHẢI ĐỀU ---
+    theta_step = np.diff(theta_nodes)
+    uniform = np.allclose(theta_step, theta_step[0], rtol=tolerance, atol=0.0)
+    if not uniform or nt < 2:
+        return voxelize(nt, 0, nz)
+    theta_step = float(theta_step[0])
+
+    # --- 2. GOM CÁC LỚP Z THÀNH SLAB THEO TẬP SEGMENT ---
+    layer_segment = geometry.spatial_index.query_blocks(r_ranges=np.tile([r_nodes[0], r_nodes[-1]], (nz, 1)),
+                                                        theta_ranges=np.tile([0.0, 2 * np.pi], (nz, 1)),
+                                                        z_ranges=np.column_stack((z_nodes[:-1], z_nodes[1:])))
+    slabs = []
+    for k in range(nz):
+        if slabs and np.array_equal(layer_segment[k], layer_segment[slabs[-1][0]]):
+            slabs[-1][1] = k + 1
+        else:
+            slabs.append([k, k + 1])
+
+    material_id = np.zeros((nr, nt, nz), dtype=np.int8, order='F')
+    segment_index = np.full((nr, nt, nz), -1, dtype=np.int32, order='F')
+    material_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    material_segment = np.full((nr, nt, nz, 3), -1, dtype=np.int32, order='F')
+    segment_fraction = np.zeros((nr, nt, nz, 3), order='F')
+    center_segment = np.full((nr, nt, nz), -1, dtype=np.int32, order='F')
+
+    n_reference = 0
+    for k0, k1 in slabs:
+        period = find_rotational_period(geometry=geometry,
+                                        segment_candidate=layer_segment[k0],
+                                        theta_step=theta_step,
+                                        n_cells_t=nt,
+                                        tolerance=tolerance)
+        pitch_cells = period.pitch_cells if period.pitch_cells > 0 else nt
+
+        # --- 3. PHÂN LOẠI CHU KỲ ĐẦU TIÊN ---
+        reference = voxelize(pitch_cells, k0, k1)
+        n_reference += pitch_cells * (k1 - k0)
+
+        # --- 4. NHÂN BẢN THEO THETA ---
+        permutation = np.append(period.permutation, -1)     # chỉ số -1 (air) giữ nguyên
+        mapped_segment = reference.segment_index
+        mapped_material_segment = reference.material_segment
+        mapped_center_segment = reference.center_segment
+        for start in range(0, nt, pitch_cells):
+            stop = min(start + pitch_cells, nt)
+            width = stop - start
+            material_id[:, start:stop, k0:k1] = reference.material_id[:, :width]
+            segment_index[:, start:stop, k0:k1] = mapped_segment[:, :width]
+            material_fraction[:, start:stop, k0:k1] = reference.material_fraction[:, :width]
+            material_segment[:, start:stop, k0:k1] = mapped_material_segment[:, :width]
+            segment_fraction[:, start:stop, k0:k1] = reference.segment_fraction[:, :width]
+            center_segment[:, start:stop, k0:k1] = mapped_center_segment[:, :width]
+            mapped_segment = permutation[mapped_segment]
+            mapped_material_segment = permutation[mapped_material_segment]
+            mapped_center_segment = permutation[mapped_center_segment]
+
+    if debug:
+        print(f"[INFO] Periodic voxelization: {len(slabs)} slabs, "
+              f"{n_reference * nr} / {nr * nt * nz} cells classified.")
+
+    return Output(material_id=material_id,
+                  segment_index=segment_index,
+                  material_fraction=material_fraction,
+                  material_segment=material_segment,
+                  segment_fraction=segment_fraction,
+                  center_segment=center_segment)
@@ -44,18 +44,23 @@ def lookup_BH_curve(
 
     material_filter_2d = np.repeat(material_filter, m, axis=0)
 
-    # --- Step 3. Lấy bảng B-H ---
-    B_TABLE = np.asarray(material_database.iron.B_H_curve["B_data"], dtype=float)
-    H_TABLE = np.asarray(material_database.iron.B_H_curve["H_data"], dtype=float)
+    # --- Step 3. Lấy bảng B-H (từ bộ nhớ đệm của MaterialDataBase nếu có) ---
+    if hasattr(material_database, "derived_property"):
+        derived_property = material_database.derived_property
+        B_TABLE = derived_property.B_table
+        H_TABLE = derived_property.H_table
+        mu_at_zero = derived_property.mu_at_zero
+    else:
+        B_TABLE = np.asarray(material_database.iron.B_H_curve["B_data"], dtype=float)
+        H_TABLE = np.asarray(material_database.iron.B_H_curve["H_data"], dtype=float)
+        delta_B = 1e-3
+        H_delta = np.interp(delta_B, B_TABLE, H_TABLE)
+        mu_at_zero = delta_B / (H_delta + 1e-15)
     B_min, B_max = B_TABLE[0], B_TABLE[-1]
 
     # --- Step 4. Nội suy ---
     B_clip = np.clip(np.abs(B_array), B_min, B_max)
     H_val = np.interp(B_clip, B_TABLE, H_TABLE)
-
-    delta_B = 1e-3
-    H_delta = np.interp(delta_B, B_TABLE, H_TABLE)
-    mu_at_zero = delta_B / (H_delta + 1e-15)
     mu_iron = np.where(np.abs(H_val) < 1e-9,
                        mu_at_zero,
                        B_clip / (H_val + 1e-15)) / MU0
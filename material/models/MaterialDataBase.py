@@ -1,5 +1,6 @@
 import numpy as np
 import math
+from material.utils.find_derived_property import find_derived_property, is_derived_property_valid
 
 PI = math.pi
 
@@ -44,3 +45,16 @@ class MaterialDataBase:
         self.air = Air(air)
         self.magnet = Magnet(magnet_type)
         self.iron = Iron(iron_type)
+
+    @property
+    def derived_property(self):
+        """
+        mu_r_max, bảng B-H và permeance nam châm, tính một lần và lưu trên chính MaterialDataBase
+        (mọi Element và lookup_BH_curve dùng chung). Tự tính lại khi đường cong B-H (hoặc hằng số
+        vật liệu) thay đổi.
+        """
+        derived_property = getattr(self, "_derived_property", None)
+        if not is_derived_property_valid(derived_property, self):
+            derived_property = find_derived_property(material_database=self)
+            self._derived_property = derived_property
+        return derived_property
@@ -0,0 +1,43 @@
+import sys
+import os
+
+def test():
+    import numpy as np
+    from material.models.MaterialDataBase import MaterialDataBase
+    from material.utils.find_maximum_permeance import find_maximum_permeance, find_maximum_permeance_from_table
+
+    material_database = MaterialDataBase()
+    derived_property = material_database.derived_property
+    direct = find_maximum_permeance_from_table(B_table=material_database.iron.B_H_curve["B_data"],
+                                               H_table=material_database.iron.B_H_curve["H_data"])
+
+    # tính một lần cho mỗi MaterialDataBase; n_points tường minh luôn được tính lại
+    assert material_database.derived_property is derived_property
+    assert derived_property.mu_r_max == direct.mu_r_max
+    assert find_maximum_permeance(material_database=material_database).mu_r_max == direct.mu_r_max
+    assert find_maximum_permeance(material_database=material_database, n_points=5000).mu_r_max == direct.mu_r_max
+    coarse = find_maximum_permeance_from_table(B_table=material_database.iron.B_H_curve["B_data"],
+                                               H_table=material_database.iron.B_H_curve["H_data"],
+                                               n_points=50)
+    assert find_maximum_permeance(material_database=material_database, n_points=50).mu_r_max == coarse.mu_r_max
+    print(f"mu_r_max: {derived_property.mu_r_max:.1f}")
+
+    # đổi đường cong thì bộ nhớ đệm được tính lại
+    material_database.iron.B_H_curve["H_data"] = material_database.iron.B_H_curve["H_data"] * 2
+    assert material_database.derived_property is not derived_property
+    assert np.isclose(material_database.derived_property.mu_r_max, direct.mu_r_max / 2)
+
+    # đường cong của người dùng không bị khóa ghi; sửa tại chỗ cũng làm bộ nhớ đệm tính lại
+    doubled = material_database.derived_property
+    material_database.iron.B_H_curve["H_data"][3] = 1.0
+    assert material_database.derived_property is not doubled
+    assert material_database.derived_property.H_table[3] == 1.0
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
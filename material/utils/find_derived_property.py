@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+import numpy as np
+from material.utils.find_maximum_permeance import find_maximum_permeance_from_table, MU0, DEFAULT_N_POINTS
+
+@dataclass
+class DerivedProperty:
+    """
+    Các đại lượng dẫn xuất từ vật liệu, tính một lần cho mỗi đường cong B-H.
+    """
+    B_table: np.ndarray               # bảng B-H gốc (bản sao float, chỉ đọc)
+    H_table: np.ndarray
+    mu_at_zero: float                 # mu tuyệt đối tại B -> 0 (dùng trong lookup_BH_curve)
+    mu_r_max: float                   # độ từ thẩm tương đối lớn nhất của sắt (lưới DEFAULT_N_POINTS điểm)
+    B_at_max: float
+    H_at_max: float
+    magnet_relative_permeance: float
+    magnet_permeance: float           # mu0 * mu_r của nam châm [H/m]
+    air_relative_permeance: float
+
+def is_derived_property_valid(derived_property, material_database):
+    """
+    So sánh trực tiếp đường cong B-H và hằng số vật liệu với bản đã dùng để tính derived_property.
+    """
+    if derived_property is None:
+        return False
+    return (np.array_equal(derived_property.B_table, material_database.iron.B_H_curve["B_data"]) and
+            np.array_equal(derived_property.H_table, material_database.iron.B_H_curve["H_data"]) and
+            derived_property.magnet_relative_permeance == float(material_database.magnet.relative_permeance) and
+            derived_property.air_relative_permeance == float(material_database.air.relative_permeance))
+
+def find_derived_property(material_database):
+    # bản sao riêng: chỉ bản sao được khóa ghi, đường cong của người dùng vẫn sửa được
+    B_table = np.array(material_database.iron.B_H_curve["B_data"], dtype=float, copy=True)
+    H_table = np.array(material_database.iron.B_H_curve["H_data"], dtype=float, copy=True)
+
+    # mu tại B -> 0 (giống Step 4 của lookup_BH_curve)
+    delta_B = 1e-3
+    H_delta = np.interp(delta_B, B_table, H_table)
+    mu_at_zero = float(delta_B / (H_delta + 1e-15))
+
+    maximum = find_maximum_permeance_from_table(B_table=B_table, H_table=H_table, n_points=DEFAULT_N_POINTS)
+    magnet_relative_permeance = float(material_database.magnet.relative_permeance)
+
+    B_table.flags.writeable = False
+    H_table.flags.writeable = False
+    return DerivedProperty(B_table=B_table,
+                           H_table=H_table,
+                           mu_at_zero=mu_at_zero,
+                           mu_r_max=maximum.mu_r_max,
+                           B_at_max=maximum.B_at_max,
+                           H_at_max=maximum.H_at_max,
+                           magnet_relative_permeance=magnet_relative_permeance,
+                           magnet_permeance=MU0 * magnet_relative_permeance,
+                           air_relative_permeance=float(material_database.air.relative_permeance))
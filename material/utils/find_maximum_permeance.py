@@ -3,6 +3,8 @@ from scipy.interpolate import interp1d
 from dataclasses import dataclass
 
 MU0 = 4 * np.pi * 1e-7  # H/m
+# độ phân giải mặc định của lưới quét (giá trị được lưu trong derived_property của MaterialDataBase)
+DEFAULT_N_POINTS = 5000
 
 # --- 1. ĐỊNH NGHĨA DATACLASS ---
 @dataclass
@@ -15,14 +17,30 @@ class MaxPermeanceOutput:
     H_at_max: float    # Giá trị H tại điểm cực đại [A/m]
 
 # --- 2. HÀM ĐÃ SỬA ĐỔI ---
-def find_maximum_permeance(material_database, n_points=5000) -> MaxPermeanceOutput:
+def find_maximum_permeance(material_database, n_points=None) -> MaxPermeanceOutput:
     """
     Tìm độ từ thẩm tương đối cực đại (mu_r) của sắt trong material_database.
     Trả về object MaxPermeanceOutput chứa (mu_max, B_max, H_max).
+    n_points=None: độ phân giải mặc định, kết quả lấy từ bộ nhớ đệm derived_property của
+    MaterialDataBase; n_points khác None luôn được tính lại trên lưới n_points điểm.
     """
-    # Lấy dữ liệu BH từ Iron
-    B_TABLE = material_database.iron.B_H_curve["B_data"]
-    H_TABLE = material_database.iron.B_H_curve["H_data"]
+    if n_points is None and hasattr(material_database, "derived_property"):
+        derived_property = material_database.derived_property
+        return MaxPermeanceOutput(mu_r_max=derived_property.mu_r_max,
+                                  B_at_max=derived_property.B_at_max,
+                                  H_at_max=derived_property.H_at_max)
+
+    maximum = find_maximum_permeance_from_table(B_table=material_database.iron.B_H_curve["B_data"],
+                                                H_table=material_database.iron.B_H_curve["H_data"],
+                                                n_points=DEFAULT_N_POINTS if n_points is None else n_points)
+    return maximum
+
+def find_maximum_permeance_from_table(B_table, H_table, n_points=DEFAULT_N_POINTS) -> MaxPermeanceOutput:
+    """
+    Tìm mu_r cực đại trực tiếp từ bảng B-H.
+    """
+    B_TABLE = np.asarray(B_table, dtype=float)
+    H_TABLE = np.asarray(H_table, dtype=float)
 
     # Nội suy H(B) để có độ mịn cao hơn bảng dữ liệu gốc
     H_interpolator = interp1d(
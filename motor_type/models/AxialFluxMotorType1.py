@@ -172,10 +172,13 @@ class AxialFluxMotorType1:
         
         return self.mesh
     
-    def create_reluctance_network(self):
+    def create_reluctance_network(self, n_jobs = 1, use_cache = True, mixing_rule = "dominant"):
         self.reluctance_network = ReluctanceNetwork(motor = self,
                                                     geometry=self.geometry,
-                                                    mesh = self.mesh)
+                                                    mesh = self.mesh,
+                                                    n_jobs = n_jobs,
+                                                    use_cache = use_cache,
+                                                    mixing_rule = mixing_rule)
         
         return self.reluctance_network
     
@@ -36,6 +36,7 @@ def create_geometry(motor,
     rotor_yoke_template = Segment(mesh= rotor_yoke_mesh,
                                   material = "iron",
                                   magnet_source= 0.0,
+                                  component = "rotor",
                                   )
     if create_rotor_yoke == True:
         geometry.append(rotor_yoke_template)
@@ -68,7 +69,8 @@ def create_geometry(motor,
         magnet_template = Segment(mesh = magnet_mesh,
                                   material= "magnet",
                                   magnet_source= magnet_source,
-                                  magnetization_direction=np.array([0,0,sign]))
+                                  magnetization_direction=np.array([0,0,sign]),
+                                  component="rotor")
         if create_magnet == True:
             geometry.append(magnet_template)
     
@@ -104,7 +106,8 @@ def create_geometry(motor,
     for i in range(int(motor.slot_number)):
         mesh_rotated = rotate_mesh_z(mesh_1, i * 2* pi / motor.slot_number)
         tooth_tip_rotated = Segment(mesh=mesh_rotated,
-                                    material="iron")
+                                    material="iron",
+                                    component="stator")
         if create_tooth == True:
             geometry.append(tooth_tip_rotated)
             
@@ -137,7 +140,7 @@ def create_geometry(motor,
         mesh2_rotated = rotate_mesh_z(mesh = mesh2,
                                       angle_rad= i * 2*pi / motor.slot_number)
         if create_tooth == True:
-            geometry.append(Segment(mesh=mesh2_rotated,material="iron"))
+            geometry.append(Segment(mesh=mesh2_rotated,material="iron",component="stator"))
 
     #create_tooth
     z_offset_4 = z_tooth_tip_2 + motor.slot_depth
@@ -152,7 +155,8 @@ def create_geometry(motor,
         if create_tooth == True:
             geometry.append(Segment(mesh=mesh_3_rotated,
                                     material="iron",
-                                    winding_vector = winding_vector))
+                                    winding_vector = winding_vector,
+                                    component="stator"))
         
     # create stator yoke
     stator_yoke_mesh = create_tube(inner_radius=motor.stator_bore_dia / 2,
@@ -161,5 +165,13 @@ def create_geometry(motor,
                                    z_offset=z_offset_4)
     if create_stator_yoke == True:
         geometry.append(Segment(mesh = stator_yoke_mesh,
-                                material="iron"))
-    return Geometry(geometry=geometry)
+                                material="iron",
+                                component="stator"))
+    options = dict(rotor_angle_offset = rotor_angle_offset,
+                   stator_angle_offset = stator_angle_offset,
+                   create_rotor_yoke = create_rotor_yoke,
+                   create_magnet = create_magnet,
+                   create_tooth = create_tooth,
+                   create_stator_yoke = create_stator_yoke)
+
+    return Geometry(geometry=geometry, options=options)
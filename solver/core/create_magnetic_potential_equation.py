@@ -1,67 +1,101 @@
 from dataclasses import dataclass
 from typing import Any
 import numpy as np
-import scipy.sparse as sp
-from tqdm import tqdm
+from core_class.utils.create_branch_incidence import create_branch_incidence
+from core_class.utils.find_branch_reluctance import find_branch_reluctance
+from solver.utils.create_sparsity_pattern import create_sparsity_pattern
+from solver.utils.find_changed_rows import find_changed_rows
 
 @dataclass
 class Output:
     G: Any
     J: Any
+    row_fraction: float = 1.0   # tỉ lệ số hàng được lắp ráp lại
 
 def create_magnetic_potential_equation(reluctance_network,
                                        use_minimum_reluctance=False,
+                                       incremental=False,
+                                       max_row_fraction=0.1,
                                        debug=True):
+    """
+    Lắp ráp G U = J từ ma trận liên thuộc ô - nhánh A (create_branch_incidence):
+        G = -A diag(1/R) A^T,   J = A diag(1/R) F
+    với R, F là từ trở và sức từ động của nhánh. Ô cuối cùng là nút tham chiếu (U = 0):
+    hàng và cột của nó bị loại.
+
+    Cấu trúc CSR lấy từ reluctance_network.sparsity_pattern (tạo một lần): mỗi lần gọi chỉ ghi đè
+    G.data và J tại chỗ, nên G, J trả về là cùng một bộ đệm giữa các lần gọi.
+
+    R, F được đọc trực tiếp từ reluctance_network.face_field (mỗi mặt lưu một lần).
+
+    incremental: chỉ tính lại các nhánh đã được ghi lại trong face_field.changed_branches kể từ lần
+    lắp ráp trước (update_reluctance_network(tolerance=...) chỉ ghi các mặt có mu thay đổi), và chỉ
+    các hàng ở hai đầu các nhánh đó (find_changed_rows). Lắp ráp lại toàn bộ khi chưa biết các nhánh
+    thay đổi hoặc khi tỉ lệ hàng phải làm lại vượt max_row_fraction (khi đó lắp ráp toàn bộ nhanh hơn).
+    """
     if use_minimum_reluctance:
         reluctance_network.set_minimum_reluctance()
 
     mesh = reluctance_network.mesh
     matrix_size = mesh.total_cells - 1
-    magnetic_potential = reluctance_network.magnetic_potential
-    G = [[], [], []]
-    J = np.zeros(matrix_size)
+    branch_incidence = getattr(reluctance_network, "branch_incidence", None)
+    if branch_incidence is None:
+        branch_incidence = create_branch_incidence(neighbor_table=reluctance_network.neighbor_table)
+    pattern = getattr(reluctance_network, "sparsity_pattern", None)
+    if pattern is None:
+        pattern = create_sparsity_pattern(branch_incidence=branch_incidence, matrix_size=matrix_size)
 
-    iterator = range(matrix_size)
-    if debug:
-        iterator = tqdm(iterator, desc="Processing Elements")
-
-    for i_th in iterator:
-        elements = reluctance_network.elements
-        i, j_coord, k = reluctance_network.magnetic_potential.get_3D_index(position=i_th).three_dimension_index
-        element_center = elements[i, j_coord, k]
-        
-        neighbor_elements = element_center.neighbor_elements()
-        
-        j_val = 0.0
-        U_center_factor = 0.0
+    # từ trở / sức từ động của các mặt (FaceField của mạng, hoặc tính từ ElementField)
+    face_field = getattr(reluctance_network, "face_field", None)
+    if face_field is None:
+        face_field = find_branch_reluctance(element_field=reluctance_network.element_field,
+                                            branch_incidence=branch_incidence)
+    changed_branches = getattr(face_field, "changed_branches", None)
 
-        for m in [0, 1]:
-            if m == 0:
-                sign = [1, 0]
-            else:
-                sign = [0, 1]
-            
-            for n in [0, 1, 2]:
-                if neighbor_elements[m, n] is not None:
-                    element_nei = neighbor_elements[sign[1], n]
-                    
-                    f = element_nei.magnetic_source[sign[0], n] + element_center.magnetic_source[sign[1], n]
-                    r = (element_nei.reluctance[sign[0], n] + element_center.reluctance[sign[1], n])
+    # --- 1. CÁC NHÁNH VÀ HÀNG CẦN LẮP RÁP ---
+    full = (not incremental or not pattern.assembled or changed_branches is None)
+    if not full:
+        changed_rows = find_changed_rows(branches=changed_branches,
+                                         branch_incidence=branch_incidence,
+                                         matrix_size=matrix_size)
+        branches = changed_rows.branches
+        rows = changed_rows.rows
+        full = len(rows) > max_row_fraction * matrix_size
 
-                    j_val = j_val - (f / r)
-                    
-                    if element_nei.flat_position < matrix_size:
-                        G[0].append(i_th)
-                        G[1].append(element_nei.flat_position)
-                        G[2].append(1 / r)
+    # --- 2. TỪ DẪN VÀ NGUỒN CỦA NHÁNH ---
+    # bộ đệm của pattern là bản ghi duy nhất của lần lắp ráp trước (không lưu thêm bản sao R, F)
+    reluctance = face_field.reluctance
+    magnetic_source = face_field.magnetic_source
+    if full:
+        pattern.permeance[:] = 1.0 / reluctance
+        pattern.source[:] = magnetic_source / reluctance
+        pattern.assembled = True
+    else:
+        pattern.permeance[branches] = 1.0 / reluctance[branches]
+        pattern.source[branches] = magnetic_source[branches] / reluctance[branches]
 
-                    U_center_factor = U_center_factor - (1 / r)
+    # --- 3. GHI ĐÈ G.data VÀ J ---
+    G = pattern.G
+    J = pattern.J
+    if full:
+        G.data[:] = pattern.scatter @ pattern.permeance
+        J[:] = pattern.incidence @ pattern.source
+        row_fraction = 1.0
+    else:
+        # vị trí trong G.data của các hàng được lắp ráp lại
+        start, stop = G.indptr[rows], G.indptr[rows + 1]
+        slots = np.repeat(start - np.cumsum(np.concatenate(([0], stop - start)))[:-1], stop - start) + \
+                np.arange(np.sum(stop - start))
+        G.data[slots] = pattern.scatter[slots] @ pattern.permeance
+        J[rows] = pattern.incidence[rows] @ pattern.source
+        row_fraction = len(rows) / max(matrix_size, 1)
 
-        G[0].append(i_th)
-        G[1].append(i_th)
-        G[2].append(U_center_factor)
-        J[i_th] = j_val
+    # G, J đã khớp với face_field: các lần ghi sau được tích lũy lại từ đầu
+    if hasattr(face_field, "changed_branches"):
+        face_field.changed_branches = np.empty(0, dtype=np.int64)
 
-    G = sp.csr_matrix((G[2], (G[0], G[1])), shape=(matrix_size, matrix_size))
+    if debug:
+        print(f"[INFO] Assembled G: {matrix_size} unknowns, {G.nnz} non-zeros, "
+              f"{row_fraction:.1%} rows updated.")
 
-    return Output(G=G, J=J)
\ No newline at end of file
+    return Output(G=G, J=J, row_fraction=row_fraction)
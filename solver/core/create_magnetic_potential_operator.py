@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+from core_class.utils.create_branch_incidence import create_branch_incidence
+from core_class.utils.find_branch_reluctance import find_branch_reluctance
+from solver.utils.find_reduced_incidence import find_reduced_incidence
+
+@dataclass
+class Output:
+    G: Any                  # LinearOperator (matrix_size, matrix_size), đối xứng
+    J: np.ndarray
+    diagonal: np.ndarray    # đường chéo của G (cho tiền điều kiện Jacobi)
+
+def create_magnetic_potential_operator(reluctance_network,
+                                       use_minimum_reluctance=False,
+                                       debug=True):
+    """
+    G U = J dạng không ma trận (matrix-free): G = -A diag(1/R) A^T được áp dụng bằng hai phép nhân
+    với ma trận liên thuộc ô - nhánh A (create_branch_incidence, bỏ hàng nút tham chiếu),
+        G x = -A (P * (A^T x)),   P = 1 / R nhánh
+
+    Bộ nhớ tỉ lệ với số nhánh (2 phần tử A + 1 từ dẫn mỗi nhánh), không có phần fill-in của
+    phân tích LU; dùng với bộ giải lặp (solve_iterative). Cùng quy ước với
+    create_magnetic_potential_equation.
+    """
+    if use_minimum_reluctance:
+        reluctance_network.set_minimum_reluctance()
+
+    mesh = reluctance_network.mesh
+    matrix_size = mesh.total_cells - 1
+    branch_incidence = getattr(reluctance_network, "branch_incidence", None)
+    if branch_incidence is None:
+        branch_incidence = create_branch_incidence(neighbor_table=reluctance_network.neighbor_table)
+
+    # --- 1. TỪ DẪN VÀ NGUỒN CỦA NHÁNH ---
+    branch = getattr(reluctance_network, "face_field", None)
+    if branch is None:
+        branch = find_branch_reluctance(element_field=reluctance_network.element_field,
+                                        branch_incidence=branch_incidence)
+    # A, A^T dạng CSR tạo một lần (find_reduced_incidence), mỗi lần gọi chỉ tính lại từ dẫn
+    reduced = find_reduced_incidence(branch_incidence=branch_incidence, matrix_size=matrix_size)
+    incidence = reduced.incidence
+    incidence_transpose = reduced.incidence_transpose
+    permeance = 1.0 / branch.reluctance
+
+    J = incidence @ (branch.magnetic_source / branch.reluctance)
+    diagonal = -(reduced.absolute_incidence @ permeance)
+
+    # --- 2. TOÁN TỬ ---
+    def matvec(x):
+        return -(incidence @ (permeance * (incidence_transpose @ np.ravel(x))))
+
+    G = LinearOperator(shape=(matrix_size, matrix_size), matvec=matvec, rmatvec=matvec, dtype=float)
+
+    if debug:
+        size = incidence.data.nbytes + incidence.indices.nbytes + incidence.indptr.nbytes
+        print(f"[INFO] Matrix-free G: {matrix_size} unknowns, {len(permeance)} branches, "
+              f"{(3 * size + permeance.nbytes + diagonal.nbytes) / 2**20:.1f} MiB.")
+
+    return Output(G=G, J=J, diagonal=diagonal)
@@ -1,51 +1,169 @@
 import numpy as np
 from scipy.sparse.linalg import spsolve
 from tqdm import tqdm
+from solver.utils.solve_iterative import solve_iterative
+from solver.utils.create_amg_preconditioner import create_amg_preconditioner, is_amg_reusable
+from solver.utils.create_lu_preconditioner import create_lu_preconditioner
+from solver.core.solve_magnetic_equation_newton import solve_magnetic_equation_newton
+
+# direct: spsolve trên G đã lắp ráp; iterative: CG (Jacobi) trên G đã lắp ráp;
+# matrix_free: CG trên toán tử không ma trận (lưới rất lớn, không có fill-in của LU);
+# amg: CG tiền điều kiện đa lưới đại số, hierarchy dùng lại khi G thay đổi nhẹ;
+# lu_reuse: LU của một vòng lặp trước làm tiền điều kiện CG, chỉ phân tích lại khi CG cần nhiều vòng
+LINEAR_SOLVERS = ("direct", "iterative", "matrix_free", "amg", "lu_reuse")
+# picard: lặp điểm bất động có giảm chấn; newton: Newton-Raphson với đạo hàm đường cong B-H
+NONLINEAR_SOLVERS = ("picard", "newton")
+# constant: hệ số giảm chấn cố định damping_factor; aitken: hệ số chọn lại mỗi vòng bằng Aitken delta^2
+RELAXATIONS = ("constant", "aitken")
 
 def solve_magnetic_equation(reluctance_network,
                             max_iteration=20,
                             max_relative_residual=0.01,
                             damping_factor=0.1,
+                            incremental=False,
+                            incremental_tolerance=1e-6,
+                            linear_solver="direct",
+                            amg_rebuild_tolerance=0.1,
+                            lu_refactor_iteration=10,
+                            nonlinear_solver="picard",
+                            relaxation="constant",
+                            damping_range=(0.01, 1.0),
                             debug=True):
-    
+    """
+    Lặp Picard: giải G(U) U = J(U), U <- (1 - w) U + w U_giải, cập nhật từ trở, đến khi thay đổi
+    tương đối của U nhỏ hơn max_relative_residual.
+
+    relaxation="aitken": w khởi đầu bằng damping_factor rồi được chọn lại mỗi vòng từ hai sai số
+    liên tiếp r = U_giải - U (Aitken delta^2):
+        w_i = -w_{i-1} (r_{i-1} . (r_i - r_{i-1})) / ||r_i - r_{i-1}||^2,  kẹp trong damping_range
+    Các hệ số đã dùng được lưu trong reluctance_network.relaxation_history (và in ra khi debug).
+
+    incremental: mỗi vòng chỉ ghi lại mu_r thay đổi quá sai số tương đối incremental_tolerance và
+    chỉ lắp ráp lại các hàng của G bị ảnh hưởng; lần cập nhật cuối cùng (khi hội tụ) là đầy đủ.
+    """
+    if relaxation not in RELAXATIONS:
+        raise ValueError(f"relaxation phải là một trong {RELAXATIONS}, nhận '{relaxation}'")
+    if linear_solver not in LINEAR_SOLVERS:
+        raise ValueError(f"linear_solver phải là một trong {LINEAR_SOLVERS}, nhận '{linear_solver}'")
+    if nonlinear_solver not in NONLINEAR_SOLVERS:
+        raise ValueError(f"nonlinear_solver phải là một trong {NONLINEAR_SOLVERS}, nhận '{nonlinear_solver}'")
+
+    if nonlinear_solver == "newton":
+        return solve_magnetic_equation_newton(reluctance_network=reluctance_network,
+                                              max_iteration=max_iteration,
+                                              max_relative_residual=max_relative_residual,
+                                              linear_solver=linear_solver,
+                                              debug=debug)
+
     current_relative_residual = max_relative_residual + 1.0
     magnetic_potential_shape = reluctance_network.magnetic_potential.data.shape
 
+    amg = None
+    lu = None
+    n_amg_build = 0
+    n_factorization = 0
+    previous_residual = None
+    relaxation_history = []
+
     iterator = range(max_iteration)
     if debug:
         iterator = tqdm(iterator, desc="Solving Magnetic Equation")
 
     for i in iterator:
-        if i == 0:
-            current_damping_factor = 1.0
-            equation_component = reluctance_network.create_magnetic_potential_equation(use_minimum_reluctance=True)
+        use_minimum_reluctance = (i == 0)
+        if linear_solver == "matrix_free":
+            equation_component = reluctance_network.create_magnetic_potential_operator(use_minimum_reluctance=use_minimum_reluctance,
+                                                                                       debug=debug)
         else:
-            current_damping_factor = damping_factor
-            equation_component = reluctance_network.create_magnetic_potential_equation(use_minimum_reluctance=False)
+            equation_component = reluctance_network.create_magnetic_potential_equation(use_minimum_reluctance=use_minimum_reluctance,
+                                                                                       incremental=incremental and i > 0,
+                                                                                       debug=debug)
         
         G = equation_component.G
         J = equation_component.J
 
-        solved_vector = spsolve(G, J)
+        n_linear_iteration = 0
+        if linear_solver == "direct":
+            solved_vector = spsolve(G, J)
+        elif linear_solver == "lu_reuse":
+            linear_solution = None
+            if lu is not None:
+                x0 = np.ravel(reluctance_network.magnetic_potential.data, order='F')[:-1]
+                linear_solution = solve_iterative(G=G, J=J, x0=x0,
+                                                  preconditioner=lu.preconditioner,
+                                                  max_iteration=lu_refactor_iteration)
+                n_linear_iteration = linear_solution.n_iteration
+            if linear_solution is None or not linear_solution.converged:
+                # chưa có LU hoặc LU cũ không còn đủ tốt: phân tích lại và giải trực tiếp
+                lu = create_lu_preconditioner(G)
+                n_factorization += 1
+                solved_vector = lu.factorization.solve(J)
+            else:
+                solved_vector = linear_solution.x
+        else:
+            # khởi đầu từ thế từ hiện tại (bỏ nút tham chiếu)
+            x0 = np.ravel(reluctance_network.magnetic_potential.data, order='F')[:-1]
+            preconditioner = None
+            if linear_solver == "amg":
+                if not is_amg_reusable(amg, G, tolerance=amg_rebuild_tolerance):
+                    amg = create_amg_preconditioner(G)
+                    n_amg_build += 1
+                preconditioner = amg.preconditioner
+            linear_solution = solve_iterative(G=G, J=J, x0=x0,
+                                              diagonal=getattr(equation_component, "diagonal", None),
+                                              preconditioner=preconditioner)
+            if linear_solver == "amg" and not linear_solution.converged:
+                # hierarchy cũ không còn đủ tốt: tạo lại và giải lại
+                amg = create_amg_preconditioner(G)
+                n_amg_build += 1
+                linear_solution = solve_iterative(G=G, J=J, x0=x0, preconditioner=amg.preconditioner)
+            solved_vector = linear_solution.x
+            n_linear_iteration = linear_solution.n_iteration
         solved_vector_with_ref = np.append(solved_vector, 0.0)
         magnetic_potential_solved = solved_vector_with_ref.reshape(magnetic_potential_shape, order='F')
 
         current_magnetic_potential = reluctance_network.magnetic_potential.data
+        residual = np.ravel(magnetic_potential_solved - current_magnetic_potential, order='F')
 
-        delta = np.linalg.norm(magnetic_potential_solved - current_magnetic_potential)
+        delta = np.linalg.norm(residual)
         current_relative_residual = delta / (np.linalg.norm(current_magnetic_potential) + 1e-12)
 
+        # --- HỆ SỐ GIẢM CHẤN (vòng đầu lấy nghiệm với từ trở nhỏ nhất) ---
+        if i == 0:
+            current_damping_factor = 1.0
+        elif relaxation == "aitken" and previous_residual is not None:
+            residual_change = residual - previous_residual
+            denominator = residual_change @ residual_change
+            if denominator > 0.0:
+                current_damping_factor = float(np.clip(-current_damping_factor * (previous_residual @ residual_change) / denominator,
+                                                       damping_range[0], damping_range[1]))
+        else:
+            current_damping_factor = damping_factor
+        if i > 0:
+            previous_residual = residual
+
         if debug:
-            iterator.set_postfix(residual=f"{current_relative_residual:.6e}")
+            iterator.set_postfix(residual=f"{current_relative_residual:.6e}",
+                                 damping=f"{current_damping_factor:.3g}",
+                                 rows=f"{getattr(equation_component, 'row_fraction', 1.0):.1%}",
+                                 linear_iteration=n_linear_iteration,
+                                 amg_build=n_amg_build,
+                                 factorization=n_factorization)
 
         if i > 0 and current_relative_residual < max_relative_residual:
             reluctance_network.magnetic_potential.data = magnetic_potential_solved
             reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
             break
 
+        relaxation_history.append(current_damping_factor)
         next_magnetic_potential = current_magnetic_potential * (1 - current_damping_factor) + magnetic_potential_solved * current_damping_factor
         
         reluctance_network.magnetic_potential.data = next_magnetic_potential
-        reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
-            
+        reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential,
+                                                     tolerance=incremental_tolerance if incremental else None)
+
+    reluctance_network.relaxation_history = relaxation_history
+    if debug and relaxation == "aitken":
+        print(f"[INFO] Relaxation factors: {', '.join(f'{w:.3g}' for w in relaxation_history)}")
+
     return reluctance_network
\ No newline at end of file
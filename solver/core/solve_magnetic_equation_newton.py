@@ -0,0 +1,124 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+from tqdm import tqdm
+from core_class.utils.find_relative_permeability import find_relative_permeability
+from core_class.utils.find_differential_reluctance import find_differential_reluctance
+from solver.utils.solve_iterative import solve_iterative
+from solver.utils.create_amg_preconditioner import create_amg_preconditioner
+
+# bộ giải tuyến tính cho mỗi bước Newton (ma trận Jacobi đổi sau mỗi bước nên không dùng lại LU / AMG)
+NEWTON_LINEAR_SOLVERS = ("direct", "iterative", "amg")
+
+def solve_magnetic_equation_newton(reluctance_network,
+                                   max_iteration=20,
+                                   max_relative_residual=0.01,
+                                   linear_solver="direct",
+                                   max_line_search=8,
+                                   sufficient_decrease=1e-4,
+                                   debug=True):
+    """
+    Newton-Raphson cho mạng từ trở phi tuyến. Ẩn là thế từ U (bỏ nút tham chiếu) và từ thông
+    nhánh Phi (E,), hai nhóm phương trình:
+        Kirchhoff:  A Phi = 0
+        nhánh:      s = R(Phi) Phi - (A^T U + F) = 0
+    Tuyến tính hóa phương trình nhánh bằng từ trở vi phân R_d (find_differential_reluctance,
+    từ dmu_r_dB của lookup_BH_curve), D = 1 / R_d, rồi khử dPhi = D (A^T dU - s):
+        -A D A^T dU = A (Phi - D s)
+    -A D A^T có cùng cấu trúc CSR với G (sparsity_pattern). Bước được tìm kiếm theo đường
+    (chia đôi, tối đa max_line_search lần thử, điều kiện Armijo với hệ số sufficient_decrease) trên
+    ||A Phi||^2 + ||D s||^2 (cùng đơn vị từ thông). Bước đã dùng ở mỗi vòng được lưu trong
+    reluctance_network.line_search_history (0 nếu không lần thử nào đạt; khi đó mạng giữ bước
+    nhỏ nhất đã thử và vòng đó không được tính là hội tụ).
+
+    Khởi đầu giống vòng đầu của Picard: giải G U = J với từ trở nhỏ nhất.
+    Dừng khi bước Newton đầy đủ ||dU|| / ||U|| nhỏ hơn max_relative_residual.
+    """
+    if linear_solver not in NEWTON_LINEAR_SOLVERS:
+        raise ValueError(f"linear_solver của Newton phải là một trong {NEWTON_LINEAR_SOLVERS}, nhận '{linear_solver}'")
+    if max_line_search < 1:
+        raise ValueError(f"max_line_search phải >= 1, nhận {max_line_search}")
+
+    magnetic_potential = reluctance_network.magnetic_potential
+    magnetic_potential_shape = magnetic_potential.data.shape
+    element_field = reluctance_network.element_field
+    face_field = reluctance_network.face_field
+    branch_incidence = reluctance_network.branch_incidence
+    pattern = reluctance_network.sparsity_pattern
+    incidence = pattern.incidence                       # (matrix_size, E)
+    incidence_full = branch_incidence.incidence         # (N, E), gồm nút tham chiếu (U = 0)
+    low, high, direction = branch_incidence.low, branch_incidence.high, branch_incidence.direction
+
+    def set_state(potential, flux):
+        magnetic_potential.data = np.append(potential, 0.0).reshape(magnetic_potential_shape, order='F')
+        reluctance_network.update_reluctance_network(magnetic_potential=magnetic_potential, face_flux=flux)
+
+    def find_residual(potential, flux, D):
+        branch = face_field.reluctance * flux - (incidence_full.T @ np.append(potential, 0.0) + face_field.magnetic_source)
+        kirchhoff = incidence @ flux
+        return branch, kirchhoff, kirchhoff @ kirchhoff + (D * branch) @ (D * branch)
+
+    # --- 1. KHỞI ĐẦU: TỪ TRỞ NHỎ NHẤT ---
+    equation_component = reluctance_network.create_magnetic_potential_equation(use_minimum_reluctance=True,
+                                                                               debug=debug)
+    potential = solve_linear(equation_component.G, equation_component.J, linear_solver)
+    flux = (incidence_full.T @ np.append(potential, 0.0) + face_field.magnetic_source) / face_field.reluctance
+    set_state(potential, flux)
+
+    line_search_history = []
+    iterator = range(max_iteration)
+    if debug:
+        iterator = tqdm(iterator, desc="Solving Magnetic Equation (Newton)")
+
+    for i in iterator:
+        # --- 2. TỪ TRỞ VI PHÂN CỦA NHÁNH VÀ SAI SỐ ---
+        derivative = find_relative_permeability(element_field=element_field,
+                                                return_derivative=True).relative_permeability_derivative
+        half = element_field.flat(find_differential_reluctance(element_field=element_field,
+                                                               relative_permeability_derivative=derivative).differential_reluctance)
+        D = 1.0 / (half[low, 1, direction] + half[high, 0, direction])
+        branch, kirchhoff, merit = find_residual(potential, flux, D)
+
+        # --- 3. BƯỚC NEWTON ---
+        G = pattern.G
+        jacobian = sp.csr_matrix((pattern.scatter @ D, G.indices, G.indptr), shape=G.shape)
+        delta_potential = solve_linear(jacobian, incidence @ (flux - D * branch), linear_solver)
+        delta_flux = D * (incidence_full.T @ np.append(delta_potential, 0.0) - branch)
+
+        # --- 4. TÌM KIẾM THEO ĐƯỜNG ---
+        # mỗi lần thử đặt trạng thái của mạng; nếu không lần nào đạt, bước nhỏ nhất đã thử được giữ
+        # nên trạng thái của mạng luôn khớp với (potential, flux)
+        step = 1.0
+        accepted = False
+        for trial in range(max_line_search):
+            if trial > 0:
+                step *= 0.5
+            set_state(potential + step * delta_potential, flux + step * delta_flux)
+            trial_merit = find_residual(potential + step * delta_potential, flux + step * delta_flux, D)[2]
+            if trial_merit <= (1.0 - sufficient_decrease * step) * merit:
+                accepted = True
+                break
+
+        potential = potential + step * delta_potential
+        flux = flux + step * delta_flux
+        line_search_history.append(step if accepted else 0.0)
+        # hội tụ theo bước Newton đầy đủ (không theo bước đã rút ngắn) và chỉ khi tìm kiếm đạt
+        current_relative_residual = np.linalg.norm(delta_potential) / (np.linalg.norm(potential) + 1e-12)
+
+        if debug:
+            iterator.set_postfix(residual=f"{current_relative_residual:.6e}",
+                                 step=f"{step:.3g}" if accepted else "failed",
+                                 kirchhoff=f"{np.linalg.norm(incidence @ flux):.3e}")
+
+        if accepted and current_relative_residual < max_relative_residual:
+            break
+
+    reluctance_network.line_search_history = line_search_history
+    return reluctance_network
+
+
+def solve_linear(G, J, linear_solver):
+    if linear_solver == "direct":
+        return spsolve(G, J)
+    preconditioner = create_amg_preconditioner(G).preconditioner if linear_solver == "amg" else None
+    return solve_iterative(G=G, J=J, preconditioner=preconditioner).x
@@ -0,0 +1,63 @@
+import sys
+import os
+
+def test():
+    import types
+    import numpy as np
+    from material.models.MaterialDataBase import MaterialDataBase
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.models.ReluctanceNetwork import ReluctanceNetwork
+    from solver.core.solve_magnetic_equation import solve_magnetic_equation
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    def create_network():
+        # hai gông sắt mỏng kẹp hai nam châm ngược chiều (sắt hoạt động ở vùng phi tuyến)
+        top_yoke = create_tube(inner_radius=0.02, outer_radius=0.06, height=0.002)
+        top_yoke.apply_translation([0.0, 0.0, 0.005])
+        segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.002), material="iron"),
+                    Segment(mesh=top_yoke, material="iron")]
+        for i in range(2):
+            magnet = create_cylindrical_shell_segment(inner_radius=0.025, outer_radius=0.055, height=0.002,
+                                                      angle_rad=np.pi / 3, center_angle_rad=i * np.pi,
+                                                      z_offset=0.002)
+            segments.append(Segment(mesh=magnet, material="magnet", magnet_source=852000.0 * 0.001,
+                                    magnetization_direction=np.array([0.0, 0.0, 1.0 - 2.0 * i])))
+        mesh = CylindricalMesh(r_nodes=np.linspace(0.015, 0.065, 6),
+                               theta_nodes=np.linspace(0, 2 * np.pi, 13),
+                               z_nodes=np.linspace(-0.001, 0.008, 10))
+        return ReluctanceNetwork(motor=types.SimpleNamespace(material_database=MaterialDataBase()),
+                                 geometry=Geometry(geometry=segments), mesh=mesh, use_cache=False)
+
+    damping_factor = 0.1
+    damping_range = (0.01, 1.0)
+    result = {}
+    for relaxation in ["constant", "aitken"]:
+        reluctance_network = create_network()
+        solve_magnetic_equation(reluctance_network, max_iteration=100, max_relative_residual=1e-4,
+                                damping_factor=damping_factor, relaxation=relaxation,
+                                damping_range=damping_range, debug=False)
+        result[relaxation] = (reluctance_network.relaxation_history,
+                              reluctance_network.magnetic_potential.data.copy())
+
+    constant_history, constant_potential = result["constant"]
+    history, potential = result["aitken"]
+
+    # vòng đầu lấy nghiệm từ trở nhỏ nhất, vòng hai dùng damping_factor, sau đó Aitken (kẹp trong damping_range)
+    assert history[:2] == [1.0, damping_factor]
+    assert np.isclose(history[2], damping_range[0])
+    assert all(damping_range[0] <= factor <= damping_range[1] for factor in history)
+    assert len(history) < 100 and len(history) <= len(constant_history)
+    assert np.allclose(potential, constant_potential, rtol=0, atol=1e-3 * np.max(np.abs(constant_potential)))
+    print(f"iterations: constant {len(constant_history)}, aitken {len(history)}")
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
@@ -0,0 +1,67 @@
+import sys
+import os
+
+def test():
+    import types
+    import numpy as np
+    from material.models.MaterialDataBase import MaterialDataBase
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.models.ReluctanceNetwork import ReluctanceNetwork
+    from solver.core.solve_magnetic_equation import solve_magnetic_equation
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    def create_network():
+        # gông sắt mỏng dưới hai nam châm ngược chiều, phần lớn lưới là không khí
+        segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.002), material="iron")]
+        for i in range(2):
+            magnet = create_cylindrical_shell_segment(inner_radius=0.025, outer_radius=0.055, height=0.002,
+                                                      angle_rad=np.pi / 3, center_angle_rad=i * np.pi,
+                                                      z_offset=0.002)
+            segments.append(Segment(mesh=magnet, material="magnet", magnet_source=852000.0 * 0.002,
+                                    magnetization_direction=np.array([0.0, 0.0, 1.0 - 2.0 * i])))
+        mesh = CylindricalMesh(r_nodes=np.linspace(0.015, 0.065, 6),
+                               theta_nodes=np.linspace(0, 2 * np.pi, 13),
+                               z_nodes=np.linspace(-0.001, 0.008, 10))
+        return ReluctanceNetwork(motor=types.SimpleNamespace(material_database=MaterialDataBase()),
+                                 geometry=Geometry(geometry=segments), mesh=mesh, use_cache=False)
+
+    result = {}
+    for incremental in [False, True]:
+        reluctance_network = create_network()
+        solve_magnetic_equation(reluctance_network, max_iteration=100, max_relative_residual=1e-4,
+                                damping_factor=0.1, incremental=incremental, debug=False)
+        result[incremental] = reluctance_network
+    potential = result[True].magnetic_potential.data
+    reference = result[False].magnetic_potential.data
+    assert np.allclose(potential, reference, rtol=0, atol=1e-4 * np.max(np.abs(reference)))
+
+    # một bước Picard nữa: chỉ các mặt có sắt được ghi lại, lắp ráp từng phần = lắp ráp toàn bộ
+    reluctance_network = result[True]
+    face_field = reluctance_network.face_field
+    reluctance_network.create_magnetic_potential_equation(debug=False)
+    magnetic_potential = reluctance_network.magnetic_potential
+    magnetic_potential.data = 0.5 * magnetic_potential.data
+    reluctance_network.update_reluctance_network(magnetic_potential=magnetic_potential, tolerance=1e-6)
+    changed_branches = face_field.changed_branches.copy()
+    assert 0 < len(changed_branches) < face_field.size
+
+    partial = reluctance_network.create_magnetic_potential_equation(incremental=True, max_row_fraction=1.0,
+                                                                    debug=False)
+    G_partial, J_partial = partial.G.toarray(), partial.J.copy()
+    reluctance_network.update_face_field()
+    full = reluctance_network.create_magnetic_potential_equation(debug=False)
+    assert np.array_equal(G_partial, full.G.toarray()) and np.array_equal(J_partial, full.J)
+    assert partial.row_fraction < 1.0
+    print(f"changed branches {len(changed_branches)} / {face_field.size}, rows {partial.row_fraction:.1%}")
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
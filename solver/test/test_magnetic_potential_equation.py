@@ -0,0 +1,107 @@
+import sys
+import os
+
+def test():
+    import types
+    import numpy as np
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.ElementField import ElementField
+    from core_class.models.MagneticPotential import MagneticPotential
+    from core_class.utils.create_neighbor_table import create_neighbor_table
+    from core_class.utils.create_branch_incidence import create_branch_incidence
+    from core_class.models.FaceField import FaceField
+    from core_class.utils.update_face_field import update_face_field
+    from core_class.utils.find_flux_direct import find_flux_direct
+    from scipy.sparse.linalg import spsolve
+    from solver.core.create_magnetic_potential_equation import create_magnetic_potential_equation
+    from solver.utils.create_sparsity_pattern import create_sparsity_pattern
+
+    rng = np.random.default_rng(0)
+    # n_theta = 2 tuần hoàn: hai nhánh theta nối cùng một ô (phần tử trùng)
+    for periodic_boundary, n_theta in [(True, 2), (True, 4), (False, 4)]:
+        mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.05, 4),
+                               theta_nodes=np.linspace(0, np.pi / 3, n_theta + 1),
+                               z_nodes=np.linspace(0, 0.01, 4),
+                               periodic_boundary=periodic_boundary)
+        shape = (mesh.n_cells_r, mesh.n_cells_t, mesh.n_cells_z)
+        element_field = ElementField(shape=shape)
+        element_field.vacuum_reluctance[...] = rng.uniform(1e5, 1e6, shape + (2, 3))
+        element_field.magnet_source[...] = rng.uniform(-10, 10, shape + (2, 3))
+        neighbor_table = create_neighbor_table(shape=shape, periodic_boundary=periodic_boundary).neighbor_table
+        branch_incidence = create_branch_incidence(neighbor_table=neighbor_table)
+        pattern = create_sparsity_pattern(branch_incidence=branch_incidence, matrix_size=mesh.total_cells - 1)
+        reluctance_network = types.SimpleNamespace(mesh=mesh, element_field=element_field,
+                                                   neighbor_table=neighbor_table,
+                                                   branch_incidence=branch_incidence,
+                                                   sparsity_pattern=pattern)
+
+        # lần đầu lấp cấu trúc, lần sau ghi đè tại chỗ với từ trở mới
+        create_magnetic_potential_equation(reluctance_network, debug=False)
+        element_field.vacuum_reluctance[...] = rng.uniform(1e5, 1e6, shape + (2, 3))
+        equation = create_magnetic_potential_equation(reluctance_network, debug=False)
+        assert equation.G is pattern.G and equation.G.has_canonical_format
+
+        # so sánh với lắp ráp từng ô (ô cuối là nút tham chiếu)
+        size = mesh.total_cells - 1
+        R = element_field.flat(element_field.reluctance)
+        F = element_field.flat(element_field.magnetic_source)
+        G = np.zeros((size, size))
+        J = np.zeros(size)
+        for i in range(size):
+            for m in [0, 1]:
+                for n in [0, 1, 2]:
+                    neighbor = neighbor_table[m * 3 + n, i]
+                    if neighbor < 0:
+                        continue
+                    r = R[neighbor, 1 - m, n] + R[i, m, n]
+                    # từ thông nhánh theo chiều dương trục: nhánh trên đi ra, nhánh dưới đi vào ô
+                    J[i] += (1 if m == 1 else -1) * (F[neighbor, 1 - m, n] + F[i, m, n]) / r
+                    G[i, i] -= 1 / r
+                    if neighbor < size:
+                        G[i, neighbor] += 1 / r
+
+        assert np.allclose(equation.G.toarray(), G, rtol=1e-12, atol=0)
+        assert np.allclose(equation.J, J, rtol=1e-12, atol=1e-12 * np.max(np.abs(J)))
+
+        # nghiệm thỏa định luật Kirchhoff: tổng từ thông ra khỏi mỗi ô (trừ nút tham chiếu) bằng 0
+        potential = np.append(spsolve(equation.G, equation.J), 0.0).reshape(shape, order='F')
+        flux_direct = find_flux_direct(element_field=element_field,
+                                       magnetic_potential=MagneticPotential(data=potential,
+                                                                            periodic_boundary=periodic_boundary),
+                                       branch_incidence=branch_incidence).flux_direct
+        flux_out = element_field.flat(np.sum(flux_direct[..., 1, :] - flux_direct[..., 0, :], axis=-1)[..., None, None])
+        assert np.allclose(flux_out[:size], 0.0, atol=1e-9 * np.max(np.abs(flux_direct)))
+
+        # lắp ráp từng phần sau khi đổi từ trở của một ô = lắp ráp lại toàn bộ
+        reluctance_network.face_field = FaceField(shape=shape, periodic_boundary=periodic_boundary)
+        update_face_field(reluctance_network)
+        create_magnetic_potential_equation(reluctance_network, incremental=True, debug=False)
+        assert len(reluctance_network.face_field.changed_branches) == 0
+
+        element_field.relative_permeability[1, 0, 1, 1, 2] /= 3.0
+        cell = np.ravel_multi_index((1, 0, 1), shape, order='F')
+        branches = reluctance_network.face_field.half_branch(cell=np.array([cell]), half=np.array([1]),
+                                                             direction=np.array([2]))
+        update_face_field(reluctance_network, branches=branches)
+        partial = create_magnetic_potential_equation(reluctance_network, incremental=True,
+                                                     max_row_fraction=1.0, debug=False)
+        G_partial, J_partial = partial.G.toarray(), partial.J.copy()
+        pattern.assembled = False
+        full = create_magnetic_potential_equation(reluctance_network, debug=False)
+        assert np.array_equal(G_partial, full.G.toarray()) and np.array_equal(J_partial, full.J)
+        # một nhánh: chỉ hai hàng ở hai đầu được lắp ráp lại
+        assert partial.row_fraction == 2 / (mesh.total_cells - 1)
+
+        # quá max_row_fraction: lắp ráp lại toàn bộ
+        update_face_field(reluctance_network, branches=np.arange(reluctance_network.face_field.size))
+        fallback = create_magnetic_potential_equation(reluctance_network, incremental=True, debug=False)
+        assert fallback.row_fraction == 1.0
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
@@ -0,0 +1,87 @@
+import sys
+import os
+
+def test():
+    import types
+    import numpy as np
+    from scipy.sparse.linalg import spsolve
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.ElementField import ElementField
+    from core_class.utils.create_neighbor_table import create_neighbor_table
+    from core_class.utils.create_branch_incidence import create_branch_incidence
+    from solver.core.create_magnetic_potential_equation import create_magnetic_potential_equation
+    from solver.core.create_magnetic_potential_operator import create_magnetic_potential_operator
+    from solver.utils.solve_iterative import solve_iterative
+    from solver.utils.create_amg_preconditioner import create_amg_preconditioner, is_amg_reusable
+    from solver.utils.create_lu_preconditioner import create_lu_preconditioner
+
+    rng = np.random.default_rng(0)
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.02, 0.05, 6),
+                           theta_nodes=np.linspace(0, np.pi / 3, 7),
+                           z_nodes=np.linspace(0, 0.01, 5),
+                           periodic_boundary=True)
+    shape = (mesh.n_cells_r, mesh.n_cells_t, mesh.n_cells_z)
+    element_field = ElementField(shape=shape)
+    element_field.vacuum_reluctance[...] = rng.uniform(1e5, 1e7, shape + (2, 3))
+    element_field.magnet_source[...] = rng.uniform(-10, 10, shape + (2, 3))
+    neighbor_table = create_neighbor_table(shape=shape, periodic_boundary=True).neighbor_table
+    reluctance_network = types.SimpleNamespace(mesh=mesh, element_field=element_field,
+                                               neighbor_table=neighbor_table)
+
+    equation = create_magnetic_potential_equation(reluctance_network, debug=False)
+    operator = create_magnetic_potential_operator(reluctance_network, debug=False)
+
+    # toán tử không ma trận = G đã lắp ráp
+    x = rng.standard_normal(equation.G.shape[0])
+    assert np.allclose(operator.G.matvec(x), equation.G @ x, rtol=1e-12, atol=0)
+    assert np.array_equal(operator.J, equation.J)
+    assert np.array_equal(operator.diagonal, equation.G.diagonal())
+
+    # A, A^T dạng CSR được giữ trên branch_incidence và dùng lại ở lần gọi sau
+    reluctance_network.branch_incidence = create_branch_incidence(neighbor_table=neighbor_table)
+    create_magnetic_potential_operator(reluctance_network, debug=False)
+    reduced = reluctance_network.branch_incidence.reduced
+    element_field.vacuum_reluctance[...] = rng.uniform(1e5, 1e7, shape + (2, 3))
+    again = create_magnetic_potential_operator(reluctance_network, debug=False)
+    assert reluctance_network.branch_incidence.reduced is reduced
+    assert np.allclose(again.G.matvec(x), create_magnetic_potential_equation(reluctance_network, debug=False).G @ x,
+                       rtol=1e-12, atol=0)
+
+    # CG (Jacobi) trên toán tử cho cùng nghiệm với spsolve
+    direct = spsolve(equation.G, equation.J)
+    iterative = solve_iterative(G=operator.G, J=operator.J, diagonal=operator.diagonal, rtol=1e-10)
+    assert iterative.converged
+    assert np.allclose(iterative.x, direct, rtol=1e-6, atol=1e-8 * np.max(np.abs(direct)))
+
+    # CG tiền điều kiện AMG, khởi đầu từ nghiệm gần đúng
+    amg = create_amg_preconditioner(equation.G)
+    warm = solve_iterative(G=equation.G, J=equation.J, x0=direct * 1.01,
+                           preconditioner=amg.preconditioner, rtol=1e-10)
+    assert warm.converged and warm.n_iteration < iterative.n_iteration
+    assert np.allclose(warm.x, direct, rtol=1e-6, atol=1e-8 * np.max(np.abs(direct)))
+
+    # LU của G cũ: giải trực tiếp, và làm tiền điều kiện cho G thay đổi nhẹ (ít vòng CG)
+    lu = create_lu_preconditioner(equation.G)
+    assert np.allclose(lu.factorization.solve(equation.J), direct, rtol=1e-10, atol=0)
+    perturbed = equation.G.copy()
+    perturbed.data *= rng.uniform(0.98, 1.02, perturbed.nnz)
+    perturbed = (perturbed + perturbed.T) / 2
+    reused = solve_iterative(G=perturbed, J=equation.J, preconditioner=lu.preconditioner, rtol=1e-10)
+    assert reused.converged and reused.n_iteration <= 10
+    assert np.allclose(reused.x, spsolve(perturbed.tocsc(), equation.J), rtol=1e-6, atol=1e-8 * np.max(np.abs(direct)))
+
+    # hierarchy dùng lại khi G thay đổi nhẹ, tạo lại khi thay đổi lớn
+    assert is_amg_reusable(amg, equation.G)
+    equation.G.data *= 1.01
+    assert is_amg_reusable(amg, equation.G, tolerance=0.1)
+    equation.G.data *= 2.0
+    assert not is_amg_reusable(amg, equation.G, tolerance=0.1)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
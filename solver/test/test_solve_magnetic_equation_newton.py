@@ -0,0 +1,77 @@
+import sys
+import os
+
+def test():
+    import types
+    import numpy as np
+    from material.models.MaterialDataBase import MaterialDataBase
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.models.Segment import Segment
+    from core_class.models.Geometry import Geometry
+    from core_class.models.ElementField import MATERIAL_ID
+    from core_class.models.ReluctanceNetwork import ReluctanceNetwork
+    from solver.core.solve_magnetic_equation_newton import solve_magnetic_equation_newton
+    from motor_type.utils.for_create_geometry.create_tube import create_tube
+    from motor_type.utils.for_create_geometry.create_cylindrical_shell_segment import create_cylindrical_shell_segment
+
+    def create_network():
+        # hai gông sắt mỏng kẹp hai nam châm ngược chiều: sắt bão hòa, Picard giảm chấn 0.1 dao động
+        top_yoke = create_tube(inner_radius=0.02, outer_radius=0.06, height=0.002)
+        top_yoke.apply_translation([0.0, 0.0, 0.005])
+        segments = [Segment(mesh=create_tube(inner_radius=0.02, outer_radius=0.06, height=0.002), material="iron"),
+                    Segment(mesh=top_yoke, material="iron")]
+        for i in range(2):
+            magnet = create_cylindrical_shell_segment(inner_radius=0.025, outer_radius=0.055, height=0.002,
+                                                      angle_rad=np.pi / 3, center_angle_rad=i * np.pi,
+                                                      z_offset=0.002)
+            segments.append(Segment(mesh=magnet, material="magnet", magnet_source=852000.0 * 0.002,
+                                    magnetization_direction=np.array([0.0, 0.0, 1.0 - 2.0 * i])))
+        mesh = CylindricalMesh(r_nodes=np.linspace(0.015, 0.065, 6),
+                               theta_nodes=np.linspace(0, 2 * np.pi, 13),
+                               z_nodes=np.linspace(-0.001, 0.008, 10))
+        return ReluctanceNetwork(motor=types.SimpleNamespace(material_database=MaterialDataBase()),
+                                 geometry=Geometry(geometry=segments), mesh=mesh, use_cache=False)
+
+    def find_face_flux(reluctance_network):
+        branch_incidence = reluctance_network.branch_incidence
+        flux_direct = reluctance_network.element_field.flat(reluctance_network.element_field.flux_direct)
+        return flux_direct[branch_incidence.low, 1, branch_incidence.direction]
+
+    # --- HỘI TỤ ---
+    reluctance_network = create_network()
+    solve_magnetic_equation_newton(reluctance_network, max_iteration=20, max_relative_residual=1e-8, debug=False)
+    assert len(reluctance_network.line_search_history) <= 8
+
+    element_field = reluctance_network.element_field
+    iron = element_field.material_id == MATERIAL_ID["iron"]
+    mu_r_max = element_field.material_database.derived_property.mu_r_max
+    assert np.min(element_field.relative_permeability[iron]) < 0.5 * mu_r_max
+
+    # Kirchhoff tại mọi ô (trừ nút tham chiếu) và phương trình nhánh Phi = (A^T U + F) / R
+    flux = find_face_flux(reluctance_network)
+    face_field = reluctance_network.face_field
+    incidence = reluctance_network.branch_incidence.incidence
+    potential = np.ravel(reluctance_network.magnetic_potential.data, order='F')
+    assert np.linalg.norm((incidence @ flux)[:-1]) < 1e-10 * np.linalg.norm(flux)
+    assert np.allclose(flux, (incidence.T @ potential + face_field.magnetic_source) / face_field.reluctance,
+                       rtol=1e-6, atol=1e-6 * np.max(np.abs(flux)))
+
+    # --- TÌM KIẾM THEO ĐƯỜNG LUÔN THẤT BẠI ---
+    reluctance_network = create_network()
+    solve_magnetic_equation_newton(reluctance_network, max_iteration=3, max_line_search=3,
+                                   sufficient_decrease=1e6, debug=False)
+    # không được báo hội tụ, và trạng thái của mạng là trạng thái của bước đã dùng
+    assert reluctance_network.line_search_history == [0.0, 0.0, 0.0]
+    reluctance = reluctance_network.face_field.reluctance.copy()
+    reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential,
+                                                 face_flux=find_face_flux(reluctance_network))
+    assert np.allclose(reluctance_network.face_field.reluctance, reluctance, rtol=1e-12)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+    
+    test()
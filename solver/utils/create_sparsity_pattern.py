@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+import scipy.sparse as sp
+
+@dataclass
+class Output:
+    G: Any                      # csr_matrix với cấu trúc cố định, G.data được ghi đè mỗi lần lắp ráp
+    J: np.ndarray               # (matrix_size,) bộ đệm vế phải
+    scatter: Any                # csr (nnz, E): G.data = scatter @ (1 / R nhánh)
+    incidence: Any              # csr (matrix_size, E): A bỏ hàng nút tham chiếu, J = incidence @ (F / R)
+    permeance: np.ndarray       # (E,) 1 / R của nhánh ứng với G.data hiện tại
+    source: np.ndarray          # (E,) F / R của nhánh ứng với J hiện tại (lắp ráp từng phần so sánh với hai mảng này)
+    assembled: bool = False     # G, J đã được lắp ráp đầy đủ ít nhất một lần
+
+def create_sparsity_pattern(branch_incidence, matrix_size):
+    """
+    Cấu trúc CSR của G = -A diag(1/R) A^T (bỏ nút tham chiếu) và ma trận phân bổ
+    từ dẫn nhánh -> G.data, tạo một lần.
+
+    Kết nối giữa các ô không đổi qua các vòng lặp phi tuyến, chỉ từ trở thay đổi, nên mỗi lần
+    lắp ráp chỉ cần G.data = scatter @ (1/R) và J = A (F/R) (create_magnetic_potential_equation),
+    không dựng lại COO -> CSR. Mỗi nhánh (a, b) đóng góp -1/R vào (a, a), (b, b) và +1/R vào
+    (a, b), (b, a); hàng / cột của nút tham chiếu bị loại. Mọi hàng đều có phần tử đường chéo.
+    """
+    low, high = branch_incidence.low, branch_incidence.high
+    branch = np.arange(len(low))
+
+    # --- 1. ĐÓNG GÓP (hàng, cột, nhánh, hệ số) CỦA MỖI NHÁNH ---
+    row = np.concatenate((low, high, low, high))
+    col = np.concatenate((low, high, high, low))
+    contribution = np.tile(branch, 4)
+    sign = np.repeat([-1.0, -1.0, 1.0, 1.0], len(low))
+    keep = (row < matrix_size) & (col < matrix_size)
+    row, col, contribution, sign = row[keep], col[keep], contribution[keep], sign[keep]
+
+    # --- 2. CẤU TRÚC CSR (khóa hàng * size + cột, sắp tăng = thứ tự CSR chuẩn) ---
+    diagonal_key = np.arange(matrix_size, dtype=np.int64) * (matrix_size + 1)
+    key = row.astype(np.int64) * matrix_size + col
+    unique_key, inverse = np.unique(np.concatenate((diagonal_key, key)), return_inverse=True)
+    slot = inverse.ravel()[matrix_size:]
+    indices = (unique_key % matrix_size).astype(np.int32)
+    indptr = np.zeros(matrix_size + 1, dtype=np.int32)
+    np.cumsum(np.bincount(unique_key // matrix_size, minlength=matrix_size), out=indptr[1:])
+
+    scatter = sp.csr_matrix((sign, (slot, contribution)), shape=(len(unique_key), len(low)))
+    G = sp.csr_matrix((np.zeros(len(unique_key)), indices, indptr),
+                      shape=(matrix_size, matrix_size), copy=False)
+
+    return Output(G=G,
+                  J=np.zeros(matrix_size),
+                  scatter=scatter,
+                  incidence=branch_incidence.incidence[:matrix_size].tocsr(),
+                  permeance=np.zeros(len(low)),
+                  source=np.zeros(len(low)))
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    branches: np.ndarray    # các nhánh có từ trở / sức từ động thay đổi (phải tính lại từ dẫn)
+    rows: np.ndarray        # các hàng của G, J phải lắp ráp lại (hai đầu các nhánh, trừ nút tham chiếu)
+
+def find_changed_rows(branches, branch_incidence, matrix_size):
+    """
+    Các hàng bị ảnh hưởng (hai đầu) bởi các nhánh đã thay đổi kể từ lần lắp ráp trước
+    (FaceField.changed_branches, do update_face_field ghi lại). Chỉ duyệt các nhánh này,
+    không so sánh toàn bộ mảng nhánh. branches có thể trùng lặp.
+    """
+    # đánh dấu hai đầu trên mảng bool (nhanh hơn np.unique), phần tử cuối là nút tham chiếu
+    changed = np.zeros(matrix_size + 1, dtype=bool)
+    changed[branch_incidence.low[branches]] = True
+    changed[branch_incidence.high[branches]] = True
+    rows = np.flatnonzero(changed[:matrix_size])
+    return Output(branches=branches, rows=rows)
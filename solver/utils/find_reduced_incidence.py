@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Any
+
+@dataclass
+class Output:
+    incidence: Any              # csr (matrix_size, E): A bỏ hàng nút tham chiếu
+    incidence_transpose: Any    # csr (E, matrix_size): A^T
+    absolute_incidence: Any     # csr (matrix_size, E): |A| (đường chéo của G = -|A| (1/R))
+
+def find_reduced_incidence(branch_incidence, matrix_size):
+    """
+    A bỏ hàng nút tham chiếu, A^T và |A| dạng CSR cho toán tử không ma trận.
+    Kết nối không đổi giữa các vòng lặp nên kết quả được tạo một lần và giữ trên branch_incidence
+    (branch_incidence.reduced); mỗi vòng lặp chỉ cần tính lại từ dẫn của nhánh.
+    """
+    reduced = getattr(branch_incidence, "reduced", None)
+    if reduced is not None and reduced.incidence.shape[0] == matrix_size:
+        return reduced
+
+    incidence = branch_incidence.incidence[:matrix_size].tocsr()
+    reduced = Output(incidence=incidence,
+                     incidence_transpose=incidence.T.tocsr(),
+                     absolute_incidence=abs(incidence))
+    branch_incidence.reduced = reduced
+    return reduced
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, cg
+
+@dataclass
+class Output:
+    x: np.ndarray
+    n_iteration: int
+    converged: bool
+
+def solve_iterative(G, J, x0=None, diagonal=None, preconditioner=None, rtol=1e-8, max_iteration=None):
+    """
+    Giải G x = J bằng gradient liên hợp (CG) trên -G (đối xứng xác định dương).
+    preconditioner: xấp xỉ (-G)^-1 (ví dụ create_amg_preconditioner), mặc định Jacobi.
+
+    G: ma trận thưa hoặc LinearOperator (chế độ matrix-free, khi đó cần truyền diagonal).
+    x0: nghiệm khởi đầu (ví dụ thế từ của vòng lặp phi tuyến trước).
+    """
+    matrix_size = G.shape[0]
+    A = LinearOperator(shape=G.shape, matvec=lambda x: -(G @ np.ravel(x)), dtype=float)
+    M = preconditioner
+    if M is None:
+        if diagonal is None:
+            diagonal = G.diagonal()
+        M = LinearOperator(shape=G.shape, matvec=lambda x: np.ravel(x) / -diagonal, dtype=float)
+
+    n_iteration = 0
+    def count(_):
+        nonlocal n_iteration
+        n_iteration += 1
+
+    x, info = cg(A, -np.asarray(J), x0=x0, rtol=rtol, atol=0.0, M=M,
+                 maxiter=max_iteration if max_iteration is not None else 10 * matrix_size,
+                 callback=count)
+    return Output(x=x, n_iteration=n_iteration, converged=(info == 0))
@@ -0,0 +1,114 @@
+import os
+import hashlib
+import numpy as np
+
+# Thư mục cache (nằm cùng thư mục với file script này)
+CACHE_DIR_NAME = "voxel_cache"
+# Tăng khi định dạng dữ liệu hoặc thuật toán phân loại thay đổi để bỏ qua cache cũ
+CACHE_VERSION = 3
+# Giới hạn dung lượng, vượt quá thì xóa các mục ít dùng nhất (LRU theo mtime)
+MAX_CACHE_BYTES = 2 * 1024**3
+
+def _get_cache_dir():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, CACHE_DIR_NAME)
+
+def _get_entry_path(key):
+    return os.path.join(_get_cache_dir(), f"{key}.npz")
+
+def make_key(**parts):
+    """
+    Hash SHA-256 chuẩn hóa của các thành phần đầu vào (số, chuỗi, mảng, dict, list...).
+    Thứ tự khóa của dict không ảnh hưởng; số thực được băm theo giá trị nhị phân float64.
+    Ví dụ: voxel_cache.make_key(motor=params, mesh=nodes)
+    """
+    digest = hashlib.sha256()
+    _update_hash(digest, {"version": CACHE_VERSION, **parts})
+    return digest.hexdigest()
+
+def _update_hash(digest, value):
+    if isinstance(value, dict):
+        digest.update(b"{")
+        for k in sorted(value, key=str):
+            _update_hash(digest, str(k))
+            _update_hash(digest, value[k])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for v in value:
+            _update_hash(digest, v)
+        digest.update(b"]")
+    elif isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        if array.dtype.kind in "biuf":
+            array = array.astype(np.float64)
+        digest.update(f"a{array.shape}".encode())
+        digest.update(array.tobytes())
+    elif isinstance(value, (bool, np.bool_)) or value is None or isinstance(value, str):
+        digest.update(f"{type(value).__name__}:{value}".encode())
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        digest.update(b"n" + np.float64(value).tobytes())
+    else:
+        raise TypeError(f"Không thể băm kiểu {type(value).__name__}")
+
+def load(key):
+    """
+    Đọc mục cache (dict các mảng), None nếu không có hoặc file lỗi.
+    Mỗi lần đọc cập nhật mtime để phục vụ LRU.
+    """
+    if key is None:
+        return None
+    filepath = _get_entry_path(key)
+    if not os.path.exists(filepath):
+        return None
+    try:
+        with np.load(filepath, allow_pickle=False) as data:
+            entry = {name: data[name] for name in data.files}
+        os.utime(filepath)
+    except Exception:
+        return None
+    return entry
+
+def save(key, max_bytes=MAX_CACHE_BYTES, **arrays):
+    """
+    Ghi mục cache (ghi ra file tạm rồi đổi tên để không bao giờ để lại file dở dang),
+    sau đó dọn cache về dưới max_bytes.
+    """
+    cache_dir = _get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    filepath = _get_entry_path(key)
+    temp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(temp_path, filepath)
+    evict(max_bytes=max_bytes)
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """Xóa các mục dùng lâu nhất cho tới khi tổng dung lượng <= max_bytes."""
+    cache_dir = _get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".npz"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def clear():
+    """Xóa sạch cache"""
+    evict(max_bytes=0)